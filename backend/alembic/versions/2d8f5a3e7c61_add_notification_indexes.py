@@ -0,0 +1,32 @@
+"""add_notification_indexes
+
+Revision ID: 2d8f5a3e7c61
+Revises: e6a1c9d4f2b8
+Create Date: 2026-10-18 16:20:44.903518
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2d8f5a3e7c61'
+down_revision: Union[str, Sequence[str], None] = 'e6a1c9d4f2b8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_notifications_user_id_is_read_created_at', 'notifications',
+                    ['user_id', 'is_read', 'created_at'], unique=False)
+    op.create_index('ix_notifications_user_id_created_at_id', 'notifications',
+                    ['user_id', 'created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_notifications_user_id_created_at_id', table_name='notifications')
+    op.drop_index('ix_notifications_user_id_is_read_created_at', table_name='notifications')
@@ -0,0 +1,35 @@
+"""add_keyset_pagination_indexes
+
+Revision ID: 3f9a2c7d1b04
+Revises: ffab69a6587a
+Create Date: 2026-10-18 10:12:31.482913
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f9a2c7d1b04'
+down_revision: Union[str, Sequence[str], None] = 'ffab69a6587a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Composite indexes matching each feed's (created_at DESC, id DESC) sort key
+    op.create_index('ix_videos_status_created_at_id', 'videos', ['status', 'created_at', 'id'], unique=False)
+    op.create_index('ix_videos_user_id_created_at_id', 'videos', ['user_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_likes_user_id_created_at_id', 'likes', ['user_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_bookmarks_user_id_created_at_id', 'bookmarks', ['user_id', 'created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_bookmarks_user_id_created_at_id', table_name='bookmarks')
+    op.drop_index('ix_likes_user_id_created_at_id', table_name='likes')
+    op.drop_index('ix_videos_user_id_created_at_id', table_name='videos')
+    op.drop_index('ix_videos_status_created_at_id', table_name='videos')
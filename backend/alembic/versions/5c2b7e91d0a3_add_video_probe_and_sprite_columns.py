@@ -0,0 +1,37 @@
+"""add_video_probe_and_sprite_columns
+
+Revision ID: 5c2b7e91d0a3
+Revises: 8d41e6b2a9c5
+Create Date: 2026-10-18 13:41:09.512730
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c2b7e91d0a3'
+down_revision: Union[str, Sequence[str], None] = '8d41e6b2a9c5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('videos', sa.Column('frame_rate', sa.Float(), nullable=True))
+    op.add_column('videos', sa.Column('probed_duration', sa.Float(), nullable=True))
+    op.add_column('videos', sa.Column('sprite_sheet_url', sa.String(length=500), nullable=True))
+    op.add_column('videos', sa.Column('sprite_vtt_url', sa.String(length=500), nullable=True))
+    op.add_column('videos', sa.Column('sprite_index', postgresql.JSONB(astext_type=sa.Text()), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('videos', 'sprite_index')
+    op.drop_column('videos', 'sprite_vtt_url')
+    op.drop_column('videos', 'sprite_sheet_url')
+    op.drop_column('videos', 'probed_duration')
+    op.drop_column('videos', 'frame_rate')
@@ -0,0 +1,35 @@
+"""add_ai_job_types_and_output_data
+
+Revision ID: 8d41e6b2a9c5
+Revises: 3f9a2c7d1b04
+Create Date: 2026-10-18 11:02:47.190354
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d41e6b2a9c5'
+down_revision: Union[str, Sequence[str], None] = '3f9a2c7d1b04'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Job types used by the AI endpoints (enum stores member names)
+    op.execute("ALTER TYPE jobtype ADD VALUE IF NOT EXISTS 'I2V_TEMPLATE'")
+    op.execute("ALTER TYPE jobtype ADD VALUE IF NOT EXISTS 'GLITCH_ANIMATE'")
+    op.execute("ALTER TYPE jobtype ADD VALUE IF NOT EXISTS 'GLITCH_REPLACE'")
+    op.execute("ALTER TYPE jobtype ADD VALUE IF NOT EXISTS 'STICKER_TO_REALITY'")
+    op.add_column('ai_jobs', sa.Column('output_data', postgresql.JSONB(astext_type=sa.Text()), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Postgres cannot drop enum values; only the column is removed
+    op.drop_column('ai_jobs', 'output_data')
@@ -0,0 +1,31 @@
+"""add_notification_coalescing_columns
+
+Revision ID: 9e4b7d2c5a18
+Revises: 2d8f5a3e7c61
+Create Date: 2026-10-18 16:58:12.640271
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9e4b7d2c5a18'
+down_revision: Union[str, Sequence[str], None] = '2d8f5a3e7c61'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('notifications', sa.Column('actor_count', sa.Integer(), server_default=sa.text('1'), nullable=False))
+    op.add_column('notifications', sa.Column('sample_actor_ids', postgresql.ARRAY(postgresql.UUID(as_uuid=True)), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('notifications', 'sample_actor_ids')
+    op.drop_column('notifications', 'actor_count')
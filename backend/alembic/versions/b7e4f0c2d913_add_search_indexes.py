@@ -0,0 +1,47 @@
+"""add_search_indexes
+
+Revision ID: b7e4f0c2d913
+Revises: 5c2b7e91d0a3
+Create Date: 2026-10-18 14:26:53.874102
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e4f0c2d913'
+down_revision: Union[str, Sequence[str], None] = '5c2b7e91d0a3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    # Full-text search document for videos (kept up to date by Postgres)
+    op.add_column('videos', sa.Column(
+        'search_vector',
+        postgresql.TSVECTOR(),
+        sa.Computed("to_tsvector('simple', coalesce(title, '') || ' ' || coalesce(caption, ''))", persisted=True),
+        nullable=True
+    ))
+    op.create_index('ix_videos_search_vector', 'videos', ['search_vector'], unique=False, postgresql_using='gin')
+
+    # Trigram indexes for username / display_name matching
+    op.create_index('ix_users_username_trgm', 'users', ['username'], unique=False,
+                    postgresql_using='gin', postgresql_ops={'username': 'gin_trgm_ops'})
+    op.create_index('ix_users_display_name_trgm', 'users', ['display_name'], unique=False,
+                    postgresql_using='gin', postgresql_ops={'display_name': 'gin_trgm_ops'})
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_users_display_name_trgm', table_name='users')
+    op.drop_index('ix_users_username_trgm', table_name='users')
+    op.drop_index('ix_videos_search_vector', table_name='videos')
+    op.drop_column('videos', 'search_vector')
@@ -0,0 +1,36 @@
+"""add_view_count_flushes_table
+
+Revision ID: c4e8a1f7b239
+Revises: 9e4b7d2c5a18
+Create Date: 2026-10-18 21:04:37.118524
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4e8a1f7b239'
+down_revision: Union[str, Sequence[str], None] = '9e4b7d2c5a18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'view_count_flushes',
+        sa.Column('batch_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('flushed_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('batch_id')
+    )
+    op.create_index(op.f('ix_view_count_flushes_flushed_at'), 'view_count_flushes', ['flushed_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_view_count_flushes_flushed_at'), table_name='view_count_flushes')
+    op.drop_table('view_count_flushes')
@@ -0,0 +1,52 @@
+"""add_video_hashtags_sort_columns
+
+Revision ID: e6a1c9d4f2b8
+Revises: b7e4f0c2d913
+Create Date: 2026-10-18 15:41:07.215389
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e6a1c9d4f2b8'
+down_revision: Union[str, Sequence[str], None] = 'b7e4f0c2d913'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Video sort keys and visibility denormalized onto the association rows
+    op.add_column('video_hashtags', sa.Column('video_created_at', sa.DateTime(timezone=True), nullable=True))
+    op.add_column('video_hashtags', sa.Column('is_listed', sa.Boolean(), server_default=sa.text('false'), nullable=False))
+    op.add_column('video_hashtags', sa.Column('popularity', sa.Integer(), server_default=sa.text('0'), nullable=False))
+
+    # Backfill from videos
+    op.execute("""
+        UPDATE video_hashtags vh
+        SET video_created_at = v.created_at,
+            is_listed = (v.status = 'completed' AND v.is_public AND v.deleted_at IS NULL),
+            popularity = v.view_count
+        FROM videos v
+        WHERE v.id = vh.video_id
+    """)
+
+    op.create_index('ix_video_hashtags_hashtag_created_at', 'video_hashtags',
+                    ['hashtag_id', 'video_created_at', 'video_id'], unique=False,
+                    postgresql_where=sa.text('is_listed'))
+    op.create_index('ix_video_hashtags_hashtag_popularity', 'video_hashtags',
+                    ['hashtag_id', 'popularity', 'video_id'], unique=False,
+                    postgresql_where=sa.text('is_listed'))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_video_hashtags_hashtag_popularity', table_name='video_hashtags')
+    op.drop_index('ix_video_hashtags_hashtag_created_at', table_name='video_hashtags')
+    op.drop_column('video_hashtags', 'popularity')
+    op.drop_column('video_hashtags', 'is_listed')
+    op.drop_column('video_hashtags', 'video_created_at')
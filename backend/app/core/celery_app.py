@@ -0,0 +1,57 @@
+from celery import Celery
+from app.core.config import settings
+
+celery_app = Celery(
+    "lokiz",
+    broker=settings.REDIS_URL,
+    backend=settings.REDIS_URL,
+    include=[
+        "app.tasks.feed_tasks",
+        "app.tasks.counter_tasks",
+        "app.tasks.ai_tasks",
+        "app.tasks.media_tasks",
+        "app.tasks.trending_tasks",
+        "app.tasks.notification_tasks",
+    ]
+)
+
+celery_app.conf.update(
+    task_serializer="json",
+    accept_content=["json"],
+    result_serializer="json",
+    timezone="UTC",
+    enable_utc=True,
+    task_always_eager=settings.CELERY_TASK_ALWAYS_EAGER,
+    # AI generations run on a dedicated worker pool (`-Q ai`)
+    task_routes={"app.tasks.ai_tasks.*": {"queue": "ai"}},
+    task_acks_late=True,
+    worker_prefetch_multiplier=1,
+)
+
+# Periodic jobs (run with `celery -A app.core.celery_app beat`)
+celery_app.conf.beat_schedule = {
+    "refresh-for-you-pool": {
+        "task": "app.tasks.feed_tasks.refresh_for_you_pool",
+        "schedule": settings.FEED_POOL_REFRESH_SECONDS,
+    },
+    "reconcile-glitch-counts": {
+        "task": "app.tasks.counter_tasks.reconcile_glitch_counts",
+        "schedule": settings.GLITCH_COUNT_RECONCILE_SECONDS,
+    },
+    "flush-view-counts": {
+        "task": "app.tasks.counter_tasks.flush_view_counts",
+        "schedule": settings.VIEW_COUNT_FLUSH_SECONDS,
+    },
+    "build-trending-snapshot": {
+        "task": "app.tasks.trending_tasks.build_trending_snapshot",
+        "schedule": settings.TRENDING_SNAPSHOT_SECONDS,
+    },
+    "flush-notifications": {
+        "task": "app.tasks.notification_tasks.flush_notifications",
+        "schedule": settings.NOTIFICATION_COALESCE_SECONDS / 3,
+    },
+    "poll-ai-predictions": {
+        "task": "app.tasks.ai_tasks.poll_ai_predictions",
+        "schedule": settings.AI_PREDICTION_POLL_SECONDS,
+    },
+}
@@ -1,10 +1,17 @@
 from pydantic_settings import BaseSettings
-from typing import Optional
+from typing import Dict, List, Optional
 
 
 class Settings(BaseSettings):
     # Database
     DATABASE_URL: str
+    DATABASE_REPLICA_URL: Optional[str] = None  # Read-only endpoints (get_read_db); primary when unset
+    # Connection pool, per engine and per process (sync and async engines pool separately)
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20  # Extra connections opened under bursts, closed when returned
+    DB_POOL_TIMEOUT_SECONDS: int = 30  # Wait for a free connection before failing
+    DB_POOL_RECYCLE_SECONDS: int = 1800  # Reconnect before server/proxy idle timeouts
+    DB_POOL_PRE_PING: bool = True  # Check connections on checkout (failover, restarts)
 
     # Redis
     REDIS_URL: str
@@ -14,6 +21,11 @@ class Settings(BaseSettings):
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 10080  # 7 days
 
+    # Password hashing (app.core.security.PasswordHasher)
+    BCRYPT_ROUNDS: int = 12  # Existing hashes with another cost are rehashed on login
+    PASSWORD_HASH_WORKERS: int = 4  # Roughly the cores given to hashing
+    PASSWORD_HASH_MAX_PENDING: int = 64  # Running + queued; beyond this login/register return 503
+
     # AWS S3
     AWS_ACCESS_KEY_ID: str
     AWS_SECRET_ACCESS_KEY: str
@@ -23,6 +35,81 @@ class Settings(BaseSettings):
 
     # Replicate API
     REPLICATE_API_TOKEN: str
+    REPLICATE_BACKEND: str = "replicate"  # "replicate" or "fake" (local fake backend for tests)
+    REPLICATE_BASE_URL: Optional[str] = None  # e.g. local fake_replicate_server
+    REPLICATE_WEBHOOK_URL: Optional[str] = None  # Public URL of /v1/ai/webhooks/replicate
+    REPLICATE_WEBHOOK_SECRET: Optional[str] = None  # whsec_... signing secret; unsigned webhooks are re-fetched
+
+    # AI job workers
+    CELERY_TASK_ALWAYS_EAGER: bool = False  # Run tasks inline (tests)
+    # Max concurrent generations per Replicate model (across all workers)
+    AI_MODEL_CONCURRENCY: Dict[str, int] = {
+        "google/veo-3-fast": 4,
+        "wan-video/wan-2.2-animate-animation": 4,
+        "wan-video/wan-2.2-animate-replace": 4,
+        "luma/modify-video": 2,
+        "suno-ai/bark": 8,
+    }
+    AI_MODEL_SLOT_RETRY_SECONDS: int = 5  # Requeue delay when a model is at capacity
+    AI_PREDICTION_POLL_SECONDS: int = 10  # Poller fallback for missed webhooks
+    AI_PREDICTION_POLL_MAX_PAGES: int = 5  # Prediction list pages checked per poll
+
+    # AI result cache / deduplication of identical requests
+    AI_RESULT_CACHE_JOB_TYPES: List[str] = ["glitch_animate", "glitch_replace"]
+    AI_RESULT_CACHE_TTL_SECONDS: int = 900  # Well under the 1h life of Replicate output URLs, so reused URLs still play
+    AI_RESULT_CACHE_VERSION: str = "1"  # Bump when a model is updated to drop stale results
+    AI_INFLIGHT_TTL_SECONDS: int = 3600
+
+    # List totals (app.utils.count_utils)
+    COUNT_EXACT_THRESHOLD: int = 1000  # Planner estimates above this are not counted exactly
+    COUNT_CACHE_TTL_SECONDS: int = 60
+
+    # Trending hashtags (app.services.trending_service)
+    TRENDING_HALF_LIFE_HOURS: float = 6.0  # Score of an event halves every N hours
+    TRENDING_TOP_K: int = 100  # Hashtags kept in the precomputed snapshot
+    TRENDING_SNAPSHOT_SECONDS: int = 60
+
+    # Notifications
+    NOTIFICATION_UNREAD_TTL_SECONDS: int = 86400  # Unread counters are rebuilt from the DB after this
+    NOTIFICATION_COALESCE_TYPES: List[str] = ["like", "comment", "follow", "glitch"]
+    NOTIFICATION_COALESCE_SECONDS: int = 30  # Events per (user, type, target) are merged over this window
+    NOTIFICATION_SAMPLE_ACTORS: int = 3
+
+    # Server-sent event stream (/events/stream)
+    EVENT_STREAM_HEARTBEAT_SECONDS: int = 15
+    EVENT_STREAM_QUEUE_SIZE: int = 100  # Events buffered per connection before dropping
+
+    # Authenticated principal cache (app.services.principal_cache_service)
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 60  # Redis tier
+    PRINCIPAL_CACHE_LOCAL_TTL_SECONDS: int = 5  # In-process tier (not reached by invalidation in other workers)
+    PRINCIPAL_CACHE_LRU_SIZE: int = 10000
+
+    # Response cache for public read endpoints (app.services.response_cache_service)
+    RESPONSE_CACHE_ENABLED: bool = True
+    RESPONSE_CACHE_TTL_SECONDS: int = 30  # Bounds staleness of view/like counts, which don't invalidate
+
+    # Search typeahead (in-process prefix index)
+    SUGGEST_REBUILD_SECONDS: int = 300
+    SUGGEST_MAX_ENTRIES: int = 200000  # Per index (users, hashtags), highest ranked first
+
+    # ffmpeg / ffprobe subprocesses (app.utils.video_utils); hung processes are killed
+    MEDIA_PROBE_TIMEOUT_SECONDS: int = 30  # ffprobe header reads
+    MEDIA_FRAME_TIMEOUT_SECONDS: int = 20  # Single frame extraction
+    MEDIA_RENDER_TIMEOUT_SECONDS: int = 300  # Sprite sheet render (decodes the whole video)
+
+    # Extracted frame cache
+    FRAME_CACHE_LRU_SIZE: int = 4096  # In-process (video_id, frame) -> URL entries per worker
+
+    # For You feed candidate pool
+    FEED_POOL_SIZE: int = 1000  # Number of scored candidates kept in the pool
+    FEED_POOL_WINDOW_DAYS: int = 30  # Only videos newer than this are ranked
+    FEED_POOL_REFRESH_SECONDS: int = 300
+    FEED_FOLLOWING_CANDIDATES: int = 200  # Recent videos merged in from followed creators
+    FEED_RANKING_TTL_SECONDS: int = 1800  # A viewer's pinned ranking; older cursors must restart
+
+    # Denormalized counters
+    GLITCH_COUNT_RECONCILE_SECONDS: int = 3600
+    VIEW_COUNT_FLUSH_SECONDS: int = 10  # Write-behind flush interval for buffered views
 
     # Environment
     ENVIRONMENT: str = "development"
@@ -1,9 +1,13 @@
+from typing import Optional
+from uuid import UUID
+
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
-from app.db.session import get_db
+from app.db.session import get_db, get_read_db, get_async_db, get_async_read_db
 from app.core.security import decode_access_token
 from app.models.user import User
+from app.services.principal_cache_service import Principal, get_principal_cache_service
 
 security = HTTPBearer()
 
@@ -71,3 +75,67 @@ def get_current_user_optional(
         return None
 
     return user
+
+
+def decode_token_user_id(token: str) -> Optional[UUID]:
+    """User ID (sub) of a valid access token"""
+    payload = decode_access_token(token)
+    if payload is None or payload.get("sub") is None:
+        return None
+
+    try:
+        return UUID(payload["sub"])
+    except ValueError:
+        return None
+
+
+def get_current_principal(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: Session = Depends(get_db)
+) -> Principal:
+    """
+    Get the current authenticated principal (cached, no users query on a hit)
+    Use get_current_user instead when the handler modifies the user
+    """
+    user_id = decode_token_user_id(credentials.credentials)
+    if user_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    principal = get_principal_cache_service().get(db, user_id)
+    if principal is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="User not found",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    if not principal.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Inactive user"
+        )
+
+    return principal
+
+
+def get_current_principal_optional(
+    credentials: HTTPAuthorizationCredentials = Depends(HTTPBearer(auto_error=False)),
+    db: Session = Depends(get_db)
+) -> Principal | None:
+    """Get the current authenticated principal (optional, cached)"""
+    if credentials is None:
+        return None
+
+    user_id = decode_token_user_id(credentials.credentials)
+    if user_id is None:
+        return None
+
+    principal = get_principal_cache_service().get(db, user_id)
+    if principal is None or not principal.is_active:
+        return None
+
+    return principal
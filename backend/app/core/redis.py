@@ -0,0 +1,13 @@
+import redis
+from app.core.config import settings
+
+# Lazy initialization to avoid connection error on import
+_redis_client = None
+
+
+def get_redis() -> redis.Redis:
+    """Get the shared Redis client (string responses)"""
+    global _redis_client
+    if _redis_client is None:
+        _redis_client = redis.Redis.from_url(settings.REDIS_URL, decode_responses=True)
+    return _redis_client
@@ -1,10 +1,93 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Dict, Optional, Tuple
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from app.core.config import settings
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Hashes with any other bcrypt cost are upgraded on the next successful login
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__min_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__max_rounds=settings.BCRYPT_ROUNDS
+)
+
+
+class PasswordHasherBusy(Exception):
+    """The password hashing pool is at its queue limit"""
+
+
+class PasswordHasher:
+    """
+    Bounded worker pool for bcrypt (CPU-bound; releases the GIL)
+
+    Keeps hashing off the event loop and out of the shared threadpool used
+    by sync routes, so a login storm is limited to PASSWORD_HASH_WORKERS
+    cores. Requests beyond PASSWORD_HASH_MAX_PENDING (running + queued) are
+    rejected immediately instead of queueing without bound.
+    """
+
+    def __init__(self, workers: int = settings.PASSWORD_HASH_WORKERS, max_pending: int = settings.PASSWORD_HASH_MAX_PENDING):
+        self.workers = workers
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password-hash")
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._running = 0
+        self._rejected = 0
+
+    async def hash(self, password: str) -> str:
+        return await self._submit(pwd_context.hash, password)
+
+    async def verify_and_update(self, password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        """
+        Verify a password
+
+        Returns:
+            (valid, new_hash) - new_hash is set when the stored hash should be
+            replaced (cost differs from BCRYPT_ROUNDS)
+        """
+        return await self._submit(pwd_context.verify_and_update, password, hashed_password)
+
+    def stats(self) -> Dict[str, int]:
+        """Queue depth metrics"""
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "running": self._running,
+                "queued": self._pending - self._running,
+                "max_pending": self.max_pending,
+                "rejected": self._rejected
+            }
+
+    async def _submit(self, fn, *args):
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self._rejected += 1
+                raise PasswordHasherBusy()
+            self._pending += 1
+
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, self._run, fn, args)
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+    def _run(self, fn, args):
+        with self._lock:
+            self._running += 1
+        try:
+            return fn(*args)
+        finally:
+            with self._lock:
+                self._running -= 1
+
+
+password_hasher = PasswordHasher()
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -1,14 +1,95 @@
-from sqlalchemy import create_engine
+from typing import Callable
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.sql.dml import UpdateBase
 from app.core.config import settings
 
-engine = create_engine(settings.DATABASE_URL)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+POOL_OPTIONS = {
+    "pool_size": settings.DB_POOL_SIZE,
+    "max_overflow": settings.DB_MAX_OVERFLOW,
+    "pool_timeout": settings.DB_POOL_TIMEOUT_SECONDS,
+    "pool_recycle": settings.DB_POOL_RECYCLE_SECONDS,
+    "pool_pre_ping": settings.DB_POOL_PRE_PING,
+}
+
+
+def _async_url(url: str):
+    return make_url(url).set(drivername="postgresql+asyncpg")
+
+
+class RoutingSession(Session):
+    """
+    Session routed between the primary and the read replica
+    Sessions opened with info={"read_only": True} (get_read_db) send queries
+    to the replica; flushes and INSERT/UPDATE/DELETE always go to the primary
+    """
+
+    def __init__(self, primary: Engine, replica: Engine, **kwargs):
+        super().__init__(**kwargs)
+        self.primary = primary
+        self.replica = replica
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if self.info.get("read_only") and not self._flushing and not isinstance(clause, UpdateBase):
+            return self.replica
+        return self.primary
+
+
+# Sync engines: Alembic, Celery tasks and routers not yet on the async session
+engine = create_engine(settings.DATABASE_URL, **POOL_OPTIONS)
+replica_engine = create_engine(settings.DATABASE_REPLICA_URL, **POOL_OPTIONS) if settings.DATABASE_REPLICA_URL else engine
+SessionLocal = sessionmaker(
+    class_=RoutingSession,
+    primary=engine,
+    replica=replica_engine,
+    autocommit=False,
+    autoflush=False
+)
+
+# Async engines (asyncpg) for routers: queries don't block the event loop
+async_engine = create_async_engine(_async_url(settings.DATABASE_URL), **POOL_OPTIONS)
+async_replica_engine = create_async_engine(
+    _async_url(settings.DATABASE_REPLICA_URL), **POOL_OPTIONS
+) if settings.DATABASE_REPLICA_URL else async_engine
+AsyncSessionLocal = async_sessionmaker(
+    sync_session_class=RoutingSession,
+    primary=async_engine.sync_engine,
+    replica=async_replica_engine.sync_engine,
+    autoflush=False,
+    expire_on_commit=False
+)
 
 Base = declarative_base()
 
 
+def run_after_commit(db: Session | AsyncSession, callback: Callable[[], None]) -> None:
+    """
+    Run a side effect (Redis, pub/sub) once the session's current transaction
+    commits; dropped if it rolls back
+    Lets helpers join the caller's unit of work instead of committing
+    """
+    db.info.setdefault("after_commit", []).append(callback)
+
+
+@event.listens_for(Session, "after_commit")  # Sync sessions and the ones behind AsyncSession
+def _run_after_commit_callbacks(session: Session) -> None:
+    for callback in session.info.pop("after_commit", []):
+        try:
+            callback()
+        except Exception as e:
+            # The transaction is already committed; side effects are best effort
+            print(f"After-commit callback failed: {e}")
+
+
+@event.listens_for(Session, "after_rollback")
+def _drop_after_commit_callbacks(session: Session) -> None:
+    session.info.pop("after_commit", None)
+
+
 def get_db():
     """
     Dependency for getting database session
@@ -18,3 +99,33 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+def get_read_db():
+    """
+    Dependency for read-only endpoints
+    Queries go to the read replica (DATABASE_REPLICA_URL), which may lag the
+    primary slightly; the primary is used when no replica is configured
+    """
+    db = SessionLocal(info={"read_only": True})
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_db():
+    """
+    Dependency for getting an async database session
+    Sync helpers taking a Session run on it with `await db.run_sync(...)`
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def get_async_read_db():
+    """
+    Dependency for read-only endpoints on the async session (see get_read_db)
+    """
+    async with AsyncSessionLocal(info={"read_only": True}) as db:
+        yield db
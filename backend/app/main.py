@@ -1,7 +1,12 @@
+import asyncio
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.routers import auth, video, ai, glitch, studio, image, like, comment, follow, user, notification, search, hashtag, credit, share, bookmark, moderation, feed
+from app.routers import auth, video, ai, glitch, studio, image, like, comment, follow, user, notification, search, hashtag, credit, share, bookmark, moderation, feed, events
 from app.core.config import settings
+from app.core.security import password_hasher
+from app.services.event_stream_service import get_event_stream_service
+from app.services.suggest_service import get_suggest_service
 
 app = FastAPI(
     title="LOKIZ API",
@@ -37,6 +42,19 @@ app.include_router(share.router, prefix="/v1")
 app.include_router(bookmark.router, prefix="/v1")
 app.include_router(moderation.router, prefix="/v1")
 app.include_router(feed.router, prefix="/v1")
+app.include_router(events.router, prefix="/v1")
+
+
+@app.on_event("startup")
+async def start_background_jobs():
+    # Periodically rebuilt in-process typeahead index
+    app.state.suggest_rebuild_task = asyncio.create_task(get_suggest_service().run_rebuild_loop())
+
+
+@app.on_event("shutdown")
+async def stop_background_jobs():
+    app.state.suggest_rebuild_task.cancel()
+    await get_event_stream_service().close()
 
 
 @app.get("/")
@@ -50,4 +68,7 @@ def root():
 
 @app.get("/health")
 def health_check():
-    return {"status": "healthy"}
+    return {
+        "status": "healthy",
+        "password_hashing": password_hasher.stats()  # Queue depth of the bcrypt pool
+    }
@@ -12,6 +12,10 @@ class JobType(str, enum.Enum):
     VTV = "vtv"
     COMPOSITING = "compositing"
     MUSIC = "music"
+    I2V_TEMPLATE = "i2v_template"
+    GLITCH_ANIMATE = "glitch_animate"
+    GLITCH_REPLACE = "glitch_replace"
+    STICKER_TO_REALITY = "sticker_to_reality"
 
 
 class JobStatus(str, enum.Enum):
@@ -30,6 +34,7 @@ class AIJob(Base):
     status = Column(SQLEnum(JobStatus), default=JobStatus.PENDING, nullable=False, index=True)
     input_data = Column(JSONB, nullable=False)  # 입력 파라미터 (URL, 프롬프트 등)
     output_url = Column(String(500))  # 결과 비디오/오디오 URL
+    output_data = Column(JSONB)  # 결과 메타데이터 (model, video_id 등)
     credits_used = Column(Integer, nullable=False)
     error_message = Column(Text)
     replicate_id = Column(String(255))  # Replicate API의 prediction ID
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, Table
+from sqlalchemy import Column, String, Integer, Boolean, DateTime, ForeignKey, Table, Index, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 import uuid
@@ -20,9 +20,20 @@ class Hashtag(Base):
 
 
 # Association table for many-to-many relationship
+# Also the per-hashtag video index: the video's sort keys and visibility are
+# copied onto each row (app.utils.hashtag_utils.sync_video_hashtag_index), so
+# tag pages are read from one partial index without touching videos
 video_hashtags = Table(
     'video_hashtags',
     Base.metadata,
     Column('video_id', UUID(as_uuid=True), ForeignKey('videos.id'), primary_key=True),
-    Column('hashtag_id', UUID(as_uuid=True), ForeignKey('hashtags.id'), primary_key=True)
+    Column('hashtag_id', UUID(as_uuid=True), ForeignKey('hashtags.id'), primary_key=True),
+    Column('video_created_at', DateTime(timezone=True), nullable=True),
+    Column('is_listed', Boolean, nullable=False, server_default=text('false')),  # completed, public, not deleted
+    Column('popularity', Integer, nullable=False, server_default=text('0')),  # video view_count
+    # Keyset pagination indexes per hashtag (latest / popular), listed videos only
+    Index('ix_video_hashtags_hashtag_created_at', 'hashtag_id', 'video_created_at', 'video_id',
+          postgresql_where=text('is_listed')),
+    Index('ix_video_hashtags_hashtag_popularity', 'hashtag_id', 'popularity', 'video_id',
+          postgresql_where=text('is_listed'))
 )
@@ -1,5 +1,5 @@
-from sqlalchemy import Column, String, Boolean, ForeignKey, DateTime
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, String, Integer, Boolean, ForeignKey, DateTime, Index
+from sqlalchemy.dialects.postgresql import UUID, ARRAY
 from sqlalchemy.orm import relationship
 import uuid
 from datetime import datetime
@@ -13,11 +13,22 @@ class Notification(Base):
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     type = Column(String(50), nullable=False)  # like, comment, follow, glitch
-    actor_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    actor_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)  # Latest actor
     target_id = Column(UUID(as_uuid=True), nullable=True)  # video_id, comment_id, etc.
     is_read = Column(Boolean, default=False, nullable=False)
+
+    # Coalesced notifications ("X and 42 others liked your video")
+    actor_count = Column(Integer, default=1, nullable=False)  # Distinct actors (approximate past the sample)
+    sample_actor_ids = Column(ARRAY(UUID(as_uuid=True)), nullable=True)  # Most recent actors first
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
 
+    __table_args__ = (
+        # Unread count rebuilds and unread filtering
+        Index('ix_notifications_user_id_is_read_created_at', 'user_id', 'is_read', 'created_at'),
+        # Keyset pagination of the list (created_at DESC, id DESC)
+        Index('ix_notifications_user_id_created_at_id', 'user_id', 'created_at', 'id'),
+    )
+
     # Relationships
     user = relationship("User", foreign_keys=[user_id], backref="notifications")
     actor = relationship("User", foreign_keys=[actor_id])
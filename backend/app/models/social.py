@@ -1,4 +1,4 @@
-from sqlalchemy import Column, DateTime, ForeignKey, Text, UniqueConstraint, Integer
+from sqlalchemy import Column, DateTime, ForeignKey, Text, UniqueConstraint, Integer, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
@@ -14,7 +14,10 @@ class Like(Base):
     video_id = Column(UUID(as_uuid=True), ForeignKey("videos.id", ondelete="CASCADE"), nullable=False, index=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
 
-    __table_args__ = (UniqueConstraint('user_id', 'video_id', name='unique_user_video_like'),)
+    __table_args__ = (
+        UniqueConstraint('user_id', 'video_id', name='unique_user_video_like'),
+        Index('ix_likes_user_id_created_at_id', 'user_id', 'created_at', 'id'),
+    )
 
     # Relationships
     user = relationship("User", backref="likes")
@@ -115,7 +118,10 @@ class Bookmark(Base):
     video_id = Column(UUID(as_uuid=True), ForeignKey("videos.id", ondelete="CASCADE"), nullable=False, index=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False, index=True)
 
-    __table_args__ = (UniqueConstraint('user_id', 'video_id', name='unique_user_video_bookmark'),)
+    __table_args__ = (
+        UniqueConstraint('user_id', 'video_id', name='unique_user_video_bookmark'),
+        Index('ix_bookmarks_user_id_created_at_id', 'user_id', 'created_at', 'id'),
+    )
 
     # Relationships
     user = relationship("User", backref="bookmarks")
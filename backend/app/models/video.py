@@ -1,7 +1,7 @@
-from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, Text, Boolean
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, String, Integer, Float, DateTime, ForeignKey, Text, Boolean, Index, Computed
+from sqlalchemy.dialects.postgresql import UUID, JSONB, TSVECTOR
 from sqlalchemy.sql import func
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, deferred
 import uuid
 from app.db.session import Base
 
@@ -27,6 +27,13 @@ class Video(Base):
     height = Column(Integer, nullable=True)
     s3_key = Column(String(500), nullable=True)
 
+    # Probed media info and timeline sprites (set by app.tasks.media_tasks)
+    frame_rate = Column(Float, nullable=True)
+    probed_duration = Column(Float, nullable=True)
+    sprite_sheet_url = Column(String(500), nullable=True)
+    sprite_vtt_url = Column(String(500), nullable=True)
+    sprite_index = Column(JSONB, nullable=True)  # interval, count, columns, rows, tile_width, tile_height
+
     # Counters
     view_count = Column(Integer, default=0, nullable=False)
     like_count = Column(Integer, default=0, nullable=False)
@@ -44,7 +51,36 @@ class Video(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False, index=True)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
 
+    # Full-text search document (title + caption), maintained by Postgres
+    # Deferred: only referenced in search filters, never loaded with the row
+    search_vector = deferred(Column(
+        TSVECTOR,
+        Computed(
+            "to_tsvector('simple', coalesce(title, '') || ' ' || coalesce(caption, ''))",
+            persisted=True
+        )
+    ))
+
+    __table_args__ = (
+        # Keyset pagination indexes (created_at DESC, id DESC)
+        Index('ix_videos_status_created_at_id', 'status', 'created_at', 'id'),
+        Index('ix_videos_user_id_created_at_id', 'user_id', 'created_at', 'id'),
+        Index('ix_videos_search_vector', 'search_vector', postgresql_using='gin'),
+    )
+
     # Relationships
     user = relationship("User", backref="videos")
     original_video = relationship("Video", remote_side=[id], backref="glitches")
     hashtags = relationship("Hashtag", secondary="video_hashtags", back_populates="videos")
+
+
+class ViewCountFlush(Base):
+    """
+    Applied view counter batches (app.services.view_counter_service)
+    Written in the same transaction as the counts, so a batch whose Redis
+    hash outlives its commit is recognized and not applied twice
+    """
+    __tablename__ = "view_count_flushes"
+
+    batch_id = Column(UUID(as_uuid=True), primary_key=True)
+    flushed_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False, index=True)
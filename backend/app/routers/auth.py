@@ -1,19 +1,31 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.db.session import get_db
+from app.db.session import get_db, get_async_db
 from app.schemas.user import UserCreate, UserLogin, UserUpdateRequest, TokenResponse, UserResponse
 from app.models.user import User
-from app.core.security import verify_password, get_password_hash, create_access_token
+from app.core.security import password_hasher, PasswordHasherBusy, create_access_token
 from app.core.deps import get_current_user
+from app.services.principal_cache_service import get_principal_cache_service
+from app.services.response_cache_service import get_response_cache_service
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
 
+def _hasher_busy() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Too many sign-in requests, please retry shortly",
+        headers={"Retry-After": "1"}
+    )
+
+
 @router.post("/register", response_model=TokenResponse, status_code=status.HTTP_201_CREATED)
-def register(user_data: UserCreate, db: Session = Depends(get_db)):
+async def register(user_data: UserCreate, db: AsyncSession = Depends(get_async_db)):
     """Register a new user"""
     # Check if email already exists
-    existing_user = db.query(User).filter(User.email == user_data.email).first()
+    existing_user = await db.scalar(select(User.id).where(User.email == user_data.email))
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
@@ -21,15 +33,20 @@ def register(user_data: UserCreate, db: Session = Depends(get_db)):
         )
 
     # Check if username already exists
-    existing_username = db.query(User).filter(User.username == user_data.username).first()
+    existing_username = await db.scalar(select(User.id).where(User.username == user_data.username))
     if existing_username:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail="Username already taken"
         )
 
+    # Hash on the bounded password pool (off the event loop)
+    try:
+        hashed_password = await password_hasher.hash(user_data.password)
+    except PasswordHasherBusy:
+        raise _hasher_busy()
+
     # Create new user
-    hashed_password = get_password_hash(user_data.password)
     new_user = User(
         username=user_data.username,
         email=user_data.email,
@@ -39,8 +56,8 @@ def register(user_data: UserCreate, db: Session = Depends(get_db)):
     )
 
     db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    await db.commit()
+    await db.refresh(new_user)
 
     # Create access token
     access_token = create_access_token(data={"sub": str(new_user.id)})
@@ -52,11 +69,19 @@ def register(user_data: UserCreate, db: Session = Depends(get_db)):
 
 
 @router.post("/login", response_model=TokenResponse)
-def login(credentials: UserLogin, db: Session = Depends(get_db)):
+async def login(credentials: UserLogin, db: AsyncSession = Depends(get_async_db)):
     """Login with email and password"""
-    user = db.query(User).filter(User.email == credentials.email).first()
+    user = await db.scalar(select(User).where(User.email == credentials.email))
+
+    # Verify on the bounded password pool (off the event loop)
+    valid, new_hash = False, None
+    if user:
+        try:
+            valid, new_hash = await password_hasher.verify_and_update(credentials.password, user.hashed_password)
+        except PasswordHasherBusy:
+            raise _hasher_busy()
 
-    if not user or not verify_password(credentials.password, user.hashed_password):
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
@@ -69,6 +94,12 @@ def login(credentials: UserLogin, db: Session = Depends(get_db)):
             detail="Inactive user"
         )
 
+    # Transparent rehash when the stored cost differs from BCRYPT_ROUNDS
+    if new_hash:
+        user.hashed_password = new_hash
+        await db.commit()
+        await db.refresh(user)
+
     # Create access token
     access_token = create_access_token(data={"sub": str(user.id)})
 
@@ -122,4 +153,8 @@ def update_me(
     db.commit()
     db.refresh(current_user)
 
+    get_principal_cache_service().invalidate(current_user.id)
+    # Profile and every cached video showing this user
+    get_response_cache_service().invalidate(f"user:{current_user.id}")
+
     return UserResponse.from_orm(current_user)
@@ -2,20 +2,21 @@ from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
 from uuid import UUID
 from typing import Optional
+from datetime import datetime
 
-from app.core.deps import get_db, get_current_user
-from app.models.user import User
+from app.core.deps import get_db, get_current_principal, Principal
 from app.models.video import Video
-from app.models.social import Bookmark, VideoGlitch
+from app.models.social import Bookmark
 from app.schemas.video import VideoListResponse
+from app.utils.pagination import encode_cursor, decode_cursor, keyset_before
 
 router = APIRouter(prefix="/bookmarks", tags=["bookmarks"])
 
 
 @router.post("/videos/{video_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def bookmark_video(
+def bookmark_video(
     video_id: UUID,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
     """
@@ -53,9 +54,9 @@ async def bookmark_video(
 
 
 @router.delete("/videos/{video_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def unbookmark_video(
+def unbookmark_video(
     video_id: UUID,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
     """
@@ -81,9 +82,9 @@ async def unbookmark_video(
 
 
 @router.get("/videos/{video_id}/check")
-async def check_bookmark(
+def check_bookmark(
     video_id: UUID,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
     """
@@ -98,18 +99,18 @@ async def check_bookmark(
 
 
 @router.get("/", response_model=VideoListResponse)
-async def get_bookmarked_videos(
+def get_bookmarked_videos(
     page_size: int = Query(20, ge=1, le=100, description="Items per page"),
     cursor: Optional[str] = Query(None, description="Cursor for pagination"),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
     """
     Get bookmarked videos for current user (infinite scroll)
     Only shows public/completed videos
     """
-    # Build query - join Bookmark and Video
-    query = db.query(Video).join(
+    # Build query - join Bookmark and Video (Bookmark columns are the sort key)
+    query = db.query(Video, Bookmark.created_at, Bookmark.id).join(
         Bookmark,
         Bookmark.video_id == Video.id
     ).filter(
@@ -119,37 +120,26 @@ async def get_bookmarked_videos(
         Video.deleted_at.is_(None)
     )
 
-    # Apply cursor pagination (use Bookmark.created_at for ordering)
+    # Apply cursor pagination (keyset on Bookmark.created_at, Bookmark.id)
     if cursor:
-        # Cursor is Bookmark.id in this case
-        query = query.filter(Bookmark.id < cursor)
+        query = query.filter(
+            keyset_before([Bookmark.created_at, Bookmark.id], decode_cursor(cursor, datetime, UUID))
+        )
 
     # Order by when the user bookmarked it (most recent first)
-    query = query.order_by(Bookmark.created_at.desc())
+    query = query.order_by(Bookmark.created_at.desc(), Bookmark.id.desc())
 
     # Get videos
-    videos = query.limit(page_size + 1).all()
+    rows = query.limit(page_size + 1).all()
 
     # Check if there are more videos
-    has_more = len(videos) > page_size
+    has_more = len(rows) > page_size
     if has_more:
-        videos = videos[:page_size]
-
-    # Add glitch_count to each video
-    for video in videos:
-        video.glitch_count = db.query(VideoGlitch).filter(
-            VideoGlitch.original_video_id == video.id
-        ).count()
-
-    # Get next cursor (use last video's Bookmark.id)
-    next_cursor = None
-    if has_more and videos:
-        last_bookmark = db.query(Bookmark).filter(
-            Bookmark.user_id == current_user.id,
-            Bookmark.video_id == videos[-1].id
-        ).first()
-        if last_bookmark:
-            next_cursor = str(last_bookmark.id)
+        rows = rows[:page_size]
+    videos = [row[0] for row in rows]
+
+    # Get next cursor (last bookmark's created_at, id)
+    next_cursor = encode_cursor(rows[-1][1], rows[-1][2]) if has_more and rows else None
 
     return VideoListResponse(
         videos=videos,
@@ -4,8 +4,7 @@ from uuid import UUID
 from typing import List
 from pydantic import BaseModel
 
-from app.core.deps import get_db, get_current_user
-from app.models.user import User
+from app.core.deps import get_db, get_current_principal, Principal
 from app.models.video import Video
 from app.models.social import Comment, CommentLike
 from app.schemas.social import (
@@ -14,16 +13,18 @@ from app.schemas.social import (
     CommentResponse,
     CommentListResponse
 )
+from app.utils.count_utils import count_total
+from app.utils.counter_utils import adjust_comment_count
 from app.utils.notification_utils import create_notification
 
 router = APIRouter(prefix="/comments", tags=["comments"])
 
 
 @router.post("/videos/{video_id}", response_model=CommentResponse, status_code=status.HTTP_201_CREATED)
-async def create_comment(
+def create_comment(
     video_id: UUID,
     request: CommentCreateRequest,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
     """
@@ -45,11 +46,8 @@ async def create_comment(
     )
     db.add(comment)
 
-    # Increment comment_count
-    video.comment_count += 1
-
-    db.commit()
-    db.refresh(comment)
+    # Increment comment_count (atomic, concurrent comments don't race)
+    adjust_comment_count(db, video_id, 1)
 
     # Create notification for video owner
     create_notification(
@@ -60,11 +58,14 @@ async def create_comment(
         target_id=video_id
     )
 
+    db.commit()
+    db.refresh(comment)
+
     return comment
 
 
 @router.get("/videos/{video_id}", response_model=CommentListResponse)
-async def get_video_comments(
+def get_video_comments(
     video_id: UUID,
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
@@ -81,30 +82,37 @@ async def get_video_comments(
             detail="Video not found"
         )
 
-    # Get total count
-    total = db.query(Comment).filter(Comment.video_id == video_id).count()
-
     # Get comments
     offset = (page - 1) * page_size
-    comments = db.query(Comment).filter(
-        Comment.video_id == video_id
-    ).order_by(
+    query = db.query(Comment).filter(Comment.video_id == video_id)
+    comments = query.order_by(
         Comment.created_at.desc()
     ).offset(offset).limit(page_size).all()
 
+    # Total (exact when cheap, estimated otherwise)
+    total, total_is_estimate = count_total(
+        db,
+        query,
+        returned=len(comments),
+        limit=page_size,
+        offset=offset,
+        cache_key=f"video:{video_id}:comments"
+    )
+
     return CommentListResponse(
         comments=comments,
         total=total,
+        total_is_estimate=total_is_estimate,
         page=page,
         page_size=page_size
     )
 
 
 @router.patch("/{comment_id}", response_model=CommentResponse)
-async def update_comment(
+def update_comment(
     comment_id: UUID,
     request: CommentUpdateRequest,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
     """
@@ -136,9 +144,9 @@ async def update_comment(
 
 
 @router.delete("/{comment_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_comment(
+def delete_comment(
     comment_id: UUID,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
     """
@@ -160,15 +168,11 @@ async def delete_comment(
             detail="Not authorized to delete this comment"
         )
 
-    # Get video to decrement count
-    video = db.query(Video).filter(Video.id == comment.video_id).first()
-
     # Delete comment
     db.delete(comment)
 
-    # Decrement comment_count
-    if video and video.comment_count > 0:
-        video.comment_count -= 1
+    # Decrement comment_count (atomic, never below zero)
+    adjust_comment_count(db, comment.video_id, -1)
 
     db.commit()
 
@@ -181,9 +185,9 @@ class CommentBatchInfoRequest(BaseModel):
 
 
 @router.post("/batch-info")
-async def get_comments_batch_info(
+def get_comments_batch_info(
     request: CommentBatchInfoRequest,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
     """
@@ -239,9 +243,9 @@ async def get_comments_batch_info(
 
 
 @router.post("/comments/{comment_id}/like", status_code=status.HTTP_204_NO_CONTENT)
-async def like_comment(
+def like_comment(
     comment_id: UUID,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
     """
@@ -283,9 +287,9 @@ async def like_comment(
 
 
 @router.delete("/comments/{comment_id}/like", status_code=status.HTTP_204_NO_CONTENT)
-async def unlike_comment(
+def unlike_comment(
     comment_id: UUID,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
     """
@@ -324,9 +328,9 @@ async def unlike_comment(
 
 
 @router.get("/comments/{comment_id}/like/check")
-async def check_comment_like(
+def check_comment_like(
     comment_id: UUID,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
     """
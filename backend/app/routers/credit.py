@@ -7,8 +7,11 @@ from pydantic import BaseModel
 from sqlalchemy import func
 
 from app.core.deps import get_db, get_current_user
+from app.services.principal_cache_service import get_principal_cache_service
+from app.services.response_cache_service import cache_response
 from app.models.user import User
 from app.models.credit import CreditTransaction
+from app.utils.count_utils import count_total
 
 router = APIRouter(prefix="/credits", tags=["credits"])
 
@@ -46,6 +49,7 @@ class CreditHistoryResponse(BaseModel):
     """Credit transaction history"""
     transactions: list[CreditHistoryItem]
     total: int
+    total_is_estimate: bool = False
     page: int
     page_size: int
     has_more: bool
@@ -83,7 +87,8 @@ CREDIT_PACKAGES = {
 
 
 @router.get("/packages")
-async def get_credit_packages():
+@cache_response(ttl=3600)  # Static; changes only with a deploy
+def get_credit_packages():
     """
     Get available credit packages
     Public endpoint - no authentication required
@@ -103,7 +108,7 @@ async def get_credit_packages():
 
 
 @router.post("/purchase", response_model=CreditPurchaseResponse)
-async def purchase_credits(
+def purchase_credits(
     request: CreditPurchaseRequest,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -157,6 +162,9 @@ async def purchase_credits(
     db.commit()
     db.refresh(transaction)
 
+    # Cached principal carries the balance
+    get_principal_cache_service().invalidate(current_user.id)
+
     return CreditPurchaseResponse(
         transaction_id=transaction.id,
         credits_added=package["credits"],
@@ -167,7 +175,7 @@ async def purchase_credits(
 
 
 @router.get("/balance", response_model=CreditBalanceResponse)
-async def get_credit_balance(
+def get_credit_balance(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -200,7 +208,7 @@ async def get_credit_balance(
 
 
 @router.get("/history", response_model=CreditHistoryResponse)
-async def get_credit_history(
+def get_credit_history(
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(20, ge=1, le=100, description="Items per page"),
     transaction_type: Optional[str] = Query(None, regex="^(purchase|usage|refund|bonus)$"),
@@ -219,21 +227,24 @@ async def get_credit_history(
     if transaction_type:
         query = query.filter(CreditTransaction.transaction_type == transaction_type)
 
-    # Get total count
-    total = query.count()
-
-    # Apply pagination
+    # Apply pagination (one extra row tells whether there are more pages)
     offset = (page - 1) * page_size
     transactions = query.order_by(
         CreditTransaction.created_at.desc()
-    ).offset(offset).limit(page_size).all()
+    ).offset(offset).limit(page_size + 1).all()
 
-    # Check if there are more pages
-    has_more = (offset + len(transactions)) < total
+    has_more = len(transactions) > page_size
+    transactions = transactions[:page_size]
+
+    # Total (exact when cheap, estimated otherwise)
+    total, total_is_estimate = count_total(
+        db, query, returned=len(transactions) + int(has_more), limit=page_size + 1, offset=offset
+    )
 
     return CreditHistoryResponse(
         transactions=transactions,
         total=total,
+        total_is_estimate=total_is_estimate,
         page=page,
         page_size=page_size,
         has_more=has_more
@@ -241,7 +252,7 @@ async def get_credit_history(
 
 
 @router.get("/daily-status", response_model=DailyStatusResponse)
-async def get_daily_credit_status(
+def get_daily_credit_status(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -281,7 +292,7 @@ async def get_daily_credit_status(
 
 
 @router.post("/daily-claim", response_model=DailyClaimResponse)
-async def claim_daily_credits(
+def claim_daily_credits(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -336,6 +347,9 @@ async def claim_daily_credits(
     db.commit()
     db.refresh(current_user)
 
+    # Cached principal carries the balance
+    get_principal_cache_service().invalidate(current_user.id)
+
     # Calculate next claim time (next midnight)
     next_midnight = (now + timedelta(days=1)).replace(
         hour=0, minute=0, second=0, microsecond=0
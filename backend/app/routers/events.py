@@ -0,0 +1,96 @@
+import asyncio
+import json
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+
+from app.core.config import settings
+from app.core.deps import decode_token_user_id
+from app.db.session import SessionLocal
+from app.services.event_stream_service import get_event_stream_service
+from app.services.notification_counter_service import get_notification_counter_service
+from app.services.principal_cache_service import get_principal_cache_service
+
+router = APIRouter(prefix="/events", tags=["events"])
+
+
+def _sse(event: str, data: dict) -> str:
+    """Format one server-sent event"""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+def _authenticate(token: Optional[str]):
+    """
+    Resolve the stream's user and initial unread count
+    Uses a short-lived session: nothing is held open for the stream's lifetime
+    """
+    user_id = decode_token_user_id(token) if token else None
+    if user_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    db = SessionLocal()
+    try:
+        user = get_principal_cache_service().get(db, user_id)
+        if user is None or not user.is_active:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="User not found or inactive",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+        unread_count = get_notification_counter_service().get_unread(db, user.id)
+    finally:
+        db.close()
+
+    return user.id, unread_count
+
+
+@router.get("/stream")
+async def stream_events(
+    token: Optional[str] = Query(None, description="Access token (EventSource cannot send headers)"),
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(HTTPBearer(auto_error=False))
+):
+    """
+    Server-sent event stream for the current user
+    Replaces polling /notifications/unread-count and /ai/jobs/batch-status
+
+    Events:
+    - unread_count: sent on connect
+    - notification: a notification was created (or coalesced)
+    - ai_job: an AI job changed status
+    """
+    # Sync session and Redis lookups: keep them off the event loop
+    user_id, unread_count = await run_in_threadpool(
+        _authenticate, credentials.credentials if credentials else token
+    )
+    event_stream = get_event_stream_service()
+
+    async def event_generator():
+        queue = await event_stream.subscribe(user_id)
+        try:
+            yield _sse("unread_count", {"unread_count": unread_count})
+
+            while True:
+                try:
+                    message = await asyncio.wait_for(queue.get(), timeout=settings.EVENT_STREAM_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"  # Keeps proxies from closing idle streams
+                    continue
+
+                message = json.loads(message)
+                yield _sse(message["event"], message["data"])
+        finally:
+            # Client disconnected (the response task is cancelled)
+            await event_stream.unsubscribe(user_id, queue)
+
+    return StreamingResponse(
+        event_generator(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -1,15 +1,18 @@
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
-from sqlalchemy import func, and_, or_
 from typing import Optional
-from datetime import datetime, timedelta
+from datetime import datetime
+from uuid import UUID
 
-from app.core.deps import get_db, get_current_user
+from app.core.deps import get_read_db, get_current_principal, Principal
 from app.models.user import User
 from app.models.video import Video
-from app.models.social import VideoGlitch, Like, Follow, Block
+from app.models.social import VideoGlitch, Follow, Block
 from app.schemas.feed import FeedResponse
 from app.schemas.user import UserBasicInfo
+from app.services.feed_pool_service import get_feed_pool_service
+from app.services.view_counter_service import get_view_counter_service
+from app.utils.pagination import encode_cursor, decode_cursor, keyset_before
 
 router = APIRouter(prefix="/feed", tags=["feed"])
 
@@ -40,16 +43,8 @@ def build_video_responses_optimized(db: Session, videos: list) -> list:
     users = db.query(User).filter(User.id.in_(user_ids)).all()
     users_dict = {u.id: u for u in users}
     
-    # Batch query 2: Get glitch counts for all videos at once
-    glitch_counts = db.query(
-        VideoGlitch.original_video_id,
-        func.count(VideoGlitch.id).label('count')
-    ).filter(
-        VideoGlitch.original_video_id.in_(video_ids)
-    ).group_by(VideoGlitch.original_video_id).all()
-    glitch_counts_dict = {g[0]: g[1] for g in glitch_counts}
-    
-    # Batch query 3: Get original video IDs for glitches
+    # Batch query 2: Get original video IDs for glitches
+    # (glitch_count is the denormalized Video.glitch_count column)
     glitches = db.query(
         VideoGlitch.glitch_video_id,
         VideoGlitch.original_video_id
@@ -58,6 +53,9 @@ def build_video_responses_optimized(db: Session, videos: list) -> list:
     ).all()
     glitches_dict = {g[0]: g[1] for g in glitches}
     
+    # Views still buffered in Redis (no DB query)
+    pending_views = get_view_counter_service().get_pending(video_ids)
+    
     # Build responses using cached data
     video_responses = []
     for video in videos:
@@ -65,24 +63,19 @@ def build_video_responses_optimized(db: Session, videos: list) -> list:
         if not user:
             continue  # Skip if user not found (shouldn't happen)
         
-        glitch_count = glitch_counts_dict.get(video.id, 0)
         original_video_id = glitches_dict.get(video.id)
         
         video_responses.append({
             "id": video.id,
-            "user": UserBasicInfo(
-                id=user.id,
-                username=user.username,
-                profile_image=user.profile_image
-            ),
+            "user": UserBasicInfo.model_validate(user),
             "video_url": video.video_url,
             "thumbnail_url": video.thumbnail_url,
             "duration_seconds": video.duration_seconds,
             "caption": video.caption,
-            "view_count": video.view_count,
+            "view_count": video.view_count + pending_views.get(video.id, 0),
             "like_count": video.like_count,
             "comment_count": video.comment_count,
-            "glitch_count": glitch_count,
+            "glitch_count": video.glitch_count,
             "original_video_id": original_video_id,
             "created_at": video.created_at
         })
@@ -91,70 +84,86 @@ def build_video_responses_optimized(db: Session, videos: list) -> list:
 
 
 @router.get("/for-you", response_model=FeedResponse)
-async def get_for_you_feed(
+def get_for_you_feed(
     page_size: int = Query(20, ge=1, le=100, description="Items per page"),
     cursor: Optional[str] = Query(None, description="Cursor for pagination"),
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_principal),
+    db: Session = Depends(get_read_db)
 ):
     """
     For You feed with personalized recommendations
     
     Algorithm:
-    1. Exclude blocked users and users who blocked you
-    2. Prioritize videos from users you follow
-    3. Show trending videos (high engagement in last 7 days)
-    4. Mix in new content from various creators
-    5. Avoid showing same creator consecutively
+    1. Start from the precomputed candidate pool (engagement score with time decay)
+    2. Merge in recent videos from users you follow and rank them first
+    3. Exclude blocked users and users who blocked you
+    4. Avoid showing same creator consecutively
     
-    Performance: Optimized with batch queries (No N+1)
+    Performance: Ranking happens in memory over the pool (size bounded by
+    FEED_POOL_SIZE), so latency does not grow with the videos table
+
+    Paging: the first page pins the viewer's ranking (FEED_RANKING_TTL_SECONDS);
+    cursors page through it, so pool refreshes don't repeat or skip videos.
+    Cursors whose ranking expired are rejected with 410 (reload the feed).
     """
     # Get blocked user IDs (both ways)
     blocked_ids = get_blocked_user_ids(db, current_user.id)
     blocking_ids = get_blocking_user_ids(db, current_user.id)
-    excluded_user_ids = list(set(blocked_ids + blocking_ids))
-    
-    # Get users current user follows
-    following = db.query(Follow.following_id).filter(
-        Follow.follower_id == current_user.id
-    ).all()
-    following_ids = [f.following_id for f in following]
-    
-    # Get videos current user already liked (to diversify recommendations)
-    liked_video_ids = db.query(Like.video_id).filter(
-        Like.user_id == current_user.id
-    ).limit(100).all()
-    liked_video_ids = [like.video_id for like in liked_video_ids]
-    
-    # Base query: completed, public videos
-    query = db.query(Video).filter(
-        Video.status == "completed",
-        Video.is_public == True,
-        Video.deleted_at.is_(None)
-    )
+    excluded_user_ids = set(blocked_ids + blocking_ids)
     
-    # Exclude blocked users
-    if excluded_user_ids:
-        query = query.filter(Video.user_id.notin_(excluded_user_ids))
+    pool_service = get_feed_pool_service()
     
-    # Apply cursor pagination
     if cursor:
-        query = query.filter(Video.id < cursor)
-    
-    # Calculate engagement score for ranking
-    # Score = (likes * 3 + comments * 5 + glitches * 10 + views * 0.1) / days_old
-    # Higher weight for recent content
-    seven_days_ago = datetime.utcnow() - timedelta(days=7)
+        # Later pages: read the ranking pinned by the first page
+        token, offset = decode_cursor(cursor, str, int)
+        page_ids = pool_service.get_ranking_page(current_user.id, token, offset, page_size + 1) if offset >= 0 else None
+        if page_ids is None:
+            raise HTTPException(
+                status_code=status.HTTP_410_GONE,
+                detail="Feed was refreshed, reload from the first page"
+            )
+    else:
+        # Get users current user follows
+        following = db.query(Follow.following_id).filter(
+            Follow.follower_id == current_user.id
+        ).all()
+        following_ids = {f.following_id for f in following}
+        
+        # Candidates: global pool + recent videos from followed creators
+        candidates = pool_service.get_candidates(db)
+        candidates += pool_service.get_followed_candidates(db, list(following_ids))
+        
+        # Merge in memory (deduplicate, drop blocked users)
+        merged = {}
+        for video_id, user_id, score in candidates:
+            if user_id in excluded_user_ids or video_id in merged:
+                continue
+            merged[video_id] = (user_id in following_ids, score, str(video_id))
+        
+        # Rank: followed creators first, then by score
+        ranked_ids = [video_id for video_id, _ in sorted(merged.items(), key=lambda item: item[1], reverse=True)]
+        
+        # Pin the ranking only when there is a next page
+        offset = 0
+        token = pool_service.save_ranking(current_user.id, ranked_ids) if len(ranked_ids) > page_size else None
+        page_ids = ranked_ids[:page_size + 1]
     
-    # Subquery for engagement score
-    videos = query.order_by(
-        # Prioritize followed users
-        Video.user_id.in_(following_ids).desc() if following_ids else Video.created_at.desc(),
-        # Then by engagement (like_count + comment_count + glitch_count)
-        (Video.like_count + Video.comment_count * 2 + Video.glitch_count * 3).desc(),
-        # Then by recency
-        Video.created_at.desc()
-    ).limit(page_size * 3).all()  # Get more to filter and diversify
+    # Check if there are more videos
+    has_more = len(page_ids) > page_size
+    page_ids = page_ids[:page_size]
+    
+    # Load page rows (ranking may be slightly stale, so re-check visibility and blocks)
+    videos_by_id = {
+        video.id: video
+        for video in db.query(Video).filter(
+            Video.id.in_(page_ids),
+            Video.status == "completed",
+            Video.is_public.is_(True),
+            Video.deleted_at.is_(None)
+        ).all()
+        if video.user_id not in excluded_user_ids
+    } if page_ids else {}
+    videos = [videos_by_id[video_id] for video_id in page_ids if video_id in videos_by_id]
     
     # Diversify: avoid consecutive videos from same creator
     diversified_videos = []
@@ -162,9 +171,6 @@ async def get_for_you_feed(
     skipped_videos = []
     
     for video in videos:
-        if len(diversified_videos) >= page_size:
-            break
-        
         # Skip if same user as last video
         if video.user_id == last_user_id:
             skipped_videos.append(video)
@@ -173,22 +179,14 @@ async def get_for_you_feed(
         diversified_videos.append(video)
         last_user_id = video.user_id
     
-    # Fill remaining slots with skipped videos if needed
-    if len(diversified_videos) < page_size:
-        remaining = page_size - len(diversified_videos)
-        diversified_videos.extend(skipped_videos[:remaining])
-    
-    # Limit to page_size
-    videos = diversified_videos[:page_size]
-    
-    # Check if there are more videos
-    has_more = len(videos) == page_size
+    # Put skipped videos at the end of the page
+    diversified_videos.extend(skipped_videos)
     
     # Build video responses with optimized batch queries (No N+1)
-    video_responses = build_video_responses_optimized(db, videos)
+    video_responses = build_video_responses_optimized(db, diversified_videos)
     
-    # Get next cursor
-    next_cursor = str(videos[-1].id) if has_more and videos else None
+    # Get next cursor (position in the pinned ranking, not display order)
+    next_cursor = encode_cursor(token, offset + page_size) if has_more else None
     
     return FeedResponse(
         videos=video_responses,
@@ -201,11 +199,11 @@ async def get_for_you_feed(
 
 
 @router.get("/following", response_model=FeedResponse)
-async def get_following_feed(
+def get_following_feed(
     page_size: int = Query(20, ge=1, le=100, description="Items per page"),
     cursor: Optional[str] = Query(None, description="Cursor for pagination"),
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_principal),
+    db: Session = Depends(get_read_db)
 ):
     """
     Following feed - videos from users you follow
@@ -248,12 +246,14 @@ async def get_following_feed(
         Video.user_id.in_(following_ids)
     )
     
-    # Apply cursor pagination
+    # Apply cursor pagination (keyset on created_at, id)
     if cursor:
-        query = query.filter(Video.id < cursor)
+        query = query.filter(
+            keyset_before([Video.created_at, Video.id], decode_cursor(cursor, datetime, UUID))
+        )
     
     # Get videos sorted by recency
-    videos = query.order_by(Video.created_at.desc()).limit(page_size + 1).all()
+    videos = query.order_by(Video.created_at.desc(), Video.id.desc()).limit(page_size + 1).all()
     
     # Check if there are more videos
     has_more = len(videos) > page_size
@@ -264,7 +264,7 @@ async def get_following_feed(
     video_responses = build_video_responses_optimized(db, videos)
     
     # Get next cursor
-    next_cursor = str(videos[-1].id) if has_more and videos else None
+    next_cursor = encode_cursor(videos[-1].created_at, videos[-1].id) if has_more and videos else None
     
     return FeedResponse(
         videos=video_responses,
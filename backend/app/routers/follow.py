@@ -4,19 +4,20 @@ from uuid import UUID
 from typing import List
 from pydantic import BaseModel
 
-from app.core.deps import get_db, get_current_user
+from app.core.deps import get_db, get_current_principal, Principal
 from app.models.user import User
 from app.models.social import Follow
 from app.schemas.social import FollowResponse, FollowListResponse
+from app.services.response_cache_service import get_response_cache_service
 from app.utils.notification_utils import create_notification
 
 router = APIRouter(prefix="/follows", tags=["follows"])
 
 
 @router.post("/users/{user_id}", response_model=FollowResponse, status_code=status.HTTP_201_CREATED)
-async def follow_user(
+def follow_user(
     user_id: UUID,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
     """
@@ -55,8 +56,6 @@ async def follow_user(
         following_id=user_id
     )
     db.add(follow)
-    db.commit()
-    db.refresh(follow)
 
     # Create notification for followed user
     create_notification(
@@ -67,13 +66,19 @@ async def follow_user(
         target_id=None
     )
 
+    db.commit()
+    db.refresh(follow)
+
+    # Follower/following counts on both profiles
+    get_response_cache_service().invalidate(f"user:{user_id}", f"user:{current_user.id}")
+
     return follow
 
 
 @router.delete("/users/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def unfollow_user(
+def unfollow_user(
     user_id: UUID,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
     """
@@ -95,11 +100,13 @@ async def unfollow_user(
     db.delete(follow)
     db.commit()
 
+    get_response_cache_service().invalidate(f"user:{user_id}", f"user:{current_user.id}")
+
     return None
 
 
 @router.get("/users/{user_id}/followers", response_model=FollowListResponse)
-async def get_user_followers(
+def get_user_followers(
     user_id: UUID,
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
@@ -136,7 +143,7 @@ async def get_user_followers(
 
 
 @router.get("/users/{user_id}/following", response_model=FollowListResponse)
-async def get_user_following(
+def get_user_following(
     user_id: UUID,
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
@@ -173,9 +180,9 @@ async def get_user_following(
 
 
 @router.get("/users/{user_id}/check")
-async def check_if_following(
+def check_if_following(
     user_id: UUID,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
     """
@@ -195,9 +202,9 @@ class FollowBatchCheckRequest(BaseModel):
 
 
 @router.post("/check-batch")
-async def check_follows_batch(
+def check_follows_batch(
     request: FollowBatchCheckRequest,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
     """
@@ -2,21 +2,22 @@ from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from uuid import UUID
 
-from app.core.deps import get_db, get_current_user
+from app.core.deps import get_db, get_current_principal, Principal
 from app.models.user import User
 from app.models.video import Video
 from app.models.social import VideoGlitch, Like
 from app.schemas.glitch import GlitchChainResponse, GlitchSourceResponse
 from app.schemas.user import UserBasicInfo
+from app.services.response_cache_service import cache_response
 
 router = APIRouter(prefix="/glitch", tags=["glitch"])
 
 
 @router.get("/videos/{video_id}/glitches", response_model=GlitchChainResponse)
-async def get_video_glitches(
+def get_video_glitches(
     video_id: UUID,
     sort: str = Query("latest", regex="^(latest|popular)$"),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
     """
@@ -64,19 +65,10 @@ async def get_video_glitches(
                     Like.video_id == glitch_video.id
                 ).first() is not None
                 
-                # Get glitch count for this video
-                video_glitch_count = db.query(VideoGlitch).filter(
-                    VideoGlitch.original_video_id == glitch_video.id
-                ).count()
-                
                 # Build VideoResponse
                 glitch_videos.append({
                     "id": glitch_video.id,
-                    "user": UserBasicInfo(
-                        id=user.id,
-                        username=user.username,
-                        profile_image=user.profile_image
-                    ),
+                    "user": UserBasicInfo.model_validate(user),
                     "video_url": glitch_video.video_url,
                     "thumbnail_url": glitch_video.thumbnail_url,
                     "duration_seconds": glitch_video.duration_seconds,
@@ -84,7 +76,7 @@ async def get_video_glitches(
                     "view_count": glitch_video.view_count,
                     "like_count": glitch_video.like_count,
                     "comment_count": glitch_video.comment_count,
-                    "glitch_count": video_glitch_count,
+                    "glitch_count": glitch_video.glitch_count,
                     "original_video_id": glitch.original_video_id,
                     "created_at": glitch_video.created_at
                 })
@@ -97,9 +89,15 @@ async def get_video_glitches(
 
 
 @router.get("/videos/{video_id}/source", response_model=GlitchSourceResponse)
-async def get_glitch_source(
+@cache_response(
+    tags=lambda source: [
+        f"video:{video_id}" for video_id in (source["glitch_video_id"], source["original_video_id"]) if video_id
+    ],
+    vary_on_user=True  # Private originals are hidden from other viewers
+)
+def get_glitch_source(
     video_id: UUID,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
     """
@@ -1,56 +1,79 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import func
-from typing import List
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload
+from typing import List, Optional
+from datetime import datetime
+from uuid import UUID
 from pydantic import BaseModel
 
-from app.core.deps import get_db
-from app.models.hashtag import Hashtag
+from app.core.deps import get_async_read_db, get_read_db
+from app.models.hashtag import Hashtag, video_hashtags
 from app.models.video import Video
-from app.models.social import VideoGlitch
 from app.schemas.hashtag import (
     HashtagVideoListResponse,
     TrendingHashtagsResponse
 )
+from app.services.response_cache_service import cache_response
+from app.services.trending_service import get_trending_service
+from app.utils.count_utils import count_total
+from app.utils.pagination import encode_cursor, decode_cursor, keyset_before
 
 router = APIRouter(prefix="/hashtags", tags=["hashtags"])
 
 
 @router.get("/trending", response_model=TrendingHashtagsResponse)
-async def get_trending_hashtags(
+@cache_response(tags=lambda trending: ["hashtag:trending"])
+def get_trending_hashtags(
     limit: int = Query(20, ge=1, le=100),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """
-    Get trending hashtags (sorted by use_count)
+    Get trending hashtags (time-decayed score of recent uses and views)
+    Served from the precomputed trending snapshot
     Public endpoint - no authentication required
+    Sync route: the snapshot and response cache are read with the sync Redis client
     """
-    hashtags = db.query(Hashtag).filter(
-        Hashtag.use_count > 0
-    ).order_by(
-        Hashtag.use_count.desc()
-    ).limit(limit).all()
+    snapshot = get_trending_service().get_snapshot()
+    if snapshot and snapshot["hashtags"]:
+        return TrendingHashtagsResponse(
+            hashtags=snapshot["hashtags"][:limit],
+            total=len(snapshot["hashtags"])
+        )
+
+    # No snapshot yet (cold start): fall back to lifetime use_count
+    query = db.query(Hashtag).filter(Hashtag.use_count > 0)
+    hashtags = query.order_by(Hashtag.use_count.desc()).limit(limit).all()
 
-    total = db.query(Hashtag).filter(Hashtag.use_count > 0).count()
+    total, total_is_estimate = count_total(
+        db,
+        query,
+        returned=len(hashtags),
+        limit=limit,
+        cache_key="hashtags:used"
+    )
 
-    return TrendingHashtagsResponse(hashtags=hashtags, total=total)
+    return TrendingHashtagsResponse(hashtags=hashtags, total=total, total_is_estimate=total_is_estimate)
 
 
 @router.get("/{hashtag_name}/videos", response_model=HashtagVideoListResponse)
 async def get_hashtag_videos(
     hashtag_name: str,
     limit: int = Query(20, ge=1, le=100),
-    db: Session = Depends(get_db)
+    sort: str = Query("latest", regex="^(latest|popular)$"),
+    cursor: Optional[str] = Query(None, description="Cursor for pagination"),
+    db: AsyncSession = Depends(get_async_read_db)
 ):
     """
     Get videos for a specific hashtag
     Public endpoint - no authentication required
     Only returns completed and public videos
+    Sorted by latest or most viewed, paginated with next_cursor
     """
     # Find hashtag (case-insensitive)
-    hashtag = db.query(Hashtag).filter(
-        Hashtag.name == hashtag_name.lower()
-    ).first()
+    hashtag = await db.scalar(
+        select(Hashtag).where(Hashtag.name == hashtag_name.lower())
+    )
 
     if not hashtag:
         raise HTTPException(
@@ -58,35 +81,65 @@ async def get_hashtag_videos(
             detail=f"Hashtag #{hashtag_name} not found"
         )
 
-    # Get videos with this hashtag (only completed and public)
-    videos = db.query(Video).join(
-        Video.hashtags
-    ).filter(
-        Hashtag.id == hashtag.id,
-        Video.status == "completed",
-        Video.is_public.is_(True)
-    ).order_by(
-        Video.created_at.desc()
-    ).limit(limit).all()
-
-    # Add glitch_count to each video
-    for video in videos:
-        video.glitch_count = db.query(VideoGlitch).filter(
-            VideoGlitch.original_video_id == video.id
-        ).count()
-
-    total = db.query(Video).join(
-        Video.hashtags
-    ).filter(
-        Hashtag.id == hashtag.id,
-        Video.status == "completed",
-        Video.is_public.is_(True)
-    ).count()
+    # Read video IDs from the per-hashtag index (no join to videos)
+    listed = [
+        video_hashtags.c.hashtag_id == hashtag.id,
+        video_hashtags.c.is_listed  # Matches the partial indexes' predicate
+    ]
+    query = select(video_hashtags.c.video_id).where(*listed)
+
+    if sort == "popular":
+        sort_columns = [video_hashtags.c.popularity, video_hashtags.c.video_id]
+        sort_types = (int, UUID)
+    else:
+        sort_columns = [video_hashtags.c.video_created_at, video_hashtags.c.video_id]
+        sort_types = (datetime, UUID)
+
+    # Apply cursor pagination (keyset on the sort key, video_id)
+    page_query = query
+    if cursor:
+        page_query = page_query.where(keyset_before(sort_columns, decode_cursor(cursor, *sort_types)))
+
+    rows = (await db.execute(
+        page_query.add_columns(*sort_columns[:1]).order_by(
+            *[column.desc() for column in sort_columns]
+        ).limit(limit + 1)
+    )).all()
+
+    # Check if there are more videos
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    # Load the page's videos (with their users), keeping index order
+    videos_by_id = {
+        video.id: video
+        for video in (await db.scalars(
+            select(Video).options(selectinload(Video.user)).where(
+                Video.id.in_([row.video_id for row in rows])
+            )
+        )).all()
+    } if rows else {}
+    videos = [videos_by_id[row.video_id] for row in rows if row.video_id in videos_by_id]
+
+    # Get next cursor
+    next_cursor = encode_cursor(rows[-1][1], rows[-1].video_id) if has_more else None
+
+    # Total for the whole tag (a short page only ends the list on the first page)
+    total, total_is_estimate = await db.run_sync(lambda session: count_total(
+        session,
+        session.query(video_hashtags.c.video_id).filter(*listed),
+        returned=None if cursor else len(rows),
+        limit=limit,
+        cache_key=f"hashtag:{hashtag.id}:videos"
+    ))
 
     return HashtagVideoListResponse(
         hashtag=hashtag,
         videos=videos,
-        total=total
+        total=total,
+        total_is_estimate=total_is_estimate,
+        has_more=has_more,
+        next_cursor=next_cursor
     )
 
 
@@ -96,13 +149,14 @@ class HashtagBatchStatsRequest(BaseModel):
 
 
 @router.post("/batch-stats")
-async def get_hashtags_batch_stats(
+def get_hashtags_batch_stats(
     request: HashtagBatchStatsRequest,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """
     Get statistics for multiple hashtags at once
-    Includes video count, total views, latest thumbnail, and trending score
+    Includes video count, total views, latest thumbnail, trending score
+    and uses/views in the last 24 hours
     Maximum 50 hashtags per request
     Public endpoint - no authentication required
     """
@@ -119,56 +173,21 @@ async def get_hashtags_batch_stats(
     # Normalize hashtag names (lowercase)
     normalized_names = [name.lower() for name in request.hashtag_names]
 
-    # Query all hashtags
-    hashtags = db.query(Hashtag).filter(
-        Hashtag.name.in_(normalized_names)
-    ).all()
-
-    # Build result dictionary
-    result = {}
-    for hashtag in hashtags:
-        # Get video count
-        video_count = db.query(Video).join(
-            Video.hashtags
-        ).filter(
-            Hashtag.id == hashtag.id,
-            Video.status == "completed",
-            Video.is_public.is_(True),
-            Video.deleted_at.is_(None)
-        ).count()
-
-        # Get total views (sum of view_count from all videos with this hashtag)
-        total_views = db.query(func.sum(Video.view_count)).join(
-            Video.hashtags
-        ).filter(
-            Hashtag.id == hashtag.id,
-            Video.status == "completed",
-            Video.is_public.is_(True),
-            Video.deleted_at.is_(None)
-        ).scalar() or 0
-
-        # Get latest video thumbnail
-        latest_video = db.query(Video).join(
-            Video.hashtags
-        ).filter(
-            Hashtag.id == hashtag.id,
-            Video.status == "completed",
-            Video.is_public.is_(True),
-            Video.deleted_at.is_(None)
-        ).order_by(Video.created_at.desc()).first()
-
-        latest_thumbnail = latest_video.thumbnail_url if latest_video else None
-
-        # Calculate trending score (simple formula: use_count * 0.7 + video_count * 0.3)
-        trending_score = round(hashtag.use_count * 0.7 + video_count * 0.3, 2)
-
-        result[hashtag.name] = {
-            "video_count": video_count,
-            "total_views": int(total_views),
-            "latest_thumbnail": latest_thumbnail,
-            "trending_score": trending_score,
-            "use_count": hashtag.use_count
-        }
+    # Trending hashtags come precomputed from the snapshot
+    snapshot = get_trending_service().get_snapshot() or {"stats": {}}
+    result = {
+        name: snapshot["stats"][name]
+        for name in normalized_names
+        if name in snapshot["stats"]
+    }
+
+    # Remaining hashtags: grouped queries for all of them at once
+    remaining = [name for name in normalized_names if name not in result]
+    if remaining:
+        trending_service = get_trending_service()
+        hashtags = db.query(Hashtag).filter(Hashtag.name.in_(remaining)).all()
+        scores = trending_service.current_scores([hashtag.name for hashtag in hashtags])
+        result.update(trending_service.collect_stats(db, hashtags, scores))
 
     # Add missing hashtags as not found
     for name in normalized_names:
@@ -178,7 +197,9 @@ async def get_hashtags_batch_stats(
                 "total_views": 0,
                 "latest_thumbnail": None,
                 "trending_score": 0.0,
-                "use_count": 0
+                "use_count": 0,
+                "uses_24h": 0,
+                "views_24h": 0
             }
 
     return {"hashtags": result}
@@ -1,8 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
-from app.core.deps import get_db, get_current_user
-from app.models.user import User
+from app.core.deps import get_db, get_current_principal, Principal
 from app.schemas.image import ImageUploadRequest, ImageUploadResponse
 from app.services.mock_s3_service import get_mock_s3_service
 
@@ -10,9 +9,9 @@ router = APIRouter(prefix="/images", tags=["images"])
 
 
 @router.post("/upload-url", response_model=ImageUploadResponse)
-async def get_image_upload_url(
+def get_image_upload_url(
     request: ImageUploadRequest,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
     """
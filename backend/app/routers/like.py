@@ -4,8 +4,7 @@ from uuid import UUID
 from typing import List
 from pydantic import BaseModel
 
-from app.core.deps import get_db, get_current_user
-from app.models.user import User
+from app.core.deps import get_db, get_current_principal, Principal
 from app.models.video import Video
 from app.models.social import Like
 from app.schemas.social import LikeResponse
@@ -15,9 +14,9 @@ router = APIRouter(prefix="/likes", tags=["likes"])
 
 
 @router.post("/videos/{video_id}", response_model=LikeResponse, status_code=status.HTTP_201_CREATED)
-async def like_video(
+def like_video(
     video_id: UUID,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
     """
@@ -53,9 +52,6 @@ async def like_video(
     # Increment like_count
     video.like_count += 1
 
-    db.commit()
-    db.refresh(like)
-
     # Create notification for video owner
     create_notification(
         db=db,
@@ -65,13 +61,16 @@ async def like_video(
         target_id=video_id
     )
 
+    db.commit()
+    db.refresh(like)
+
     return like
 
 
 @router.delete("/videos/{video_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def unlike_video(
+def unlike_video(
     video_id: UUID,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
     """
@@ -110,9 +109,9 @@ async def unlike_video(
 
 
 @router.get("/videos/{video_id}/check")
-async def check_if_liked(
+def check_if_liked(
     video_id: UUID,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
     """
@@ -132,9 +131,9 @@ class LikeBatchCheckRequest(BaseModel):
 
 
 @router.post("/check-batch")
-async def check_likes_batch(
+def check_likes_batch(
     request: LikeBatchCheckRequest,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
     """
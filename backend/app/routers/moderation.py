@@ -3,7 +3,7 @@ from sqlalchemy.orm import Session
 from uuid import UUID
 from typing import List
 
-from app.core.deps import get_db, get_current_user
+from app.core.deps import get_db, get_current_principal, Principal
 from app.models.user import User
 from app.models.video import Video
 from app.models.social import Comment, Block, Report
@@ -22,9 +22,9 @@ router = APIRouter(prefix="/moderation", tags=["moderation"])
 
 
 @router.post("/block", response_model=BlockResponse, status_code=status.HTTP_201_CREATED)
-async def block_user(
+def block_user(
     request: BlockUserRequest,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
     """
@@ -71,9 +71,9 @@ async def block_user(
 
 
 @router.delete("/block/{blocked_user_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def unblock_user(
+def unblock_user(
     blocked_user_id: UUID,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
     """
@@ -97,9 +97,9 @@ async def unblock_user(
 
 
 @router.get("/blocks", response_model=BlockListResponse)
-async def get_blocked_users(
+def get_blocked_users(
     limit: int = Query(50, ge=1, le=100),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
     """
@@ -141,9 +141,9 @@ async def get_blocked_users(
 
 
 @router.post("/report", response_model=ReportResponse, status_code=status.HTTP_201_CREATED)
-async def report_content(
+def report_content(
     request: ReportRequest,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
     """
@@ -206,9 +206,9 @@ async def report_content(
 
 
 @router.get("/reports", response_model=ReportListResponse)
-async def get_my_reports(
+def get_my_reports(
     limit: int = Query(50, ge=1, le=100),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
     """
@@ -227,9 +227,9 @@ async def get_my_reports(
 
 
 @router.get("/is-blocked/{user_id}")
-async def check_if_blocked(
+def check_if_blocked(
     user_id: UUID,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
     """
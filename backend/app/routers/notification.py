@@ -1,72 +1,100 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 from uuid import UUID
-from typing import List
+from typing import List, Optional
+from datetime import datetime
 from pydantic import BaseModel
 
-from app.core.deps import get_db, get_current_user
-from app.models.user import User
+from app.core.deps import get_async_db, get_current_principal, Principal
 from app.models.notification import Notification
 from app.schemas.notification import (
     NotificationListResponse,
     UnreadCountResponse
 )
+from app.services.notification_counter_service import get_notification_counter_service
+from app.utils.count_utils import count_total
+from app.utils.pagination import encode_cursor, decode_cursor, keyset_before
 
 router = APIRouter(prefix="/notifications", tags=["notifications"])
 
 
 @router.get("/", response_model=NotificationListResponse)
 async def get_notifications(
-    page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="Cursor for pagination"),
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
-    Get current user's notifications
+    Get current user's notifications (infinite scroll)
     Requires authentication
     """
-    # Get total count
-    total = db.query(Notification).filter(
-        Notification.user_id == current_user.id
-    ).count()
-
-    # Get unread count
-    unread_count = db.query(Notification).filter(
-        Notification.user_id == current_user.id,
-        Notification.is_read.is_(False)
-    ).count()
+    # Get unread count (cached counter)
+    unread_count = await db.run_sync(
+        lambda session: get_notification_counter_service().get_unread(session, current_user.id)
+    )
 
     # Get notifications
-    offset = (page - 1) * page_size
-    notifications = db.query(Notification).filter(
+    query = select(Notification).where(
         Notification.user_id == current_user.id
-    ).order_by(
-        Notification.created_at.desc()
-    ).offset(offset).limit(page_size).all()
+    )
+
+    # Apply cursor pagination (keyset on created_at, id)
+    if cursor:
+        query = query.where(
+            keyset_before([Notification.created_at, Notification.id], decode_cursor(cursor, datetime, UUID))
+        )
+
+    notifications = (await db.scalars(
+        query.options(selectinload(Notification.actor)).order_by(
+            Notification.created_at.desc(),
+            Notification.id.desc()
+        ).limit(page_size + 1)
+    )).all()
+
+    # Check if there are more notifications
+    has_more = len(notifications) > page_size
+    if has_more:
+        notifications = notifications[:page_size]
+
+    # Get next cursor
+    next_cursor = encode_cursor(notifications[-1].created_at, notifications[-1].id) if has_more else None
+
+    # Total (exact when cheap, estimated for very long histories)
+    total, total_is_estimate = await db.run_sync(lambda session: count_total(
+        session,
+        session.query(Notification).filter(Notification.user_id == current_user.id),
+        returned=None if cursor else len(notifications),
+        limit=page_size
+    ))
 
     return NotificationListResponse(
         notifications=notifications,
         total=total,
+        total_is_estimate=total_is_estimate,
         unread_count=unread_count,
-        page=page,
-        page_size=page_size
+        page=1,
+        page_size=page_size,
+        has_more=has_more,
+        next_cursor=next_cursor
     )
 
 
 @router.get("/unread-count", response_model=UnreadCountResponse)
 async def get_unread_count(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get unread notification count
+    Served from the Redis counter (one GET)
     Requires authentication
     """
-    unread_count = db.query(Notification).filter(
-        Notification.user_id == current_user.id,
-        Notification.is_read.is_(False)
-    ).count()
+    unread_count = await db.run_sync(
+        lambda session: get_notification_counter_service().get_unread(session, current_user.id)
+    )
 
     return UnreadCountResponse(unread_count=unread_count)
 
@@ -74,45 +102,59 @@ async def get_unread_count(
 @router.patch("/{notification_id}/read")
 async def mark_notification_read(
     notification_id: UUID,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Mark notification as read
     Requires authentication
     """
-    notification = db.query(Notification).filter(
-        Notification.id == notification_id,
-        Notification.user_id == current_user.id
-    ).first()
+    notification_exists = await db.scalar(
+        select(Notification.id).where(
+            Notification.id == notification_id,
+            Notification.user_id == current_user.id
+        )
+    )
 
-    if not notification:
+    if not notification_exists:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Notification not found"
         )
 
-    notification.is_read = True
-    db.commit()
+    # Only an unread -> read transition changes the counter
+    result = await db.execute(
+        update(Notification).where(
+            Notification.id == notification_id,
+            Notification.is_read.is_(False)
+        ).values(is_read=True)
+    )
+    await db.commit()
+
+    get_notification_counter_service().decr(current_user.id, result.rowcount)
 
     return {"message": "Notification marked as read"}
 
 
 @router.patch("/read-all")
 async def mark_all_read(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Mark all notifications as read
     Requires authentication
     """
-    db.query(Notification).filter(
-        Notification.user_id == current_user.id,
-        Notification.is_read.is_(False)
-    ).update({"is_read": True})
+    await db.execute(
+        update(Notification).where(
+            Notification.user_id == current_user.id,
+            Notification.is_read.is_(False)
+        ).values(is_read=True)
+    )
+
+    await db.commit()
 
-    db.commit()
+    get_notification_counter_service().reset(current_user.id)
 
     return {"message": "All notifications marked as read"}
 
@@ -125,8 +167,8 @@ class NotificationBatchMarkReadRequest(BaseModel):
 @router.post("/batch-mark-read")
 async def mark_notifications_batch_read(
     request: NotificationBatchMarkReadRequest,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Mark multiple notifications as read at once
@@ -144,12 +186,17 @@ async def mark_notifications_batch_read(
         return {"marked_count": 0, "success": True}
 
     # Update notifications
-    marked_count = db.query(Notification).filter(
-        Notification.user_id == current_user.id,
-        Notification.id.in_(request.notification_ids),
-        Notification.is_read.is_(False)
-    ).update({"is_read": True}, synchronize_session=False)
+    result = await db.execute(
+        update(Notification).where(
+            Notification.user_id == current_user.id,
+            Notification.id.in_(request.notification_ids),
+            Notification.is_read.is_(False)
+        ).values(is_read=True)
+    )
+    marked_count = result.rowcount
+
+    await db.commit()
 
-    db.commit()
+    get_notification_counter_service().decr(current_user.id, marked_count)
 
     return {"marked_count": marked_count, "success": True}
@@ -2,127 +2,115 @@ from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
 from typing import Optional
 
-from app.core.deps import get_db, get_current_user_optional
-from app.models.user import User
+from app.core.deps import get_read_db, get_current_principal_optional, Principal
 from app.models.video import Video
-from app.models.social import VideoGlitch
-from app.schemas.search import UserSearchResult, VideoSearchResult, UnifiedSearchResult
+from app.schemas.search import UserSearchResult, VideoSearchResult, UnifiedSearchResult, SuggestResult
+from app.services.suggest_service import get_suggest_service
+from app.utils.count_utils import count_total
+from app.utils.search_utils import search_users_query, search_videos_query
 
 router = APIRouter(prefix="/search", tags=["search"])
 
 
+def _visible_videos_query(db: Session, q: str, current_user: Optional[Principal]):
+    """Ranked video search query with visibility filters (None if q has no words)"""
+    query = search_videos_query(db, q)
+    if query is None:
+        return None
+
+    # If user is not logged in, only show public videos
+    if not current_user:
+        query = query.filter(Video.is_public.is_(True))
+
+    return query
+
+
+@router.get("/suggest", response_model=SuggestResult)
+def suggest(
+    q: str = Query(..., min_length=1, description="Typed prefix (#tag or @user to narrow)"),
+    limit: int = Query(8, ge=1, le=20)
+):
+    """
+    Typeahead suggestions for usernames and hashtags
+    Public endpoint - no authentication required
+    Served from an in-memory prefix index (no database access)
+    """
+    return get_suggest_service().suggest(q, limit)
+
+
 @router.get("/users", response_model=UserSearchResult)
-async def search_users(
+def search_users(
     q: str = Query(..., min_length=1, description="Search query"),
     limit: int = Query(20, ge=1, le=100),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """
     Search users by username or display_name
     Public endpoint - no authentication required
+    Ranked by relevance; total is estimated for large result sets (total_is_estimate)
     """
-    # Search by username or display_name (case-insensitive)
-    users = db.query(User).filter(
-        (User.username.ilike(f"%{q}%")) |
-        (User.display_name.ilike(f"%{q}%"))
-    ).limit(limit).all()
+    query = search_users_query(db, q)
+    users = query.limit(limit).all()
 
-    total = db.query(User).filter(
-        (User.username.ilike(f"%{q}%")) |
-        (User.display_name.ilike(f"%{q}%"))
-    ).count()
+    total, total_is_estimate = count_total(db, query, returned=len(users), limit=limit)
 
-    return UserSearchResult(users=users, total=total)
+    return UserSearchResult(users=users, total=total, total_is_estimate=total_is_estimate)
 
 
 @router.get("/videos", response_model=VideoSearchResult)
-async def search_videos(
+def search_videos(
     q: str = Query(..., min_length=1, description="Search query"),
     limit: int = Query(20, ge=1, le=100),
-    current_user: Optional[User] = Depends(get_current_user_optional),
-    db: Session = Depends(get_db)
+    current_user: Optional[Principal] = Depends(get_current_principal_optional),
+    db: Session = Depends(get_read_db)
 ):
     """
-    Search videos by caption
+    Search videos by title and caption (full-text, prefix matching)
     Public endpoint - no authentication required
     Only returns completed and public videos
+    Ranked by relevance; total is estimated for large result sets (total_is_estimate)
     """
-    # Search by caption (case-insensitive)
-    # Only show completed videos
-    query = db.query(Video).filter(
-        Video.caption.ilike(f"%{q}%"),
-        Video.status == "completed"
-    )
-
-    # If user is not logged in, only show public videos
-    if not current_user:
-        query = query.filter(Video.is_public.is_(True))
+    query = _visible_videos_query(db, q, current_user)
+    if query is None:
+        return VideoSearchResult(videos=[], total=0)
 
     videos = query.limit(limit).all()
 
-    # Add glitch_count to each video
-    for video in videos:
-        video.glitch_count = db.query(VideoGlitch).filter(
-            VideoGlitch.original_video_id == video.id
-        ).count()
+    total, total_is_estimate = count_total(db, query, returned=len(videos), limit=limit)
 
-    total = db.query(Video).filter(
-        Video.caption.ilike(f"%{q}%"),
-        Video.status == "completed"
-    ).count()
-
-    return VideoSearchResult(videos=videos, total=total)
+    return VideoSearchResult(videos=videos, total=total, total_is_estimate=total_is_estimate)
 
 
 @router.get("/", response_model=UnifiedSearchResult)
-async def unified_search(
+def unified_search(
     q: str = Query(..., min_length=1, description="Search query"),
     user_limit: int = Query(5, ge=1, le=20),
     video_limit: int = Query(10, ge=1, le=50),
-    current_user: Optional[User] = Depends(get_current_user_optional),
-    db: Session = Depends(get_db)
+    current_user: Optional[Principal] = Depends(get_current_principal_optional),
+    db: Session = Depends(get_read_db)
 ):
     """
     Unified search across users and videos
     Public endpoint - no authentication required
     """
     # Search users
-    users = db.query(User).filter(
-        (User.username.ilike(f"%{q}%")) |
-        (User.display_name.ilike(f"%{q}%"))
-    ).limit(user_limit).all()
-
-    user_count = db.query(User).filter(
-        (User.username.ilike(f"%{q}%")) |
-        (User.display_name.ilike(f"%{q}%"))
-    ).count()
+    user_query = search_users_query(db, q)
+    users = user_query.limit(user_limit).all()
+    user_count, user_count_is_estimate = count_total(db, user_query, returned=len(users), limit=user_limit)
 
     # Search videos
-    video_query = db.query(Video).filter(
-        Video.caption.ilike(f"%{q}%"),
-        Video.status == "completed"
-    )
-
-    # If user is not logged in, only show public videos
-    if not current_user:
-        video_query = video_query.filter(Video.is_public.is_(True))
-
-    videos = video_query.limit(video_limit).all()
-
-    # Add glitch_count to each video
-    for video in videos:
-        video.glitch_count = db.query(VideoGlitch).filter(
-            VideoGlitch.original_video_id == video.id
-        ).count()
-
-    video_count = db.query(Video).filter(
-        Video.caption.ilike(f"%{q}%"),
-        Video.status == "completed"
-    ).count()
+    videos = []
+    video_count, video_count_is_estimate = 0, False
+    video_query = _visible_videos_query(db, q, current_user)
+    if video_query is not None:
+        videos = video_query.limit(video_limit).all()
+        video_count, video_count_is_estimate = count_total(db, video_query, returned=len(videos), limit=video_limit)
 
     return UnifiedSearchResult(
         users=users,
         videos=videos,
         user_count=user_count,
-        video_count=video_count
+        video_count=video_count,
+        user_count_is_estimate=user_count_is_estimate,
+        video_count_is_estimate=video_count_is_estimate
     )
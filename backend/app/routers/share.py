@@ -4,8 +4,7 @@ from uuid import UUID
 from typing import Optional
 from pydantic import BaseModel
 
-from app.core.deps import get_db, get_current_user_optional
-from app.models.user import User
+from app.core.deps import get_db, get_current_principal_optional, Principal
 from app.models.video import Video
 from app.models.social import VideoShare
 
@@ -18,10 +17,10 @@ class VideoShareRequest(BaseModel):
 
 
 @router.post("/videos/{video_id}", status_code=status.HTTP_201_CREATED)
-async def share_video(
+def share_video(
     video_id: UUID,
     request: VideoShareRequest,
-    current_user: Optional[User] = Depends(get_current_user_optional),
+    current_user: Optional[Principal] = Depends(get_current_principal_optional),
     db: Session = Depends(get_db)
 ):
     """
@@ -57,7 +56,7 @@ async def share_video(
 
 
 @router.get("/videos/{video_id}/count")
-async def get_video_share_count(
+def get_video_share_count(
     video_id: UUID,
     db: Session = Depends(get_db)
 ):
@@ -1,19 +1,22 @@
 from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from uuid import UUID
 from typing import Optional
 
-from app.core.deps import get_db, get_current_user
-from app.models.user import User
+from app.core.deps import get_db, get_async_db, get_current_principal, Principal
 from app.models.video import Video
+from app.services.frame_cache_service import DEFAULT_FRAME_RATE
+from app.utils.video_utils import sprite_tile
 
 router = APIRouter(prefix="/studio", tags=["studio"])
 
 
 @router.get("/videos/{video_id}/timeline")
-async def get_video_timeline(
+def get_video_timeline(
     video_id: UUID,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
     """
@@ -31,6 +34,18 @@ async def get_video_timeline(
     if video.status == "private" and video.user_id != current_user.id:
         raise HTTPException(status_code=403, detail="Access denied to private video")
 
+    # Probed values once the sprite pipeline has run
+    frame_rate = video.frame_rate or DEFAULT_FRAME_RATE
+    total_duration = video.probed_duration or video.duration_seconds
+
+    sprite = None
+    if video.sprite_sheet_url:
+        sprite = {
+            "url": video.sprite_sheet_url,
+            "vtt_url": video.sprite_vtt_url,
+            **(video.sprite_index or {})
+        }
+
     return {
         "video_id": str(video.id),
         "title": video.title,
@@ -39,9 +54,10 @@ async def get_video_timeline(
         "status": video.status,
         "created_at": video.created_at.isoformat(),
         "timeline": {
-            "total_duration": video.duration_seconds,
-            "frame_rate": 30,
-            "total_frames": int(video.duration_seconds * 30) if video.duration_seconds else 0
+            "total_duration": total_duration,
+            "frame_rate": frame_rate,
+            "total_frames": int(total_duration * frame_rate) if total_duration else 0,
+            "sprite": sprite
         }
     }
 
@@ -50,16 +66,19 @@ async def get_video_timeline(
 async def get_video_preview(
     video_id: UUID,
     timestamp: Optional[float] = 0.0,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get video preview at specific timestamp
     Used for timeline scrubbing and frame selection
     Public videos can be previewed by anyone (for glitch workflow)
+
+    The still comes from the timeline sprite sheet (no per-request frame
+    extraction); full-quality frames are captured with /ai/capture-frame
     """
     # Get video
-    video = db.query(Video).filter(Video.id == video_id).first()
+    video = await db.scalar(select(Video).where(Video.id == video_id))
 
     if not video:
         raise HTTPException(status_code=404, detail="Video not found")
@@ -75,21 +94,30 @@ async def get_video_preview(
             detail=f"Timestamp {timestamp}s exceeds video duration {video.duration_seconds}s"
         )
 
+    # Sprite sheet tile for the timestamp (None until sprites are generated)
+    sprite = None
+    if video.sprite_sheet_url and video.sprite_index:
+        sprite = {
+            "url": video.sprite_sheet_url,
+            **sprite_tile(video.sprite_index, timestamp)
+        }
+
     return {
         "video_id": str(video.id),
         "url": video.video_url,
         "timestamp": timestamp,
         "duration": video.duration_seconds,
-        "preview_url": f"{video.video_url}#t={timestamp}"
+        "preview_url": f"{video.video_url}#t={timestamp}",
+        "sprite": sprite
     }
 
 
 @router.post("/videos/{video_id}/select-range")
-async def select_video_range(
+def select_video_range(
     video_id: UUID,
     start_time: float,
     end_time: float,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
     """
@@ -3,22 +3,26 @@ from sqlalchemy.orm import Session
 from sqlalchemy import func
 from uuid import UUID
 from typing import Optional, List
+from datetime import datetime
 from pydantic import BaseModel
 
-from app.core.deps import get_db, get_current_user_optional
+from app.core.deps import get_db, get_read_db, get_current_principal_optional, Principal
 from app.models.user import User
 from app.models.video import Video
-from app.models.social import Follow, Like, VideoGlitch
+from app.models.social import Follow, Like
 from app.schemas.user import UserProfileResponse
 from app.schemas.video import VideoListResponse
+from app.services.response_cache_service import cache_response
+from app.utils.pagination import encode_cursor, decode_cursor, keyset_before
 
 router = APIRouter(prefix="/users", tags=["users"])
 
 
 @router.get("/{user_id}", response_model=UserProfileResponse)
-async def get_user_profile(
+@cache_response(tags=lambda profile: [f"user:{profile['id']}"])
+def get_user_profile(
     user_id: UUID,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """
     Get user profile by ID
@@ -63,12 +67,12 @@ async def get_user_profile(
 
 
 @router.get("/{user_id}/videos", response_model=VideoListResponse)
-async def get_user_videos(
+def get_user_videos(
     user_id: UUID,
     page_size: int = Query(20, ge=1, le=100, description="Items per page"),
     cursor: Optional[str] = Query(None, description="Cursor for pagination"),
-    current_user: Optional[User] = Depends(get_current_user_optional),
-    db: Session = Depends(get_db)
+    current_user: Optional[Principal] = Depends(get_current_principal_optional),
+    db: Session = Depends(get_read_db)
 ):
     """
     Get user's videos (infinite scroll)
@@ -95,26 +99,22 @@ async def get_user_videos(
             Video.deleted_at.is_(None)
         )
 
-    # Apply cursor pagination
+    # Apply cursor pagination (keyset on created_at, id)
     if cursor:
-        query = query.filter(Video.id < cursor)
+        query = query.filter(
+            keyset_before([Video.created_at, Video.id], decode_cursor(cursor, datetime, UUID))
+        )
 
     # Get videos
-    videos = query.order_by(Video.created_at.desc()).limit(page_size + 1).all()
+    videos = query.order_by(Video.created_at.desc(), Video.id.desc()).limit(page_size + 1).all()
 
     # Check if there are more videos
     has_more = len(videos) > page_size
     if has_more:
         videos = videos[:page_size]
 
-    # Add glitch_count to each video
-    for video in videos:
-        video.glitch_count = db.query(VideoGlitch).filter(
-            VideoGlitch.original_video_id == video.id
-        ).count()
-
     # Get next cursor
-    next_cursor = str(videos[-1].id) if has_more and videos else None
+    next_cursor = encode_cursor(videos[-1].created_at, videos[-1].id) if has_more and videos else None
 
     return VideoListResponse(
         videos=videos,
@@ -127,12 +127,12 @@ async def get_user_videos(
 
 
 @router.get("/{user_id}/liked-videos", response_model=VideoListResponse)
-async def get_user_liked_videos(
+def get_user_liked_videos(
     user_id: UUID,
     page_size: int = Query(20, ge=1, le=100, description="Items per page"),
     cursor: Optional[str] = Query(None, description="Cursor for pagination"),
-    current_user: Optional[User] = Depends(get_current_user_optional),
-    db: Session = Depends(get_db)
+    current_user: Optional[Principal] = Depends(get_current_principal_optional),
+    db: Session = Depends(get_read_db)
 ):
     """
     Get videos liked by user (infinite scroll)
@@ -146,8 +146,8 @@ async def get_user_liked_videos(
             detail="User not found"
         )
 
-    # Build query - join Like and Video
-    query = db.query(Video).join(
+    # Build query - join Like and Video (Like columns are the sort key)
+    query = db.query(Video, Like.created_at, Like.id).join(
         Like,
         Like.video_id == Video.id
     ).filter(
@@ -157,37 +157,26 @@ async def get_user_liked_videos(
         Video.deleted_at.is_(None)
     )
 
-    # Apply cursor pagination (use Like.created_at for ordering)
+    # Apply cursor pagination (keyset on Like.created_at, Like.id)
     if cursor:
-        # Cursor is Like.id in this case
-        query = query.filter(Like.id < cursor)
+        query = query.filter(
+            keyset_before([Like.created_at, Like.id], decode_cursor(cursor, datetime, UUID))
+        )
 
     # Order by when the user liked it (most recent first)
-    query = query.order_by(Like.created_at.desc())
+    query = query.order_by(Like.created_at.desc(), Like.id.desc())
 
     # Get videos
-    videos = query.limit(page_size + 1).all()
+    rows = query.limit(page_size + 1).all()
 
     # Check if there are more videos
-    has_more = len(videos) > page_size
+    has_more = len(rows) > page_size
     if has_more:
-        videos = videos[:page_size]
-
-    # Add glitch_count to each video
-    for video in videos:
-        video.glitch_count = db.query(VideoGlitch).filter(
-            VideoGlitch.original_video_id == video.id
-        ).count()
+        rows = rows[:page_size]
+    videos = [row[0] for row in rows]
 
-    # Get next cursor (use last video's Like.id)
-    next_cursor = None
-    if has_more and videos:
-        last_like = db.query(Like).filter(
-            Like.user_id == user_id,
-            Like.video_id == videos[-1].id
-        ).first()
-        if last_like:
-            next_cursor = str(last_like.id)
+    # Get next cursor (last like's created_at, id)
+    next_cursor = encode_cursor(rows[-1][1], rows[-1][2]) if has_more and rows else None
 
     return VideoListResponse(
         videos=videos,
@@ -205,9 +194,9 @@ class UserBatchInfoRequest(BaseModel):
 
 
 @router.post("/batch-info")
-async def get_users_batch_info(
+def get_users_batch_info(
     request: UserBatchInfoRequest,
-    current_user: Optional[User] = Depends(get_current_user_optional),
+    current_user: Optional[Principal] = Depends(get_current_principal_optional),
     db: Session = Depends(get_db)
 ):
     """
@@ -2,12 +2,11 @@ from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
 from uuid import UUID
 from typing import Optional, List
+from datetime import datetime
 from pydantic import BaseModel
 
-from app.core.deps import get_db, get_current_user, get_current_user_optional
-from app.models.user import User
+from app.core.deps import get_db, get_read_db, get_current_principal, get_current_principal_optional, Principal
 from app.models.video import Video
-from app.models.social import VideoGlitch
 from app.schemas.video import (
     VideoUploadURLRequest,
     VideoUploadURLResponse,
@@ -17,15 +16,19 @@ from app.schemas.video import (
     VideoListResponse
 )
 from app.services.mock_s3_service import get_mock_s3_service
-from app.utils.hashtag_utils import update_video_hashtags
+from app.services.response_cache_service import cache_response, get_response_cache_service
+from app.services.view_counter_service import get_view_counter_service
+from app.tasks.media_tasks import generate_timeline_sprites
+from app.utils.hashtag_utils import update_video_hashtags, sync_video_hashtag_index
+from app.utils.pagination import encode_cursor, decode_cursor, keyset_before
 
 router = APIRouter(prefix="/videos", tags=["videos"])
 
 
 @router.post("/upload-url", response_model=VideoUploadURLResponse)
-async def get_upload_url(
+def get_upload_url(
     request: VideoUploadURLRequest,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
     """
@@ -48,6 +51,7 @@ async def get_upload_url(
         video_url=f"https://mock-s3.lokiz.com/{video_key}",
         thumbnail_url=f"https://mock-s3.lokiz.com/{thumbnail_key}",
         duration_seconds=request.duration_seconds,
+        s3_key=video_key,
         status="processing"
     )
     db.add(video)
@@ -66,10 +70,10 @@ async def get_upload_url(
 
 
 @router.patch("/{video_id}", response_model=VideoResponse)
-async def update_video(
+def update_video(
     video_id: UUID,
     request: VideoUpdateRequest,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
     """
@@ -98,18 +102,16 @@ async def update_video(
     db.commit()
     db.refresh(video)
 
-    # Add glitch_count
-    video.glitch_count = db.query(VideoGlitch).filter(
-        VideoGlitch.original_video_id == video.id
-    ).count()
+    get_response_cache_service().invalidate(f"video:{video.id}")
 
     return video
 
 
 @router.get("/{video_id}", response_model=VideoResponse)
-async def get_video(
+@cache_response(tags=lambda video: [f"video:{video['id']}", f"user:{video['user']['id']}"])
+def get_video(
     video_id: UUID,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """
     Get video by ID
@@ -122,19 +124,18 @@ async def get_video(
             detail="Video not found"
         )
 
-    # Add glitch_count
-    video.glitch_count = db.query(VideoGlitch).filter(
-        VideoGlitch.original_video_id == video.id
-    ).count()
+    # Merge views still buffered in Redis
+    response = VideoResponse.model_validate(video)
+    response.view_count += get_view_counter_service().get_pending([video.id]).get(video.id, 0)
 
-    return video
+    return response
 
 
 @router.post("/{video_id}/complete", response_model=VideoResponse)
-async def complete_video_upload(
+def complete_video_upload(
     video_id: UUID,
     request: VideoCompleteRequest,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
     """
@@ -163,29 +164,36 @@ async def complete_video_upload(
     if request.actual_duration:
         video.duration_seconds = request.actual_duration
 
+    # List the video on its hashtag pages
+    sync_video_hashtag_index(db, video)
+
     db.commit()
     db.refresh(video)
 
-    # Add glitch_count
-    video.glitch_count = db.query(VideoGlitch).filter(
-        VideoGlitch.original_video_id == video.id
-    ).count()
+    get_response_cache_service().invalidate(f"video:{video.id}", f"user:{video.user_id}")
+
+    # Probe fps/duration and render timeline sprites in the background
+    try:
+        generate_timeline_sprites.delay(str(video.id))
+    except Exception as e:
+        print(f"Failed to enqueue sprite generation for {video.id}: {e}")
 
     return video
 
 
 @router.post("/{video_id}/view")
-async def increment_view_count(
+def increment_view_count(
     video_id: UUID,
-    current_user: Optional[User] = Depends(get_current_user_optional),
+    current_user: Optional[Principal] = Depends(get_current_principal_optional),
     db: Session = Depends(get_db)
 ):
     """
     Increment view count for a video
     Public endpoint - no authentication required
     Does not increment if viewing own video
+    Views are buffered in Redis and flushed to the DB in batches
     """
-    video = db.query(Video).filter(Video.id == video_id).first()
+    video = db.query(Video.user_id, Video.view_count).filter(Video.id == video_id).first()
 
     if not video:
         raise HTTPException(
@@ -197,11 +205,10 @@ async def increment_view_count(
     if current_user and current_user.id == video.user_id:
         return {"success": True, "message": "Own video - view not counted"}
 
-    # Increment view count
-    video.view_count += 1
-    db.commit()
+    # Buffer the view (write-behind, no row lock)
+    pending_views = get_view_counter_service().record_view(video_id)
 
-    return {"success": True, "view_count": video.view_count}
+    return {"success": True, "view_count": video.view_count + pending_views}
 
 
 class VideoBatchMetadataRequest(BaseModel):
@@ -210,7 +217,7 @@ class VideoBatchMetadataRequest(BaseModel):
 
 
 @router.post("/batch-metadata")
-async def get_videos_batch_metadata(
+def get_videos_batch_metadata(
     request: VideoBatchMetadataRequest,
     db: Session = Depends(get_db)
 ):
@@ -236,15 +243,16 @@ async def get_videos_batch_metadata(
         Video.deleted_at.is_(None)
     ).all()
 
+    # Views still buffered in Redis
+    pending_views = get_view_counter_service().get_pending(video.id for video in videos)
+
     # Build result dictionary
     result = {
         str(video.id): {
-            "view_count": video.view_count,
+            "view_count": video.view_count + pending_views.get(video.id, 0),
             "like_count": video.like_count,
             "comment_count": video.comment_count,
-            "glitch_count": db.query(VideoGlitch).filter(
-                VideoGlitch.original_video_id == video.id
-            ).count()
+            "glitch_count": video.glitch_count
         }
         for video in videos
     }
@@ -264,12 +272,12 @@ async def get_videos_batch_metadata(
 
 
 @router.get("/me", response_model=VideoListResponse)
-async def get_my_videos(
+def get_my_videos(
     status: Optional[str] = Query(None, regex="^(processing|completed|failed)$"),
     page_size: int = Query(50, ge=1, le=100, description="Items per page"),
     cursor: Optional[str] = Query(None, description="Cursor for pagination"),
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_principal),
+    db: Session = Depends(get_read_db)
 ):
     """
     Get current user's videos
@@ -280,26 +288,22 @@ async def get_my_videos(
     if status:
         query = query.filter(Video.status == status)
 
-    # Apply cursor pagination
+    # Apply cursor pagination (keyset on created_at, id)
     if cursor:
-        query = query.filter(Video.id < cursor)
+        query = query.filter(
+            keyset_before([Video.created_at, Video.id], decode_cursor(cursor, datetime, UUID))
+        )
 
     # Get videos
-    videos = query.order_by(Video.created_at.desc()).limit(page_size + 1).all()
+    videos = query.order_by(Video.created_at.desc(), Video.id.desc()).limit(page_size + 1).all()
 
     # Check if there are more videos
     has_more = len(videos) > page_size
     if has_more:
         videos = videos[:page_size]
 
-    # Add glitch_count to each video
-    for video in videos:
-        video.glitch_count = db.query(VideoGlitch).filter(
-            VideoGlitch.original_video_id == video.id
-        ).count()
-
     # Get next cursor
-    next_cursor = str(videos[-1].id) if has_more and videos else None
+    next_cursor = encode_cursor(videos[-1].created_at, videos[-1].id) if has_more and videos else None
 
     return VideoListResponse(
         videos=videos,
@@ -312,11 +316,11 @@ async def get_my_videos(
 
 
 @router.get("/", response_model=VideoListResponse)
-async def get_videos(
+def get_videos(
     status: Optional[str] = Query(None, regex="^(processing|completed|failed)$"),
     page_size: int = Query(20, ge=1, le=100, description="Items per page"),
     cursor: Optional[str] = Query(None, description="Cursor for pagination"),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """
     Get public videos (feed)
@@ -324,26 +328,22 @@ async def get_videos(
     # Only show completed videos in feed
     query = db.query(Video).filter(Video.status == "completed")
 
-    # Apply cursor pagination
+    # Apply cursor pagination (keyset on created_at, id)
     if cursor:
-        query = query.filter(Video.id < cursor)
+        query = query.filter(
+            keyset_before([Video.created_at, Video.id], decode_cursor(cursor, datetime, UUID))
+        )
 
     # Get videos
-    videos = query.order_by(Video.created_at.desc()).limit(page_size + 1).all()
+    videos = query.order_by(Video.created_at.desc(), Video.id.desc()).limit(page_size + 1).all()
 
     # Check if there are more videos
     has_more = len(videos) > page_size
     if has_more:
         videos = videos[:page_size]
 
-    # Add glitch_count to each video
-    for video in videos:
-        video.glitch_count = db.query(VideoGlitch).filter(
-            VideoGlitch.original_video_id == video.id
-        ).count()
-
     # Get next cursor
-    next_cursor = str(videos[-1].id) if has_more and videos else None
+    next_cursor = encode_cursor(videos[-1].created_at, videos[-1].id) if has_more and videos else None
 
     return VideoListResponse(
         videos=videos,
@@ -356,9 +356,9 @@ async def get_videos(
 
 
 @router.delete("/{video_id}")
-async def delete_video(
+def delete_video(
     video_id: UUID,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
     """
@@ -375,20 +375,20 @@ async def delete_video(
             detail="Video not found or you don't have permission"
         )
 
-    # Check glitch count
-    glitch_count = db.query(VideoGlitch).filter(
-        VideoGlitch.original_video_id == video_id
-    ).count()
-
     # Soft delete (mark as private and set deleted_at)
-    from datetime import datetime, timezone
+    from datetime import timezone
     video.is_public = False
     video.deleted_at = datetime.now(timezone.utc)
 
+    # Remove the video from its hashtag pages
+    sync_video_hashtag_index(db, video)
+
     db.commit()
 
+    get_response_cache_service().invalidate(f"video:{video.id}", f"user:{video.user_id}")
+
     return {
         "message": "Video marked as deleted",
-        "glitch_count": glitch_count,
+        "glitch_count": video.glitch_count,
         "deleted_at": video.deleted_at.isoformat()
     }
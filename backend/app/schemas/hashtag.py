@@ -1,7 +1,7 @@
 from pydantic import BaseModel
 from uuid import UUID
 from datetime import datetime
-from typing import List
+from typing import List, Optional
 from app.schemas.video import VideoResponse
 
 
@@ -21,9 +21,13 @@ class HashtagVideoListResponse(BaseModel):
     hashtag: HashtagResponse
     videos: List[VideoResponse]
     total: int
+    total_is_estimate: bool = False
+    has_more: bool = False
+    next_cursor: Optional[str] = None
 
 
 class TrendingHashtagsResponse(BaseModel):
     """Trending hashtags response"""
     hashtags: List[HashtagResponse]
     total: int
+    total_is_estimate: bool = False
@@ -1,7 +1,7 @@
 from pydantic import BaseModel
 from uuid import UUID
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 from app.schemas.user import UserBasicInfo
 
 
@@ -11,6 +11,8 @@ class NotificationResponse(BaseModel):
     type: str  # like, comment, follow, glitch
     actor: UserBasicInfo  # Who triggered the notification
     target_id: Optional[UUID]  # video_id, comment_id, etc.
+    actor_count: int = 1  # Actors coalesced into this notification
+    sample_actor_ids: Optional[List[UUID]] = None  # Most recent actors first
     is_read: bool
     created_at: datetime
 
@@ -22,9 +24,12 @@ class NotificationListResponse(BaseModel):
     """Notification list response"""
     notifications: list[NotificationResponse]
     total: int
+    total_is_estimate: bool = False
     unread_count: int
     page: int
     page_size: int
+    has_more: bool = False
+    next_cursor: Optional[str] = None
 
 
 class UnreadCountResponse(BaseModel):
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import List
+from typing import List, Optional
 from app.schemas.user import UserBasicInfo
 from app.schemas.video import VideoResponse
 
@@ -8,12 +8,35 @@ class UserSearchResult(BaseModel):
     """User search result"""
     users: List[UserBasicInfo]
     total: int
+    total_is_estimate: bool = False
 
 
 class VideoSearchResult(BaseModel):
     """Video search result"""
     videos: List[VideoResponse]
     total: int
+    total_is_estimate: bool = False
+
+
+class UserSuggestion(BaseModel):
+    """Typeahead user suggestion"""
+    id: str
+    username: str
+    display_name: Optional[str]
+    profile_image_url: Optional[str]
+    follower_count: int
+
+
+class HashtagSuggestion(BaseModel):
+    """Typeahead hashtag suggestion"""
+    name: str
+    use_count: int
+
+
+class SuggestResult(BaseModel):
+    """Typeahead suggestions"""
+    users: List[UserSuggestion]
+    hashtags: List[HashtagSuggestion]
 
 
 class UnifiedSearchResult(BaseModel):
@@ -22,3 +45,5 @@ class UnifiedSearchResult(BaseModel):
     videos: List[VideoResponse]
     user_count: int
     video_count: int
+    user_count_is_estimate: bool = False
+    video_count_is_estimate: bool = False
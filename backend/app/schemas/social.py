@@ -44,6 +44,7 @@ class CommentListResponse(BaseModel):
     """Comment list response"""
     comments: list[CommentResponse]
     total: int
+    total_is_estimate: bool = False
     page: int
     page_size: int
 
@@ -0,0 +1,89 @@
+import hashlib
+import json
+import re
+from typing import Any, Dict, Optional
+
+from app.core.config import settings
+from app.core.redis import get_redis
+from app.services.replicate_service import get_replicate_service
+
+INFLIGHT_SUBMITTING = "submitting"  # In-flight marker before the prediction ID is known
+SUBMIT_CLAIM_TTL_SECONDS = 60  # Frees the key if the submitter dies before creating the prediction
+
+
+def _normalize(value: Any) -> Any:
+    """Normalize model input so trivially different retries share a key"""
+    if isinstance(value, str):
+        return re.sub(r"\s+", " ", value).strip()
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, dict):
+        return {k: _normalize(v) for k, v in value.items() if v is not None}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    return value
+
+
+class AIResultCache:
+    """
+    Content-addressed cache of AI generation results
+
+    Keyed on sha256(model, cache version, normalized model input).
+    Finished results are kept for AI_RESULT_CACHE_TTL_SECONDS (Redis evicts
+    them LRU-first under memory pressure - volatile-lru). Results are
+    Replicate output URLs, which expire an hour after the prediction, so the
+    TTL must stay well below that. Identical requests
+    that arrive while a prediction is running attach to that prediction.
+    """
+
+    def key(self, job_type: str, input_data: Dict[str, Any]) -> Optional[str]:
+        """Cache key for an AI job, or None if the job type is not cached"""
+        if job_type not in settings.AI_RESULT_CACHE_JOB_TYPES:
+            return None
+
+        model, model_input = get_replicate_service().build_prediction(job_type, input_data)
+        payload = json.dumps(
+            [model, settings.AI_RESULT_CACHE_VERSION, _normalize(model_input)],
+            sort_keys=True,
+            separators=(",", ":")
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def get_result(self, key: str) -> Optional[str]:
+        """Cached output URL"""
+        return get_redis().get(f"ai:result:{key}")
+
+    def store_result(self, key: str, output_url: str) -> None:
+        get_redis().set(f"ai:result:{key}", output_url, ex=settings.AI_RESULT_CACHE_TTL_SECONDS)
+
+    def claim_inflight(self, key: str) -> bool:
+        """
+        Become the submitter for this key
+
+        Returns:
+            False if an identical request is already in flight
+        """
+        return bool(get_redis().set(
+            f"ai:inflight:{key}",
+            INFLIGHT_SUBMITTING,
+            nx=True,
+            ex=SUBMIT_CLAIM_TTL_SECONDS
+        ))
+
+    def get_inflight(self, key: str) -> Optional[str]:
+        """Prediction ID of the in-flight request (or INFLIGHT_SUBMITTING)"""
+        return get_redis().get(f"ai:inflight:{key}")
+
+    def set_inflight(self, key: str, replicate_id: str) -> None:
+        get_redis().set(f"ai:inflight:{key}", replicate_id, ex=settings.AI_INFLIGHT_TTL_SECONDS)
+
+    def clear_inflight(self, key: str) -> None:
+        get_redis().delete(f"ai:inflight:{key}")
+
+
+# Global instance
+_ai_result_cache = AIResultCache()
+
+
+def get_ai_result_cache() -> AIResultCache:
+    return _ai_result_cache
@@ -0,0 +1,112 @@
+import asyncio
+import json
+from typing import Any, Dict, Optional, Set
+from uuid import UUID
+
+import redis.asyncio as aioredis
+from redis.exceptions import RedisError
+
+from app.core.config import settings
+from app.core.redis import get_redis
+
+
+class EventStreamService:
+    """
+    Per-user server-push events over Redis pub/sub
+
+    Publishers (API workers, Celery workers) send JSON events to
+    events:user:{user_id}. Each API worker holds ONE pub/sub connection,
+    subscribed to the channels of users with an open stream on that worker,
+    and fans messages out to per-connection asyncio queues - an idle stream
+    costs a coroutine and a queue, not a Redis connection or DB session.
+    """
+
+    def __init__(self):
+        self._redis: Optional[aioredis.Redis] = None
+        self._pubsub: Optional[aioredis.client.PubSub] = None
+        self._reader_task: Optional[asyncio.Task] = None
+        self._listeners: Dict[str, Set[asyncio.Queue]] = {}
+        self._lock = asyncio.Lock()
+
+    @staticmethod
+    def _channel(user_id: UUID) -> str:
+        return f"events:user:{user_id}"
+
+    def publish(self, user_id: UUID, event: str, data: Dict[str, Any]) -> None:
+        """Send an event to the user's open streams (best effort, never raises)"""
+        try:
+            get_redis().publish(self._channel(user_id), json.dumps({"event": event, "data": data}, default=str))
+        except RedisError as e:
+            print(f"Failed to publish {event} event for {user_id}: {e}")
+
+    async def subscribe(self, user_id: UUID) -> asyncio.Queue:
+        """Open a stream for the user; returns the queue its events arrive on"""
+        channel = self._channel(user_id)
+        queue = asyncio.Queue(maxsize=settings.EVENT_STREAM_QUEUE_SIZE)
+
+        async with self._lock:
+            if self._pubsub is None:
+                self._redis = aioredis.from_url(settings.REDIS_URL, decode_responses=True)
+                self._pubsub = self._redis.pubsub()
+
+            listeners = self._listeners.setdefault(channel, set())
+            if not listeners:
+                await self._pubsub.subscribe(channel)
+            listeners.add(queue)
+
+            # Reader starts after the first subscribe (the connection exists from then on)
+            if self._reader_task is None:
+                self._reader_task = asyncio.create_task(self._read_loop())
+
+        return queue
+
+    async def unsubscribe(self, user_id: UUID, queue: asyncio.Queue) -> None:
+        channel = self._channel(user_id)
+
+        async with self._lock:
+            listeners = self._listeners.get(channel)
+            if listeners is None:
+                return
+            listeners.discard(queue)
+            if not listeners:
+                del self._listeners[channel]
+                await self._pubsub.unsubscribe(channel)
+
+    async def _read_loop(self) -> None:
+        """Dispatch pub/sub messages to the queues of the user's streams"""
+        while self._pubsub is not None:
+            try:
+                message = await self._pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+            except RedisError as e:
+                # The client reconnects and resubscribes on the next read
+                print(f"Event stream connection error: {e}")
+                await asyncio.sleep(1)
+                continue
+
+            if not message or message["type"] != "message":
+                continue
+
+            for queue in list(self._listeners.get(message["channel"], ())):
+                try:
+                    queue.put_nowait(message["data"])
+                except asyncio.QueueFull:
+                    pass  # Slow client: drop the event rather than buffer without bound
+
+    async def close(self) -> None:
+        if self._reader_task:
+            self._reader_task.cancel()
+            await asyncio.wait([self._reader_task], timeout=1)
+            self._reader_task = None
+        if self._pubsub:
+            await self._pubsub.aclose()
+            await self._redis.aclose()
+            self._pubsub = self._redis = None
+        self._listeners.clear()
+
+
+# Global instance
+_event_stream_service = EventStreamService()
+
+
+def get_event_stream_service() -> EventStreamService:
+    return _event_stream_service
@@ -0,0 +1,134 @@
+import hashlib
+import json
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional, Tuple
+
+from replicate.pagination import Page
+from replicate.prediction import Prediction
+
+PAGE_SIZE = 100  # Predictions per list page (same as Replicate)
+
+
+def fake_output_url(model: str, input: Dict[str, Any], base_url: str) -> str:
+    """Deterministic output URL derived from model and input"""
+    digest = hashlib.sha256(
+        json.dumps([model, input], sort_keys=True, default=str).encode()
+    ).hexdigest()[:16]
+    extension = ".mp3" if model == "suno-ai/bark" else ".mp4"
+
+    return f"{base_url}/outputs/{digest}{extension}"
+
+
+class FakePredictionStore:
+    """
+    In-memory prediction store shared by the fake client and fake server
+    Predictions stay "processing" for latency_seconds, then succeed
+    """
+
+    def __init__(self, base_url: str = "https://fake-replicate.lokiz.dev", latency_seconds: float = 0.0):
+        self.base_url = base_url
+        self.latency_seconds = latency_seconds
+        self._predictions: Dict[str, Dict[str, Any]] = {}
+        self._order: List[str] = []  # Creation order (oldest first)
+        self._lock = threading.Lock()
+
+    def create(self, model: str, input: Dict[str, Any], webhook: Optional[str] = None) -> Dict[str, Any]:
+        prediction_id = uuid.uuid4().hex[:20]
+        prediction = {
+            "id": prediction_id,
+            "model": model,
+            "version": "fake",
+            "status": "processing",
+            "input": input,
+            "output": None,
+            "logs": "",
+            "error": None,
+            "metrics": {},
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "started_at": datetime.now(timezone.utc).isoformat(),
+            "completed_at": None,
+            "urls": {
+                "get": f"{self.base_url}/v1/predictions/{prediction_id}",
+                "cancel": f"{self.base_url}/v1/predictions/{prediction_id}/cancel",
+            },
+            "webhook": webhook,
+            "_ready_at": time.monotonic() + self.latency_seconds,
+        }
+        with self._lock:
+            self._predictions[prediction_id] = prediction
+            self._order.append(prediction_id)
+        return self._settle(prediction)
+
+    def get(self, prediction_id: str) -> Optional[Dict[str, Any]]:
+        prediction = self._predictions.get(prediction_id)
+        return self._settle(prediction) if prediction else None
+
+    def cancel(self, prediction_id: str) -> Optional[Dict[str, Any]]:
+        prediction = self._predictions.get(prediction_id)
+        if prediction and prediction["status"] in ("starting", "processing"):
+            prediction["status"] = "canceled"
+            prediction["completed_at"] = datetime.now(timezone.utc).isoformat()
+        return self.public(prediction) if prediction else None
+
+    def list(self, offset: int = 0) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+        """Newest first, PAGE_SIZE per page. Returns (results, next offset)"""
+        with self._lock:
+            newest_first = list(reversed(self._order))
+        page_ids = newest_first[offset:offset + PAGE_SIZE]
+        next_offset = offset + PAGE_SIZE if offset + PAGE_SIZE < len(newest_first) else None
+        return [self._settle(self._predictions[i]) for i in page_ids], next_offset
+
+    def _settle(self, prediction: Dict[str, Any]) -> Dict[str, Any]:
+        """Complete the prediction once its simulated latency has passed"""
+        if prediction["status"] == "processing" and time.monotonic() >= prediction["_ready_at"]:
+            prediction["output"] = fake_output_url(prediction["model"], prediction["input"], self.base_url)
+            prediction["status"] = "succeeded"
+            prediction["completed_at"] = datetime.now(timezone.utc).isoformat()
+        return self.public(prediction)
+
+    @staticmethod
+    def public(prediction: Dict[str, Any]) -> Dict[str, Any]:
+        """Prediction as returned by the API (without internal fields)"""
+        return {k: v for k, v in prediction.items() if not k.startswith("_") and k != "webhook"}
+
+
+class FakeReplicateClient:
+    """
+    Local fake of replicate.Client for tests and offline development
+    Enabled with REPLICATE_BACKEND=fake - returns instantly, costs nothing
+
+    Implements the prediction API used by the AI workers. Webhooks are not
+    delivered; completed predictions are picked up by the poller. Use
+    app.services.fake_replicate_server for an HTTP stand-in with webhooks.
+    """
+
+    def __init__(self, base_url: str = "https://fake-replicate.lokiz.dev", latency_seconds: float = 0.0):
+        self.store = FakePredictionStore(base_url=base_url, latency_seconds=latency_seconds)
+        self.calls = []  # (model, input) of every prediction, for test assertions
+        self.models = SimpleNamespace(predictions=SimpleNamespace(create=self._create))
+        self.predictions = SimpleNamespace(get=self._get, list=self._list, cancel=self._cancel)
+
+    def _create(self, model: str, input: Dict[str, Any], **params) -> Prediction:
+        self.calls.append((model, input))
+        return Prediction(**self.store.create(model, input, params.get("webhook")))
+
+    def _get(self, id: str) -> Prediction:
+        prediction = self.store.get(id)
+        if prediction is None:
+            raise KeyError(id)
+        return Prediction(**prediction)
+
+    def _cancel(self, id: str) -> Prediction:
+        return Prediction(**self.store.cancel(id))
+
+    def _list(self, cursor: Any = ...) -> Page:
+        offset = 0 if cursor is ... else int(cursor)
+        results, next_offset = self.store.list(offset)
+        return Page[Prediction](
+            results=[Prediction(**p) for p in results],
+            next=str(next_offset) if next_offset is not None else None
+        )
@@ -0,0 +1,148 @@
+"""
+Local HTTP stand-in for the Replicate API
+
+Serves the prediction endpoints used by ReplicateService and delivers
+signed "completed" webhooks, so the whole submit -> webhook/poll ->
+finalize flow can run without a Replicate account.
+
+    python -m app.services.fake_replicate_server --port 5055 --latency 3
+
+Then point the backend at it:
+
+    REPLICATE_BASE_URL=http://localhost:5055
+    REPLICATE_WEBHOOK_URL=http://localhost:8000/v1/ai/webhooks/replicate
+"""
+import argparse
+import base64
+import hashlib
+import hmac
+import json
+import re
+import threading
+import time
+import urllib.request
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from app.services.fake_replicate_client import FakePredictionStore
+
+CREATE_PATH = re.compile(r"^/v1/models/([^/]+)/([^/]+)/predictions$")
+GET_PATH = re.compile(r"^/v1/predictions/([^/]+)$")
+CANCEL_PATH = re.compile(r"^/v1/predictions/([^/]+)/cancel$")
+
+
+def sign_webhook(secret: str, webhook_id: str, timestamp: str, body: bytes) -> str:
+    """Replicate webhook signature (v1, HMAC-SHA256 of id.timestamp.body)"""
+    key = base64.b64decode(secret.split("_", 1)[1] if secret.startswith("whsec_") else secret)
+    signed = f"{webhook_id}.{timestamp}.".encode() + body
+    return "v1," + base64.b64encode(hmac.new(key, signed, hashlib.sha256).digest()).decode()
+
+
+class FakeReplicateServer:
+    """Fake Replicate API server with webhook delivery"""
+
+    def __init__(self, host: str, port: int, latency_seconds: float, webhook_secret: str = None):
+        self.store = FakePredictionStore(base_url=f"http://{host}:{port}", latency_seconds=latency_seconds)
+        self.webhook_secret = webhook_secret
+        self.httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self._pending_webhooks = {}  # prediction_id -> webhook URL
+        self._lock = threading.Lock()
+
+    def serve_forever(self) -> None:
+        threading.Thread(target=self._deliver_webhooks, daemon=True).start()
+        self.httpd.serve_forever()
+
+    def _deliver_webhooks(self) -> None:
+        """Send the completed prediction to its webhook once it settles"""
+        while True:
+            time.sleep(0.2)
+            with self._lock:
+                pending = list(self._pending_webhooks.items())
+
+            for prediction_id, url in pending:
+                prediction = self.store.get(prediction_id)
+                if prediction["status"] not in ("succeeded", "failed", "canceled"):
+                    continue
+
+                with self._lock:
+                    self._pending_webhooks.pop(prediction_id, None)
+
+                body = json.dumps(prediction).encode()
+                headers = {"Content-Type": "application/json"}
+                if self.webhook_secret:
+                    webhook_id = f"msg_{uuid.uuid4().hex}"
+                    timestamp = str(int(time.time()))
+                    headers.update({
+                        "webhook-id": webhook_id,
+                        "webhook-timestamp": timestamp,
+                        "webhook-signature": sign_webhook(self.webhook_secret, webhook_id, timestamp, body),
+                    })
+                try:
+                    urllib.request.urlopen(urllib.request.Request(url, data=body, headers=headers), timeout=5)
+                except Exception as e:
+                    print(f"Webhook delivery failed for {prediction_id}: {e}")
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                body = json.loads(self.rfile.read(length) or b"{}")
+
+                match = CREATE_PATH.match(self.path)
+                if match:
+                    model = f"{match.group(1)}/{match.group(2)}"
+                    prediction = server.store.create(model, body.get("input") or {})
+                    if body.get("webhook"):
+                        with server._lock:
+                            server._pending_webhooks[prediction["id"]] = body["webhook"]
+                    return self._send(201, prediction)
+
+                match = CANCEL_PATH.match(self.path)
+                if match:
+                    prediction = server.store.cancel(match.group(1))
+                    return self._send(200, prediction) if prediction else self._send(404, {"detail": "Not found"})
+
+                self._send(404, {"detail": "Not found"})
+
+            def do_GET(self):
+                url = urlparse(self.path)
+
+                if url.path == "/v1/predictions":
+                    offset = int(parse_qs(url.query).get("cursor", ["0"])[0])
+                    results, next_offset = server.store.list(offset)
+                    next_url = None
+                    if next_offset is not None:
+                        next_url = f"{server.store.base_url}/v1/predictions?cursor={next_offset}"
+                    return self._send(200, {"previous": None, "next": next_url, "results": results})
+
+                match = GET_PATH.match(url.path)
+                if match:
+                    prediction = server.store.get(match.group(1))
+                    return self._send(200, prediction) if prediction else self._send(404, {"detail": "Not found"})
+
+                self._send(404, {"detail": "Not found"})
+
+            def _send(self, status_code, payload):
+                data = json.dumps(payload).encode()
+                self.send_response(status_code)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+        return Handler
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fake Replicate API server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5055)
+    parser.add_argument("--latency", type=float, default=3.0, help="Seconds until a prediction succeeds")
+    parser.add_argument("--webhook-secret", default=None, help="Sign webhooks like Replicate (whsec_...)")
+    args = parser.parse_args()
+
+    print(f"Fake Replicate API listening on http://{args.host}:{args.port}")
+    FakeReplicateServer(args.host, args.port, args.latency, args.webhook_secret).serve_forever()
@@ -0,0 +1,174 @@
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.redis import get_redis
+from app.models.video import Video
+
+# (video_id, user_id, score)
+Candidate = Tuple[UUID, UUID, float]
+
+
+def _score_expression():
+    """
+    Engagement score with time decay
+    Score = (likes + comments * 2 + glitches * 3 + 1) / (age_hours + 2) ^ 1.5
+    """
+    engagement = Video.like_count + Video.comment_count * 2 + Video.glitch_count * 3 + 1
+    age_hours = func.extract("epoch", func.now() - Video.created_at) / 3600
+    return engagement / func.power(age_hours + 2, 1.5)
+
+
+def _feed_eligible_filters(cutoff: datetime) -> list:
+    """Filters for videos that can appear in the For You feed"""
+    return [
+        Video.status == "completed",
+        Video.is_public.is_(True),
+        Video.deleted_at.is_(None),
+        Video.created_at >= cutoff
+    ]
+
+
+class FeedPoolService:
+    """
+    Precomputed For You candidate pool
+
+    The pool is a Redis sorted set of "video_id:user_id" members scored by
+    engagement with time decay. It is rebuilt in the background (celery beat),
+    so the feed endpoint never ranks the whole videos table per request.
+    """
+
+    def __init__(self):
+        self.pool_key = "feed:for_you:pool"
+        self.built_at_key = "feed:for_you:pool:built_at"
+
+    def refresh(self, db: Session) -> int:
+        """
+        Rebuild the candidate pool and atomically swap it in
+
+        Returns:
+            Number of candidates in the new pool
+        """
+        cutoff = datetime.now(timezone.utc) - timedelta(days=settings.FEED_POOL_WINDOW_DAYS)
+        score = _score_expression()
+
+        rows = db.query(
+            Video.id,
+            Video.user_id,
+            score.label("score")
+        ).filter(
+            *_feed_eligible_filters(cutoff)
+        ).order_by(
+            score.desc()
+        ).limit(settings.FEED_POOL_SIZE).all()
+
+        redis = get_redis()
+        building_key = f"{self.pool_key}:building"
+
+        pipe = redis.pipeline()
+        pipe.delete(building_key)
+        if rows:
+            pipe.zadd(building_key, {f"{row.id}:{row.user_id}": float(row.score) for row in rows})
+            pipe.rename(building_key, self.pool_key)
+        else:
+            pipe.delete(self.pool_key)
+        # Stale marker: if the scheduler stops, the next request rebuilds inline
+        pipe.set(self.built_at_key, int(time.time()), ex=settings.FEED_POOL_REFRESH_SECONDS * 3)
+        pipe.execute()
+
+        return len(rows)
+
+    def get_candidates(self, db: Session) -> List[Candidate]:
+        """
+        Get all pool candidates (highest score first)
+        Rebuilds the pool inline if it is missing or stale
+        """
+        redis = get_redis()
+        if not redis.exists(self.built_at_key):
+            self.refresh(db)
+
+        candidates = []
+        for member, score in redis.zrevrange(self.pool_key, 0, -1, withscores=True):
+            video_id, user_id = member.split(":")
+            candidates.append((UUID(video_id), UUID(user_id), score))
+
+        return candidates
+
+    def get_followed_candidates(self, db: Session, following_ids: list) -> List[Candidate]:
+        """
+        Score recent videos from followed creators
+        Bounded by FEED_FOLLOWING_CANDIDATES (served by the user_id index)
+        """
+        if not following_ids:
+            return []
+
+        cutoff = datetime.now(timezone.utc) - timedelta(days=settings.FEED_POOL_WINDOW_DAYS)
+        score = _score_expression()
+
+        rows = db.query(
+            Video.id,
+            Video.user_id,
+            score.label("score")
+        ).filter(
+            Video.user_id.in_(following_ids),
+            *_feed_eligible_filters(cutoff)
+        ).order_by(
+            Video.created_at.desc()
+        ).limit(settings.FEED_FOLLOWING_CANDIDATES).all()
+
+        return [(row.id, row.user_id, float(row.score)) for row in rows]
+
+    @staticmethod
+    def _ranking_key(user_id: UUID, token: str) -> str:
+        return f"feed:for_you:ranked:{user_id}:{token}"
+
+    def save_ranking(self, user_id: UUID, video_ids: List[UUID]) -> str:
+        """
+        Pin a viewer's ranked feed for paging
+        Scores decay and the pool is rebuilt, so later pages are served from
+        this list rather than re-ranked (no repeats or skips)
+
+        Returns:
+            Token identifying the ranking (kept in the cursor)
+        """
+        token = uuid.uuid4().hex[:16]
+        key = self._ranking_key(user_id, token)
+
+        pipe = get_redis().pipeline(transaction=False)
+        pipe.rpush(key, *[str(video_id) for video_id in video_ids])
+        pipe.expire(key, settings.FEED_RANKING_TTL_SECONDS)
+        pipe.execute()
+
+        return token
+
+    def get_ranking_page(self, user_id: UUID, token: str, offset: int, count: int) -> Optional[List[UUID]]:
+        """
+        Video IDs [offset, offset + count) of a pinned ranking
+
+        Returns:
+            None if the ranking expired (or never existed)
+        """
+        key = self._ranking_key(user_id, token)
+
+        pipe = get_redis().pipeline(transaction=False)
+        pipe.lrange(key, offset, offset + count - 1)
+        pipe.expire(key, settings.FEED_RANKING_TTL_SECONDS)  # Active readers keep it alive
+        video_ids, exists = pipe.execute()
+
+        if not exists:
+            return None
+        return [UUID(video_id) for video_id in video_ids]
+
+
+# Global instance
+_feed_pool_service = FeedPoolService()
+
+
+def get_feed_pool_service() -> FeedPoolService:
+    return _feed_pool_service
@@ -0,0 +1,119 @@
+import asyncio
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+from uuid import UUID
+
+from app.core.config import settings
+from app.services.mock_s3_service import get_mock_s3_service
+from app.utils.video_utils import extract_frame_bytes
+
+# Used to quantize timestamps until the video's real frame rate is known
+DEFAULT_FRAME_RATE = 30
+
+FrameKey = Tuple[UUID, int]
+
+
+class FrameCacheService:
+    """
+    Two-tier cache of extracted video frames
+
+    Frames are keyed by (video_id, frame index), with the timestamp
+    quantized to the frame rate, so nearby scrub positions share one
+    frame. Tier 1 is an in-process LRU of frame URLs; tier 2 is the
+    object store (frames/cache/{video_id}/{frame_index}.jpg). ffmpeg runs
+    only on a miss in both, and concurrent misses for the same frame
+    share a single extraction.
+    """
+
+    def __init__(self, max_entries: int = settings.FRAME_CACHE_LRU_SIZE):
+        self.max_entries = max_entries
+        self._lru: "OrderedDict[FrameKey, str]" = OrderedDict()
+        self._inflight: Dict[FrameKey, asyncio.Future] = {}
+
+    @staticmethod
+    def frame_index(timestamp: float, frame_rate: float = DEFAULT_FRAME_RATE) -> int:
+        """Quantize a timestamp to the frame shown at that time"""
+        return max(0, int(timestamp * frame_rate))
+
+    @staticmethod
+    def frame_key(video_id: UUID, frame_index: int) -> str:
+        """Object store key of a cached frame"""
+        return f"frames/cache/{video_id}/{frame_index}.jpg"
+
+    async def get_frame_url(
+        self,
+        video_id: UUID,
+        s3_key: str,
+        timestamp: float,
+        frame_rate: float = DEFAULT_FRAME_RATE
+    ) -> Optional[str]:
+        """
+        Get the URL of the frame at timestamp, extracting it on a cache miss
+
+        Args:
+            video_id: Video ID
+            s3_key: Object key of the video (extraction source)
+            timestamp: Time in seconds
+            frame_rate: Video frame rate used to quantize the timestamp
+
+        Returns:
+            Frame URL, or None if extraction failed
+        """
+        index = self.frame_index(timestamp, frame_rate)
+        key = (video_id, index)
+
+        # Tier 1: in-process LRU
+        url = self._lru.get(key)
+        if url:
+            self._lru.move_to_end(key)
+            return url
+
+        # Share an extraction already running for this frame
+        inflight = self._inflight.get(key)
+        if inflight:
+            return await inflight
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            url = await self._load(video_id, s3_key, index, frame_rate)
+            if url:
+                self._remember(key, url)
+            future.set_result(url)
+            return url
+        except Exception:
+            future.set_result(None)  # Waiters treat it as a failed extraction
+            raise
+        finally:
+            del self._inflight[key]
+
+    async def _load(self, video_id: UUID, s3_key: str, index: int, frame_rate: float) -> Optional[str]:
+        """Tier 2 (object store) lookup, then extraction"""
+        s3_service = get_mock_s3_service()
+        frame_s3_key = self.frame_key(video_id, index)
+
+        # boto calls are blocking: keep them off the event loop
+        if await asyncio.to_thread(s3_service.object_exists, frame_s3_key):
+            return s3_service.get_object_url(frame_s3_key)
+
+        # Extract exactly the quantized frame so every hit returns the same image
+        video_url = s3_service.generate_presigned_download_url(s3_key)
+        frame = await extract_frame_bytes(video_url, index / frame_rate)
+        if not frame:
+            return None
+
+        return await asyncio.to_thread(s3_service.upload_bytes, frame, frame_s3_key, "image/jpeg")
+
+    def _remember(self, key: FrameKey, url: str) -> None:
+        self._lru[key] = url
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.max_entries:
+            self._lru.popitem(last=False)
+
+
+# Global instance
+_frame_cache_service = FrameCacheService()
+
+
+def get_frame_cache_service() -> FrameCacheService:
+    return _frame_cache_service
@@ -11,6 +11,7 @@ class MockS3Service:
         self.bucket_name = "lokiz-videos-mock"
         self.base_url = "https://mock-s3.lokiz.dev"
         self.sample_video_path = "/home/ubuntu/lokiz-backend/tests/sample.mp4"
+        self.uploaded_keys = set()  # Keys written with upload_bytes (mock object store)
 
     def generate_presigned_url(
         self,
@@ -58,6 +59,22 @@ class MockS3Service:
             'file_url': file_url
         }
 
+    def generate_presigned_download_url(self, s3_key: str, expiration: int = 300) -> str:
+        """
+        Mock presigned GET URL for streaming reads
+        Points at the sample video (readable by ffmpeg) when it exists
+
+        Args:
+            s3_key: S3 object key
+            expiration: URL expiration time (ignored in mock)
+
+        Returns:
+            Readable URL or local path
+        """
+        if os.path.exists(self.sample_video_path):
+            return self.sample_video_path
+        return f"{self.base_url}/{self.bucket_name}/{s3_key}"
+
     def download_file(self, s3_key: str, local_path: str) -> bool:
         """
         Mock download file from S3 (for development)
@@ -97,6 +114,29 @@ class MockS3Service:
         # In mock mode, just return a mock URL
         return f"{self.base_url}/{self.bucket_name}/{s3_key}"
 
+    def upload_bytes(self, data: bytes, s3_key: str, content_type: str) -> str:
+        """
+        Mock upload of in-memory data to S3 (for development)
+
+        Args:
+            data: File contents
+            s3_key: S3 object key
+            content_type: MIME type of the data
+
+        Returns:
+            URL of uploaded file
+        """
+        self.uploaded_keys.add(s3_key)
+        return self.get_object_url(s3_key)
+
+    def object_exists(self, s3_key: str) -> bool:
+        """Mock HEAD request: True for keys uploaded in this process"""
+        return s3_key in self.uploaded_keys
+
+    def get_object_url(self, s3_key: str) -> str:
+        """Public URL of an object"""
+        return f"{self.base_url}/{self.bucket_name}/{s3_key}"
+
     def _get_extension_from_mime(self, mime_type: str) -> str:
         """Get file extension from MIME type"""
         mime_to_ext = {
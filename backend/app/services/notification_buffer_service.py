@@ -0,0 +1,179 @@
+import time
+import uuid
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.redis import get_redis
+from app.models.notification import Notification
+from app.services.event_stream_service import get_event_stream_service
+from app.services.notification_counter_service import get_notification_counter_service
+
+FLUSH_BATCH_SIZE = 500  # Groups written per flush transaction
+
+
+class NotificationBufferService:
+    """
+    Coalesces notifications per (user_id, type, target_id)
+
+    Events are buffered in Redis for NOTIFICATION_COALESCE_SECONDS:
+    - notif:buffer:{group}: actors of the group (ZSET actor_id -> first event
+      time, so repeated events from one actor count once per window)
+    - notif:buffer:due: groups scored by when their window closes
+
+    A beat task (app.tasks.notification_tasks) writes each due group as one
+    notification: a new row, or an update of the recipient's unread
+    notification for the same group ("X and 42 others liked your video").
+    """
+
+    def __init__(self):
+        self.due_key = "notif:buffer:due"
+        self.lock_key = "notif:buffer:flush-lock"
+
+    @staticmethod
+    def _group(user_id: UUID, notification_type: str, target_id: Optional[UUID]) -> str:
+        return f"{user_id}:{notification_type}:{target_id or '-'}"
+
+    def add(self, user_id: UUID, notification_type: str, actor_id: UUID, target_id: Optional[UUID] = None) -> None:
+        """Buffer one event"""
+        group = self._group(user_id, notification_type, target_id)
+        now = time.time()
+
+        pipe = get_redis().pipeline(transaction=False)
+        pipe.zadd(f"notif:buffer:{group}", {str(actor_id): now}, nx=True)
+        pipe.zadd(self.due_key, {group: now + settings.NOTIFICATION_COALESCE_SECONDS}, nx=True)
+        pipe.execute()
+
+    def flush(self, db: Session) -> int:
+        """
+        Write all groups whose window has closed
+
+        Actors are removed from the buffer only after the notifications are
+        committed; events arriving during the flush stay for the next window.
+
+        Returns:
+            Number of groups written
+        """
+        redis = get_redis()
+        lock = redis.lock(self.lock_key, timeout=60, blocking=False)
+        if not lock.acquire():
+            return 0  # Another flush is running
+
+        try:
+            groups = redis.zrangebyscore(self.due_key, 0, time.time(), start=0, num=FLUSH_BATCH_SIZE)
+            if not groups:
+                return 0
+
+            pipe = redis.pipeline(transaction=False)
+            for group in groups:
+                pipe.zrange(f"notif:buffer:{group}", 0, -1, desc=True, withscores=True)
+            buffered = dict(zip(groups, pipe.execute()))
+
+            written: List[Tuple[Notification, bool]] = [
+                self._write_group(db, group, [UUID(actor) for actor, _ in actors])
+                for group, actors in buffered.items()
+                if actors
+            ]
+            events = [
+                (notification.user_id, created, {
+                    "id": notification.id,
+                    "type": notification.type,
+                    "actor_id": notification.actor_id,
+                    "target_id": notification.target_id,
+                    "actor_count": notification.actor_count
+                })
+                for notification, created in written
+            ]  # Read before commit expires the rows
+            db.commit()
+
+            # Drop the flushed actors
+            pipe = redis.pipeline(transaction=False)
+            for group, actors in buffered.items():
+                if actors:
+                    pipe.zremrangebyscore(f"notif:buffer:{group}", "-inf", max(score for _, score in actors))
+                pipe.zrem(self.due_key, group)
+            pipe.execute()
+            remaining = [
+                group for group, count in zip(groups, self._pending_counts(groups)) if count
+            ]
+
+            # Groups that got new events during the flush start a new window
+            if remaining:
+                deadline = time.time() + settings.NOTIFICATION_COALESCE_SECONDS
+                redis.zadd(self.due_key, {group: deadline for group in remaining}, nx=True)
+
+            # Unread counters count rows, so only new rows bump them
+            new_unread: Dict[UUID, int] = {}
+            for user_id, created, _ in events:
+                if created:
+                    new_unread[user_id] = new_unread.get(user_id, 0) + 1
+            for user_id, count in new_unread.items():
+                get_notification_counter_service().incr([user_id], count)
+
+            for user_id, _, data in events:
+                get_event_stream_service().publish(user_id, "notification", data)
+
+            return len(groups)
+        finally:
+            lock.release()
+
+    def _pending_counts(self, groups: List[str]) -> List[int]:
+        """Buffered actors per group"""
+        pipe = get_redis().pipeline(transaction=False)
+        for group in groups:
+            pipe.zcard(f"notif:buffer:{group}")
+        return pipe.execute()
+
+    def _write_group(self, db: Session, group: str, actor_ids: List[UUID]) -> Tuple[Notification, bool]:
+        """
+        Write one group's actors (newest first) as a single notification
+
+        Returns:
+            (notification, True if a new unread row was created)
+        """
+        user_id, notification_type, target = group.split(":")
+        target_id = None if target == "-" else UUID(target)
+
+        existing = db.query(Notification).filter(
+            Notification.user_id == UUID(user_id),
+            Notification.is_read.is_(False),
+            Notification.type == notification_type,
+            Notification.target_id.is_(None) if target_id is None else Notification.target_id == target_id
+        ).order_by(Notification.created_at.desc()).with_for_update().first()
+
+        if existing:
+            sample = existing.sample_actor_ids or [existing.actor_id]
+            previous = [actor for actor in sample if actor not in actor_ids]
+            # Actors already in the row are not counted again. The sample holds
+            # every actor until actor_count exceeds NOTIFICATION_SAMPLE_ACTORS;
+            # past that, a returning actor outside the sample is counted twice
+            # (approximate, as in "and 42 others")
+            new_actors = len(actor_ids) - (len(sample) - len(previous))
+            existing.actor_id = actor_ids[0]
+            existing.actor_count = (existing.actor_count or 1) + new_actors
+            existing.sample_actor_ids = (actor_ids + previous)[:settings.NOTIFICATION_SAMPLE_ACTORS]
+            existing.created_at = datetime.utcnow()  # Resurface at the top of the list
+            return existing, False
+
+        notification = Notification(
+            id=uuid.uuid4(),
+            user_id=UUID(user_id),
+            type=notification_type,
+            actor_id=actor_ids[0],
+            target_id=target_id,
+            actor_count=len(actor_ids),
+            sample_actor_ids=actor_ids[:settings.NOTIFICATION_SAMPLE_ACTORS]
+        )
+        db.add(notification)
+        return notification, True
+
+
+# Global instance
+_notification_buffer_service = NotificationBufferService()
+
+
+def get_notification_buffer_service() -> NotificationBufferService:
+    return _notification_buffer_service
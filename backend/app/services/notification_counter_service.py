@@ -0,0 +1,79 @@
+from typing import Iterable
+from uuid import UUID
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.redis import get_redis
+from app.models.notification import Notification
+
+# Adjust a counter only if it is cached; clamp at zero
+# A missing key is rebuilt from the DB on the next read instead
+ADJUST_IF_CACHED = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return nil
+end
+local value = redis.call('INCRBY', KEYS[1], ARGV[1])
+if value < 0 then
+    redis.call('SET', KEYS[1], 0, 'KEEPTTL')
+    value = 0
+end
+return value
+"""
+
+
+class NotificationCounterService:
+    """
+    Per-user unread notification counters in Redis (notif:unread:{user_id})
+
+    Adjusted after each committed create / mark-read, so the unread badge
+    is a single GET. A missing counter is rebuilt with one COUNT on the
+    (user_id, is_read, created_at) index; counters expire after
+    NOTIFICATION_UNREAD_TTL_SECONDS, which bounds any drift.
+    """
+
+    def _key(self, user_id: UUID) -> str:
+        return f"notif:unread:{user_id}"
+
+    def get_unread(self, db: Session, user_id: UUID) -> int:
+        """Unread count (rebuilt from the DB on a cache miss)"""
+        redis = get_redis()
+        cached = redis.get(self._key(user_id))
+        if cached is not None:
+            return int(cached)
+
+        unread_count = db.query(Notification).filter(
+            Notification.user_id == user_id,
+            Notification.is_read.is_(False)
+        ).count()
+        redis.set(self._key(user_id), unread_count, nx=True, ex=settings.NOTIFICATION_UNREAD_TTL_SECONDS)
+        return unread_count
+
+    def incr(self, user_ids: Iterable[UUID], amount: int = 1) -> None:
+        """New unread notifications for users (call after commit)"""
+        self._adjust(user_ids, amount)
+
+    def decr(self, user_id: UUID, amount: int = 1) -> None:
+        """Notifications marked read (call after commit)"""
+        if amount:
+            self._adjust([user_id], -amount)
+
+    def reset(self, user_id: UUID) -> None:
+        """All notifications marked read"""
+        get_redis().set(self._key(user_id), 0, ex=settings.NOTIFICATION_UNREAD_TTL_SECONDS)
+
+    def _adjust(self, user_ids: Iterable[UUID], amount: int) -> None:
+        redis = get_redis()
+        script = redis.register_script(ADJUST_IF_CACHED)
+        pipe = redis.pipeline(transaction=False)
+        for user_id in user_ids:
+            script(keys=[self._key(user_id)], args=[amount], client=pipe)
+        pipe.execute()
+
+
+# Global instance
+_notification_counter_service = NotificationCounterService()
+
+
+def get_notification_counter_service() -> NotificationCounterService:
+    return _notification_counter_service
@@ -0,0 +1,115 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import Optional, Tuple
+from uuid import UUID
+
+from redis.exceptions import RedisError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.redis import get_redis
+from app.models.user import User
+
+
+@dataclass(frozen=True)
+class Principal:
+    """
+    The authenticated user's fields needed for authorization
+    Handlers that mutate the user load the ORM row (get_current_user)
+    """
+    id: UUID
+    username: str
+    is_active: bool
+    credits: int  # For early "insufficient credits" checks; deductions are atomic in SQL
+
+
+class PrincipalCacheService:
+    """
+    Two-tier cache of authenticated principals
+
+    Tier 1 is an in-process LRU with a very short TTL; tier 2 is Redis
+    (auth:principal:{user_id}). The users table is read only on a miss in
+    both. invalidate() drops the Redis entry and this process's entry;
+    other processes' entries expire within PRINCIPAL_CACHE_LOCAL_TTL_SECONDS.
+    """
+
+    def __init__(self, max_entries: int = settings.PRINCIPAL_CACHE_LRU_SIZE):
+        self.max_entries = max_entries
+        self._lru: "OrderedDict[UUID, Tuple[float, Principal]]" = OrderedDict()
+        self._lock = threading.Lock()  # Sync dependencies run in the threadpool
+
+    @staticmethod
+    def _key(user_id: UUID) -> str:
+        return f"auth:principal:{user_id}"
+
+    def get(self, db: Session, user_id: UUID) -> Optional[Principal]:
+        """Principal for a user ID (None if the user does not exist)"""
+        principal = self._get_local(user_id)
+        if principal:
+            return principal
+
+        try:
+            cached = get_redis().get(self._key(user_id))
+        except RedisError:
+            cached = None
+
+        if cached:
+            data = json.loads(cached)
+            principal = Principal(**{**data, "id": UUID(data["id"])})
+        else:
+            row = db.query(User.id, User.username, User.is_active, User.credits).filter(
+                User.id == user_id
+            ).first()
+            if row is None:
+                return None
+            principal = Principal(id=row.id, username=row.username, is_active=row.is_active, credits=row.credits)
+            try:
+                get_redis().set(
+                    self._key(user_id),
+                    json.dumps(asdict(principal), default=str),
+                    ex=settings.PRINCIPAL_CACHE_TTL_SECONDS
+                )
+            except RedisError:
+                pass
+
+        self._set_local(principal)
+        return principal
+
+    def invalidate(self, user_id: UUID) -> None:
+        """Drop a user's cached principal (profile, credits or active flag changed)"""
+        with self._lock:
+            self._lru.pop(user_id, None)
+        try:
+            get_redis().delete(self._key(user_id))
+        except RedisError as e:
+            print(f"Failed to invalidate principal {user_id}: {e}")
+
+    def _get_local(self, user_id: UUID) -> Optional[Principal]:
+        with self._lock:
+            entry = self._lru.get(user_id)
+            if entry is None:
+                return None
+            expires_at, principal = entry
+            if expires_at < time.monotonic():
+                del self._lru[user_id]
+                return None
+            self._lru.move_to_end(user_id)
+            return principal
+
+    def _set_local(self, principal: Principal) -> None:
+        with self._lock:
+            self._lru[principal.id] = (time.monotonic() + settings.PRINCIPAL_CACHE_LOCAL_TTL_SECONDS, principal)
+            self._lru.move_to_end(principal.id)
+            while len(self._lru) > self.max_entries:
+                self._lru.popitem(last=False)
+
+
+# Global instance
+_principal_cache_service = PrincipalCacheService()
+
+
+def get_principal_cache_service() -> PrincipalCacheService:
+    return _principal_cache_service
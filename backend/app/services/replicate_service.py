@@ -1,20 +1,151 @@
+import base64
+import hashlib
+import hmac
+import time
 import replicate
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple, Mapping
 from app.core.config import settings
+from app.services.fake_replicate_client import FakeReplicateClient
+
+# Prediction statuses after which Replicate will not update a prediction
+TERMINAL_STATUSES = ("succeeded", "failed", "canceled")
+
+# Reject webhooks signed more than this long ago (replay protection)
+WEBHOOK_TOLERANCE_SECONDS = 300
+
+# Replicate model used for each AI job type
+JOB_MODELS = {
+    "i2v_template": "google/veo-3-fast",
+    "glitch_animate": "wan-video/wan-2.2-animate-animation",
+    "glitch_replace": "wan-video/wan-2.2-animate-replace",
+    "sticker_to_reality": "luma/modify-video",
+    "music": "suno-ai/bark",
+}
 
 
 class ReplicateService:
     """Service for interacting with Replicate API"""
 
     def __init__(self):
-        self.client = replicate.Client(api_token=settings.REPLICATE_API_TOKEN)
+        if settings.REPLICATE_BACKEND == "fake":
+            # Local fake backend for tests and offline development
+            self.client = FakeReplicateClient()
+        else:
+            # REPLICATE_BASE_URL points at app.services.fake_replicate_server in local runs
+            self.client = replicate.Client(
+                api_token=settings.REPLICATE_API_TOKEN,
+                base_url=settings.REPLICATE_BASE_URL
+            )
+
+    def build_prediction(self, job_type: str, input_data: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
+        """
+        Build the Replicate model and input for an AI job from its stored input_data
+
+        Returns:
+            (model, model input)
+        """
+        if job_type == "i2v_template":
+            return self.i2v_template_input(
+                image_url=input_data["image_url"],
+                prompt=input_data["prompt"],
+                duration=input_data["duration"]
+            )
+        if job_type == "glitch_animate":
+            return self.glitch_animate_input(
+                template_video_url=input_data["template_video_url"],
+                user_image_url=input_data["user_image_url"],
+                prompt=input_data.get("prompt")
+            )
+        if job_type == "glitch_replace":
+            return self.glitch_replace_input(
+                template_video_url=input_data["template_video_url"],
+                user_image_url=input_data["user_image_url"],
+                prompt=input_data.get("prompt")
+            )
+        if job_type == "sticker_to_reality":
+            return self.sticker_to_reality_input(
+                video_url=input_data["video_url"],
+                image_url=input_data["user_image_url"],
+                start_time=input_data["start_time"],
+                end_time=input_data["end_time"],
+                prompt=input_data["prompt"]
+            )
+        if job_type == "music":
+            return self.music_input(
+                prompt=input_data["prompt"],
+                duration=input_data["duration"]
+            )
+
+        raise ValueError(f"Unknown AI job type: {job_type}")
+
+    def create_prediction(self, job_type: str, input_data: Dict[str, Any]) -> str:
+        """
+        Submit a prediction without waiting for it to finish
+        Replicate calls REPLICATE_WEBHOOK_URL on completion (if configured);
+        otherwise the poller (app.tasks.ai_tasks.poll_ai_predictions) picks it up
+
+        Returns:
+            Replicate prediction ID
+        """
+        model, model_input = self.build_prediction(job_type, input_data)
+
+        params = {}
+        if settings.REPLICATE_WEBHOOK_URL:
+            params["webhook"] = settings.REPLICATE_WEBHOOK_URL
+            params["webhook_events_filter"] = ["completed"]
+
+        prediction = self.client.models.predictions.create(model=model, input=model_input, **params)
+        return prediction.id
+
+    def list_predictions(self, cursor: Any = ...):
+        """One page (newest first) of the account's predictions"""
+        return self.client.predictions.list(cursor)
 
-    def generate_i2v_template(
+    def get_prediction(self, prediction_id: str):
+        return self.client.predictions.get(prediction_id)
+
+    @staticmethod
+    def output_url(output: Any) -> str:
+        """Result URL from a prediction output (string or list of files)"""
+        return output if isinstance(output, str) else output[0]
+
+    def verify_webhook(self, headers: Mapping[str, str], body: bytes) -> bool:
+        """
+        Verify a Replicate webhook signature (webhook-id/-timestamp/-signature headers)
+        Fails closed: never passes when REPLICATE_WEBHOOK_SECRET is not configured
+        """
+        secret = settings.REPLICATE_WEBHOOK_SECRET
+        if not secret:
+            return False
+
+        webhook_id = headers.get("webhook-id")
+        timestamp = headers.get("webhook-timestamp")
+        signatures = headers.get("webhook-signature")
+        if not webhook_id or not timestamp or not signatures:
+            return False
+
+        try:
+            if abs(time.time() - int(timestamp)) > WEBHOOK_TOLERANCE_SECONDS:
+                return False
+            key = base64.b64decode(secret.split("_", 1)[1] if secret.startswith("whsec_") else secret)
+        except ValueError:
+            return False
+
+        signed = f"{webhook_id}.{timestamp}.".encode() + body
+        expected = base64.b64encode(hmac.new(key, signed, hashlib.sha256).digest()).decode()
+
+        # Header holds space-separated "v1,<signature>" entries
+        return any(
+            hmac.compare_digest(candidate.split(",", 1)[-1], expected)
+            for candidate in signatures.split()
+        )
+
+    def i2v_template_input(
         self,
         image_url: str,
         prompt: str,
         duration: int = 5
-    ) -> Dict[str, Any]:
+    ) -> Tuple[str, Dict[str, Any]]:
         """
         Generate video from image using I2V model with template prompt
         Used for Motion/Style templates (AI Hug, Dance Motion, etc.)
@@ -25,9 +156,9 @@ class ReplicateService:
             duration: Video duration in seconds (5-10)
 
         Returns:
-            Dict with 'output_url' and 'model'
+            (model, model input)
         """
-        model = "google/veo-3-fast"
+        model = JOB_MODELS["i2v_template"]
 
         input_data = {
             "image": image_url,
@@ -35,20 +166,14 @@ class ReplicateService:
             "duration": duration
         }
 
-        # Run the model
-        output = self.client.run(model, input=input_data)
+        return model, input_data
 
-        return {
-            'output_url': output if isinstance(output, str) else output[0],
-            'model': model
-        }
-
-    def generate_glitch_animate(
+    def glitch_animate_input(
         self,
         template_video_url: str,
         user_image_url: str,
         prompt: Optional[str] = None
-    ) -> Dict[str, Any]:
+    ) -> Tuple[str, Dict[str, Any]]:
         """
         Apply template video's motion to user's image using WAN 2.2 Animate
         Used for Glitch feature (Feed → Studio workflow)
@@ -59,9 +184,9 @@ class ReplicateService:
             prompt: Optional additional prompt
 
         Returns:
-            Dict with 'output_url' and 'model'
+            (model, model input)
         """
-        model = "wan-video/wan-2.2-animate-animation"
+        model = JOB_MODELS["glitch_animate"]
 
         input_data = {
             "video": template_video_url,
@@ -71,20 +196,14 @@ class ReplicateService:
         if prompt:
             input_data["prompt"] = prompt
 
-        # Run the model
-        output = self.client.run(model, input=input_data)
-
-        return {
-            'output_url': output if isinstance(output, str) else output[0],
-            'model': model
-        }
+        return model, input_data
 
-    def generate_glitch_replace(
+    def glitch_replace_input(
         self,
         template_video_url: str,
         user_image_url: str,
         prompt: Optional[str] = None
-    ) -> Dict[str, Any]:
+    ) -> Tuple[str, Dict[str, Any]]:
         """
         Replace template video's subject with user's image using WAN 2.2 Replace
         Used for Glitch feature (Feed → Studio workflow)
@@ -95,9 +214,9 @@ class ReplicateService:
             prompt: Optional additional prompt
 
         Returns:
-            Dict with 'output_url' and 'model'
+            (model, model input)
         """
-        model = "wan-video/wan-2.2-animate-replace"
+        model = JOB_MODELS["glitch_replace"]
 
         input_data = {
             "video": template_video_url,
@@ -107,22 +226,16 @@ class ReplicateService:
         if prompt:
             input_data["prompt"] = prompt
 
-        # Run the model
-        output = self.client.run(model, input=input_data)
-
-        return {
-            'output_url': output if isinstance(output, str) else output[0],
-            'model': model
-        }
+        return model, input_data
 
-    def generate_sticker_to_reality(
+    def sticker_to_reality_input(
         self,
         video_url: str,
         image_url: str,
         start_time: float,
         end_time: float,
         prompt: str
-    ) -> Dict[str, Any]:
+    ) -> Tuple[str, Dict[str, Any]]:
         """
         AI Auto Integration (Sticker to Reality)
         Naturally integrate an image into a video segment with automatic background removal,
@@ -136,10 +249,10 @@ class ReplicateService:
             prompt: User's instruction for how to integrate the image
 
         Returns:
-            Dict with 'output_url' and 'model'
+            (model, model input)
         """
         # Using Luma Dream Machine for video modification
-        model = "luma/modify-video"
+        model = JOB_MODELS["sticker_to_reality"]
 
         input_data = {
             "video": video_url,
@@ -151,19 +264,13 @@ class ReplicateService:
             "context_aware": True  # Analyze movement, lighting, shadows
         }
 
-        # Run the model
-        output = self.client.run(model, input=input_data)
+        return model, input_data
 
-        return {
-            'output_url': output if isinstance(output, str) else output[0],
-            'model': model
-        }
-
-    def generate_music(
+    def music_input(
         self,
         prompt: str,
         duration: int = 60
-    ) -> Dict[str, Any]:
+    ) -> Tuple[str, Dict[str, Any]]:
         """
         Generate music using Suno AI Bark
 
@@ -172,22 +279,16 @@ class ReplicateService:
             duration: Music duration in seconds (default: 60)
 
         Returns:
-            Dict with 'output_url' and 'model'
+            (model, model input)
         """
-        model = "suno-ai/bark"
+        model = JOB_MODELS["music"]
 
         input_data = {
             "prompt": prompt,
             "duration": duration
         }
 
-        # Run the model
-        output = self.client.run(model, input=input_data)
-
-        return {
-            'output_url': output if isinstance(output, str) else output[0],
-            'model': model
-        }
+        return model, input_data
 
 
 # Global instance
@@ -0,0 +1,157 @@
+import functools
+import hashlib
+import inspect
+import json
+from typing import Any, Callable, Iterable, Optional, Tuple
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+from redis.exceptions import RedisError
+
+from app.core.config import settings
+from app.core.redis import get_redis
+
+TagsFunc = Callable[[Any], Iterable[str]]
+
+
+class ResponseCacheService:
+    """
+    Redis cache of rendered JSON responses for public read endpoints
+
+    Each entry (resp:{hash of path, query and viewer}) holds the body and
+    its ETag. Entries are indexed by entity tags ("video:{id}", "user:{id}",
+    "hashtag:trending") in resp:tag:{tag} sets, so a write drops every
+    cached response that embeds the entity; the TTL bounds staleness of the
+    counters that are not invalidated (views, likes).
+    """
+
+    @staticmethod
+    def key(request: Request, viewer_id: Any = None) -> str:
+        query = "&".join(f"{k}={v}" for k, v in sorted(request.query_params.multi_items()))
+        raw = f"{request.url.path}?{query}|{viewer_id or ''}"
+        return f"resp:{hashlib.sha1(raw.encode()).hexdigest()}"
+
+    def get(self, key: str) -> Optional[Tuple[str, str]]:
+        """Cached (etag, body)"""
+        try:
+            cached = get_redis().hmget(key, "etag", "body")
+        except RedisError:
+            return None
+        return (cached[0], cached[1]) if cached[0] else None
+
+    def store(self, key: str, body: str, ttl: int, tags: Iterable[str] = ()) -> str:
+        """Cache a rendered body under its entity tags. Returns its ETag"""
+        etag = f'"{hashlib.sha1(body.encode()).hexdigest()}"'
+        try:
+            pipe = get_redis().pipeline(transaction=False)
+            pipe.hset(key, mapping={"etag": etag, "body": body})
+            pipe.expire(key, ttl)
+            for tag in tags:
+                pipe.sadd(f"resp:tag:{tag}", key)
+                pipe.expire(f"resp:tag:{tag}", ttl)
+            pipe.execute()
+        except RedisError as e:
+            print(f"Failed to cache response {key}: {e}")
+        return etag
+
+    def invalidate(self, *tags: str) -> None:
+        """Drop every cached response tagged with any of the tags"""
+        try:
+            redis = get_redis()
+            for tag in tags:
+                keys = redis.smembers(f"resp:tag:{tag}")
+                redis.delete(f"resp:tag:{tag}", *keys)
+        except RedisError as e:
+            print(f"Failed to invalidate cached responses {tags}: {e}")
+
+
+# Global instance
+_response_cache_service = ResponseCacheService()
+
+
+def get_response_cache_service() -> ResponseCacheService:
+    return _response_cache_service
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    candidates = {value.strip().removeprefix("W/") for value in if_none_match.split(",")}
+    return etag in candidates or "*" in candidates
+
+
+def _respond(request: Request, etag: str, body: str, private: bool) -> Response:
+    """200 with the body, or 304 if the client already has this version"""
+    # Clients revalidate every time; unchanged responses cost one Redis read
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache" if private else "no-cache"}
+    if _etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def cache_response(ttl: Optional[int] = None, tags: Optional[TagsFunc] = None, vary_on_user: bool = False):
+    """
+    Cache a GET route's JSON response in Redis, with ETag / If-None-Match
+
+    Args:
+        ttl: Seconds to keep a response (RESPONSE_CACHE_TTL_SECONDS by default)
+        tags: Entity tags of a rendered payload (its JSON-compatible form),
+            used by ResponseCacheService.invalidate
+        vary_on_user: Cache per viewer (the route's current_user argument)
+
+    Apply below the router decorator. The route's response_model is not
+    applied to cached responses; return the response model itself.
+    Errors (HTTPException) are not cached.
+    """
+    def decorator(func):
+        signature = inspect.signature(func)
+        takes_request = "request" in signature.parameters
+        if not takes_request:
+            # Let FastAPI inject the Request the cache needs
+            signature = signature.replace(parameters=[
+                *signature.parameters.values(),
+                inspect.Parameter("request", inspect.Parameter.KEYWORD_ONLY, annotation=Request)
+            ])
+
+        def lookup(kwargs) -> Tuple[Request, str]:
+            request = kwargs["request"] if takes_request else kwargs.pop("request")
+            viewer = kwargs.get("current_user") if vary_on_user else None
+            return request, ResponseCacheService.key(request, viewer.id if viewer else None)
+
+        def render(request: Request, key: str, result: Any) -> Response:
+            payload = jsonable_encoder(result)
+            body = json.dumps(payload, separators=(",", ":"))
+            etag = _response_cache_service.store(
+                key,
+                body,
+                ttl or settings.RESPONSE_CACHE_TTL_SECONDS,
+                tags(payload) if tags else ()
+            )
+            return _respond(request, etag, body, vary_on_user)
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def wrapper(*args, **kwargs):
+                request, key = lookup(kwargs)
+                if not settings.RESPONSE_CACHE_ENABLED:
+                    return await func(*args, **kwargs)
+                cached = _response_cache_service.get(key)
+                if cached:
+                    return _respond(request, *cached, vary_on_user)
+                return render(request, key, await func(*args, **kwargs))
+        else:
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                request, key = lookup(kwargs)
+                if not settings.RESPONSE_CACHE_ENABLED:
+                    return func(*args, **kwargs)
+                cached = _response_cache_service.get(key)
+                if cached:
+                    return _respond(request, *cached, vary_on_user)
+                return render(request, key, func(*args, **kwargs))
+
+        wrapper.__signature__ = signature
+        return wrapper
+
+    return decorator
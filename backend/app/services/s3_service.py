@@ -72,6 +72,65 @@ class S3Service:
         except ClientError as e:
             raise Exception(f"Failed to generate presigned URL: {str(e)}")
 
+    def generate_presigned_download_url(self, s3_key: str, expiration: int = 300) -> str:
+        """
+        Generate a presigned GET URL for an object
+        Supports HTTP range requests, so readers (e.g. ffmpeg) fetch only the bytes they need
+
+        Args:
+            s3_key: S3 object key
+            expiration: URL expiration time in seconds (default: 5 minutes)
+
+        Returns:
+            Presigned download URL
+        """
+        try:
+            return self.s3_client.generate_presigned_url(
+                'get_object',
+                Params={'Bucket': self.bucket_name, 'Key': s3_key},
+                ExpiresIn=expiration
+            )
+        except ClientError as e:
+            raise Exception(f"Failed to generate presigned URL: {str(e)}")
+
+    def upload_bytes(self, data: bytes, s3_key: str, content_type: str) -> str:
+        """
+        Upload in-memory data to S3
+
+        Args:
+            data: File contents
+            s3_key: S3 object key
+            content_type: MIME type of the data
+
+        Returns:
+            URL of uploaded file
+        """
+        try:
+            self.s3_client.put_object(
+                Bucket=self.bucket_name,
+                Key=s3_key,
+                Body=data,
+                ContentType=content_type
+            )
+        except ClientError as e:
+            raise Exception(f"Failed to upload file: {str(e)}")
+
+        return self.get_object_url(s3_key)
+
+    def object_exists(self, s3_key: str) -> bool:
+        """Check whether an object exists (HEAD request)"""
+        try:
+            self.s3_client.head_object(Bucket=self.bucket_name, Key=s3_key)
+            return True
+        except ClientError:
+            return False
+
+    def get_object_url(self, s3_key: str) -> str:
+        """Public URL of an object"""
+        if self.endpoint_url:
+            return f"{self.endpoint_url}/{self.bucket_name}/{s3_key}"
+        return f"https://{self.bucket_name}.s3.{settings.S3_REGION}.amazonaws.com/{s3_key}"
+
     def _ensure_bucket_exists(self) -> None:
         """Ensure S3 bucket exists (for LocalStack)"""
         try:
@@ -0,0 +1,150 @@
+import asyncio
+import heapq
+from bisect import bisect_left
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models.hashtag import Hashtag
+from app.models.social import Follow
+from app.models.user import User
+
+# Prefixes up to this length get their top results precomputed
+PRECOMPUTED_PREFIX_LENGTH = 2
+# Results kept per precomputed prefix (upper bound for the limit parameter)
+MAX_SUGGESTIONS = 20
+
+
+class PrefixIndex:
+    """
+    Immutable sorted-array prefix index
+
+    Entries are sorted by key; a prefix maps to a contiguous range found
+    with bisect. Top results for short prefixes (whose ranges are large)
+    are precomputed at build time.
+    """
+
+    def __init__(self, entries: List[Tuple[str, int, Dict[str, Any]]]):
+        entries.sort(key=lambda entry: entry[0])
+        self.keys = [key for key, _, _ in entries]
+        self.scores = [score for _, score, _ in entries]
+        self.payloads = [payload for _, _, payload in entries]
+
+        self.top_by_prefix: Dict[str, List[int]] = {}
+        buckets: Dict[str, List[int]] = {}
+        for position, key in enumerate(self.keys):
+            for length in range(1, min(len(key), PRECOMPUTED_PREFIX_LENGTH) + 1):
+                buckets.setdefault(key[:length], []).append(position)
+        for prefix, positions in buckets.items():
+            self.top_by_prefix[prefix] = self._top(positions, MAX_SUGGESTIONS)
+
+    def search(self, prefix: str, limit: int) -> List[Dict[str, Any]]:
+        """Top-scored entries whose key starts with prefix"""
+        if len(prefix) <= PRECOMPUTED_PREFIX_LENGTH:
+            positions = self.top_by_prefix.get(prefix, [])[:limit]
+        else:
+            start = bisect_left(self.keys, prefix)
+            end = bisect_left(self.keys, prefix + "\uffff", lo=start)
+            positions = self._top(range(start, end), limit)
+
+        return [self.payloads[position] for position in positions]
+
+    def _top(self, positions, limit: int) -> List[int]:
+        return heapq.nlargest(limit, positions, key=lambda position: (self.scores[position], -position))
+
+
+class SuggestService:
+    """
+    In-process typeahead over usernames and hashtags
+
+    Usernames are ranked by follower count and hashtags by use_count.
+    Indexes are rebuilt every SUGGEST_REBUILD_SECONDS in the background and
+    swapped in atomically, so lookups never touch Postgres.
+    """
+
+    def __init__(self):
+        self.users: Optional[PrefixIndex] = None
+        self.hashtags: Optional[PrefixIndex] = None
+
+    def suggest(self, q: str, limit: int = 10) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Suggest users and hashtags for a typed prefix
+        "#..." only suggests hashtags, "@..." only users
+        """
+        q = q.strip().lower()
+        only_hashtags = q.startswith("#")
+        only_users = q.startswith("@")
+        prefix = q.lstrip("#@")
+        limit = min(limit, MAX_SUGGESTIONS)
+
+        if not prefix:
+            return {"users": [], "hashtags": []}
+
+        users = self.users.search(prefix, limit) if self.users and not only_hashtags else []
+        hashtags = self.hashtags.search(prefix, limit) if self.hashtags and not only_users else []
+
+        return {"users": users, "hashtags": hashtags}
+
+    def rebuild(self, db: Session) -> None:
+        """Rebuild both indexes from Postgres and swap them in"""
+        follower_counts = db.query(
+            Follow.following_id.label("user_id"),
+            func.count(Follow.id).label("follower_count")
+        ).group_by(Follow.following_id).subquery()
+
+        follower_count = func.coalesce(follower_counts.c.follower_count, 0)
+        users = db.query(
+            User.id, User.username, User.display_name, User.profile_image_url, follower_count
+        ).outerjoin(
+            follower_counts, follower_counts.c.user_id == User.id
+        ).filter(
+            User.is_active.is_(True)
+        ).order_by(follower_count.desc()).limit(settings.SUGGEST_MAX_ENTRIES).all()
+
+        hashtags = db.query(Hashtag.name, Hashtag.use_count).filter(
+            Hashtag.use_count > 0
+        ).order_by(Hashtag.use_count.desc()).limit(settings.SUGGEST_MAX_ENTRIES).all()
+
+        user_index = PrefixIndex([
+            (username.lower(), count, {
+                "id": str(user_id),
+                "username": username,
+                "display_name": display_name,
+                "profile_image_url": profile_image_url,
+                "follower_count": count
+            })
+            for user_id, username, display_name, profile_image_url, count in users
+        ])
+        hashtag_index = PrefixIndex([
+            (name.lower(), use_count or 0, {"name": name, "use_count": use_count or 0})
+            for name, use_count in hashtags
+        ])
+
+        self.users, self.hashtags = user_index, hashtag_index
+
+    async def run_rebuild_loop(self) -> None:
+        """Rebuild the indexes now and then periodically (started on app startup)"""
+        while True:
+            try:
+                await asyncio.to_thread(self._rebuild_with_session)
+            except Exception as e:
+                print(f"Failed to rebuild suggest index: {e}")
+            await asyncio.sleep(settings.SUGGEST_REBUILD_SECONDS)
+
+    def _rebuild_with_session(self) -> None:
+        db = SessionLocal()
+        try:
+            self.rebuild(db)
+        finally:
+            db.close()
+
+
+# Global instance
+_suggest_service = SuggestService()
+
+
+def get_suggest_service() -> SuggestService:
+    return _suggest_service
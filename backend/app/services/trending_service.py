@@ -0,0 +1,217 @@
+import json
+import math
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional
+
+from sqlalchemy import and_, func
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.redis import get_redis
+from app.models.hashtag import Hashtag, video_hashtags
+from app.models.video import Video
+from app.services.response_cache_service import get_response_cache_service
+
+# Score weight of one event of each kind
+USE_WEIGHT = 1.0
+VIEW_WEIGHT = 0.05
+
+# Forward-decay landmark period: scores are kept relative to the start of
+# the current period, so weights stay bounded (<= 2^(period / half-life))
+EPOCH_SECONDS = 86400
+BUCKET_SECONDS = 3600
+BUCKET_RETENTION = 24  # Hourly buckets summed into the *_24h stats
+
+
+class TrendingService:
+    """
+    Streaming trending-hashtag engine
+
+    Every hashtag use and every flushed batch of views updates, in Redis:
+    - a forward-decayed score (ZINCRBY of weight * e^((t - landmark) / tau))
+      in trending:score:{epoch}; decayed to "now" when read, so scores are
+      exponentially time-weighted without rewriting old entries
+    - hourly bucket counters (trending:bucket:{hour}) for uses/views in the
+      last 24h
+
+    A beat task (app.tasks.trending_tasks) turns these into a snapshot of
+    the top-K tags with their stats; the API serves that snapshot.
+    """
+
+    def __init__(self):
+        self.snapshot_key = "trending:snapshot"
+        self.tau = settings.TRENDING_HALF_LIFE_HOURS * 3600 / math.log(2)
+
+    def record_uses(self, names: Iterable[str]) -> None:
+        """Record one use (video tagged) per hashtag name"""
+        self._record({name: 1 for name in names}, "uses", USE_WEIGHT)
+
+    def record_views(self, views_by_name: Dict[str, int]) -> None:
+        """Record views per hashtag name (from the view counter flush)"""
+        self._record(views_by_name, "views", VIEW_WEIGHT)
+
+    def _record(self, counts: Dict[str, int], kind: str, weight: float) -> None:
+        counts = {name: count for name, count in counts.items() if count}
+        if not counts:
+            return
+
+        now = time.time()
+        epoch = int(now // EPOCH_SECONDS)
+        multiplier = weight * math.exp((now - epoch * EPOCH_SECONDS) / self.tau)
+        bucket_key = f"trending:bucket:{int(now // BUCKET_SECONDS)}"
+        score_key = f"trending:score:{epoch}"
+
+        pipe = get_redis().pipeline(transaction=False)
+        for name, count in counts.items():
+            pipe.zincrby(score_key, count * multiplier, name)
+            pipe.hincrby(bucket_key, f"{name}|{kind}", count)
+        pipe.expire(score_key, EPOCH_SECONDS * 3)
+        pipe.expire(bucket_key, BUCKET_SECONDS * (BUCKET_RETENTION + 1))
+        pipe.execute()
+
+    def _epoch_weights(self, now: float) -> Dict[str, float]:
+        """Decay factors bringing the current and previous epoch's scores to now"""
+        epoch = int(now // EPOCH_SECONDS)
+        return {
+            f"trending:score:{epoch}": math.exp(-(now - epoch * EPOCH_SECONDS) / self.tau),
+            f"trending:score:{epoch - 1}": math.exp(-(now - (epoch - 1) * EPOCH_SECONDS) / self.tau),
+        }
+
+    def top_scores(self, k: int) -> List[tuple]:
+        """Top-k (name, decayed score), computed in Redis"""
+        redis = get_redis()
+        merged_key = "trending:score:merged"
+        redis.zunionstore(merged_key, self._epoch_weights(time.time()))
+        return redis.zrevrange(merged_key, 0, k - 1, withscores=True)
+
+    def current_scores(self, names: List[str]) -> Dict[str, float]:
+        """Decayed scores for specific hashtags"""
+        if not names:
+            return {}
+
+        weights = self._epoch_weights(time.time())
+        pipe = get_redis().pipeline(transaction=False)
+        for key in weights:
+            pipe.zmscore(key, names)
+        per_epoch = pipe.execute()
+
+        scores = dict.fromkeys(names, 0.0)
+        for factor, epoch_scores in zip(weights.values(), per_epoch):
+            for name, score in zip(names, epoch_scores):
+                if score:
+                    scores[name] += score * factor
+        return scores
+
+    def recent_counts(self, names: Iterable[str]) -> Dict[str, Dict[str, int]]:
+        """Uses and views in the last 24 hourly buckets"""
+        names = set(names)
+        current = int(time.time() // BUCKET_SECONDS)
+
+        pipe = get_redis().pipeline(transaction=False)
+        for bucket in range(current - BUCKET_RETENTION + 1, current + 1):
+            pipe.hgetall(f"trending:bucket:{bucket}")
+
+        counts = {name: {"uses_24h": 0, "views_24h": 0} for name in names}
+        for bucket in pipe.execute():
+            for field, value in bucket.items():
+                name, _, kind = field.rpartition("|")
+                if name in counts:
+                    counts[name][f"{kind}_24h"] += int(value)
+        return counts
+
+    def collect_stats(self, db: Session, hashtags: List[Hashtag], scores: Dict[str, float]) -> Dict[str, Dict[str, Any]]:
+        """
+        Batch stats for hashtags with two grouped queries (not per tag)
+        video_count, total_views, latest_thumbnail, recent counts and score
+        """
+        if not hashtags:
+            return {}
+
+        ids = [hashtag.id for hashtag in hashtags]
+        visible = and_(
+            Video.id == video_hashtags.c.video_id,
+            Video.status == "completed",
+            Video.is_public.is_(True),
+            Video.deleted_at.is_(None)
+        )
+
+        totals = {
+            hashtag_id: (video_count, int(total_views or 0))
+            for hashtag_id, video_count, total_views in db.query(
+                video_hashtags.c.hashtag_id,
+                func.count(Video.id),
+                func.sum(Video.view_count)
+            ).join(Video, visible).filter(
+                video_hashtags.c.hashtag_id.in_(ids)
+            ).group_by(video_hashtags.c.hashtag_id).all()
+        }
+
+        # Latest thumbnail per hashtag (DISTINCT ON)
+        latest = dict(
+            db.query(video_hashtags.c.hashtag_id, Video.thumbnail_url).join(Video, visible).filter(
+                video_hashtags.c.hashtag_id.in_(ids)
+            ).distinct(video_hashtags.c.hashtag_id).order_by(
+                video_hashtags.c.hashtag_id,
+                Video.created_at.desc()
+            ).all()
+        )
+
+        recent = self.recent_counts(hashtag.name for hashtag in hashtags)
+
+        stats = {}
+        for hashtag in hashtags:
+            video_count, total_views = totals.get(hashtag.id, (0, 0))
+            stats[hashtag.name] = {
+                "video_count": video_count,
+                "total_views": total_views,
+                "latest_thumbnail": latest.get(hashtag.id),
+                "trending_score": round(scores.get(hashtag.name, 0.0), 2),
+                "use_count": hashtag.use_count,
+                **recent[hashtag.name]
+            }
+        return stats
+
+    def build_snapshot(self, db: Session) -> int:
+        """
+        Precompute the top-K trending hashtags and their stats
+        Run by celery beat every TRENDING_SNAPSHOT_SECONDS
+
+        Returns:
+            Number of hashtags in the snapshot
+        """
+        top = self.top_scores(settings.TRENDING_TOP_K)
+        scores = {name: score for name, score in top if score > 0}
+
+        hashtags = db.query(Hashtag).filter(Hashtag.name.in_(list(scores))).all() if scores else []
+        hashtags.sort(key=lambda hashtag: scores[hashtag.name], reverse=True)
+
+        snapshot = {
+            "generated_at": datetime.now(timezone.utc).isoformat(),
+            "hashtags": [
+                {
+                    "id": str(hashtag.id),
+                    "name": hashtag.name,
+                    "use_count": hashtag.use_count,
+                    "created_at": hashtag.created_at.isoformat() if hashtag.created_at else None
+                }
+                for hashtag in hashtags
+            ],
+            "stats": self.collect_stats(db, hashtags, scores)
+        }
+
+        get_redis().set(self.snapshot_key, json.dumps(snapshot))
+        get_response_cache_service().invalidate("hashtag:trending")
+        return len(hashtags)
+
+    def get_snapshot(self) -> Optional[Dict[str, Any]]:
+        raw = get_redis().get(self.snapshot_key)
+        return json.loads(raw) if raw else None
+
+
+# Global instance
+_trending_service = TrendingService()
+
+
+def get_trending_service() -> TrendingService:
+    return _trending_service
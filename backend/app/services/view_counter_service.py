@@ -0,0 +1,169 @@
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable
+from uuid import UUID
+
+from sqlalchemy import Integer, column, delete, update, values
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID, insert
+from sqlalchemy.orm import Session
+
+from app.core.redis import get_redis
+from app.models.hashtag import Hashtag, video_hashtags
+from app.models.video import Video, ViewCountFlush
+from app.services.trending_service import get_trending_service
+
+BATCH_FIELD = "_batch"  # Batch ID stored in the flushing hash next to the deltas
+BATCH_STARTED_FIELD = "_started"  # Unix time the batch was first flushed
+BATCH_RETENTION = timedelta(days=1)  # Applied batch IDs kept this long
+# Older batches may have been applied with their ID already pruned; they are
+# dropped instead of risking a second application
+BATCH_REPLAY_WINDOW = BATCH_RETENTION / 2
+
+
+class ViewCounterService:
+    """
+    Write-behind buffer for video view counts
+
+    Views are aggregated in a Redis hash (video_id -> pending delta) and
+    flushed to videos.view_count in one batched UPDATE per tick, so hot
+    videos never serialize on a Postgres row lock.
+    """
+
+    def __init__(self):
+        self.pending_key = "counters:views:pending"
+        self.flushing_key = "counters:views:flushing"
+        self.lock_key = "counters:views:flush-lock"
+
+    def record_view(self, video_id: UUID) -> int:
+        """
+        Buffer one view
+
+        Returns:
+            Pending (not yet flushed) view delta for the video
+        """
+        return get_redis().hincrby(self.pending_key, str(video_id), 1)
+
+    def get_pending(self, video_ids: Iterable[UUID]) -> Dict[UUID, int]:
+        """Get pending view deltas to merge into DB view_count on read"""
+        keys = [str(video_id) for video_id in video_ids]
+        if not keys:
+            return {}
+
+        redis = get_redis()
+        pipe = redis.pipeline()
+        pipe.hmget(self.pending_key, keys)
+        pipe.hmget(self.flushing_key, keys)
+        pending, flushing = pipe.execute()
+
+        result = {}
+        for key, pending_delta, flushing_delta in zip(keys, pending, flushing):
+            delta = int(pending_delta or 0) + int(flushing_delta or 0)
+            if delta:
+                result[UUID(key)] = delta
+        return result
+
+    def flush(self, db: Session) -> int:
+        """
+        Apply buffered views to videos.view_count in one batched UPDATE
+
+        The pending hash is atomically renamed before it is read, so views
+        recorded during the flush land in a fresh hash. A flushing hash left
+        behind by a crashed flush is retried on the next run: its batch ID is
+        recorded in the same transaction as the counts, so a batch that was
+        already committed is dropped instead of applied twice. A batch older
+        than BATCH_REPLAY_WINDOW is dropped (and logged) without replay: its
+        ID may no longer be in the ledger.
+
+        Returns:
+            Number of videos updated
+        """
+        redis = get_redis()
+        lock = redis.lock(self.lock_key, timeout=60, blocking=False)
+        if not lock.acquire():
+            return 0  # Another flush is running
+
+        try:
+            if not redis.exists(self.flushing_key):
+                if not redis.exists(self.pending_key):
+                    return 0
+                redis.rename(self.pending_key, self.flushing_key)
+            pipe = redis.pipeline()
+            pipe.hsetnx(self.flushing_key, BATCH_FIELD, str(uuid.uuid4()))
+            pipe.hsetnx(self.flushing_key, BATCH_STARTED_FIELD, time.time())
+            pipe.execute()
+
+            deltas = redis.hgetall(self.flushing_key)
+            batch_id = UUID(deltas.pop(BATCH_FIELD))
+            started = float(deltas.pop(BATCH_STARTED_FIELD))
+            if time.time() - started > BATCH_REPLAY_WINDOW.total_seconds():
+                print(f"Dropping stale view count batch {batch_id} ({len(deltas)} videos): too old to replay safely")
+                redis.delete(self.flushing_key)
+                return 0
+
+            rows = sorted(
+                (UUID(video_id), int(delta))
+                for video_id, delta in deltas.items()
+                if int(delta)
+            )  # Stable order avoids deadlocks with other batched writers
+
+            applied = rows and db.execute(
+                insert(ViewCountFlush).values(batch_id=batch_id)
+                .on_conflict_do_nothing()
+                .returning(ViewCountFlush.batch_id)
+            ).first()
+            if not applied:
+                # Empty, or committed by a flush that died before cleaning up
+                db.rollback()
+                redis.delete(self.flushing_key)
+                return 0
+
+            view_deltas = values(
+                column("video_id", PG_UUID(as_uuid=True)),
+                column("delta", Integer),
+                name="view_deltas"
+            ).data(rows)
+
+            db.execute(
+                update(Video)
+                .where(Video.id == view_deltas.c.video_id)
+                .values(view_count=Video.view_count + view_deltas.c.delta)
+            )
+            # Keep the per-hashtag popularity index in step
+            db.execute(
+                update(video_hashtags)
+                .where(video_hashtags.c.video_id == view_deltas.c.video_id)
+                .values(popularity=video_hashtags.c.popularity + view_deltas.c.delta)
+            )
+            db.execute(delete(ViewCountFlush).where(
+                ViewCountFlush.flushed_at < datetime.now(timezone.utc) - BATCH_RETENTION
+            ))
+            db.commit()
+
+            # Committed: stop merging this batch into reads as pending
+            redis.delete(self.flushing_key)
+
+            self._record_hashtag_views(db, dict(rows))
+            return len(rows)
+        finally:
+            lock.release()
+
+    def _record_hashtag_views(self, db: Session, deltas: Dict[UUID, int]) -> None:
+        """Feed the flushed views into trending hashtag scores (one query)"""
+        tagged = db.query(video_hashtags.c.video_id, Hashtag.name).join(
+            Hashtag, Hashtag.id == video_hashtags.c.hashtag_id
+        ).filter(video_hashtags.c.video_id.in_(list(deltas))).all()
+
+        views_by_name: Dict[str, int] = {}
+        for video_id, name in tagged:
+            views_by_name[name] = views_by_name.get(name, 0) + deltas[video_id]
+
+        get_trending_service().record_views(views_by_name)
+
+
+# Global instance
+_view_counter_service = ViewCounterService()
+
+
+def get_view_counter_service() -> ViewCounterService:
+    return _view_counter_service
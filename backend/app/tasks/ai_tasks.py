@@ -0,0 +1,152 @@
+from datetime import datetime, timedelta, timezone
+
+from app.core.celery_app import celery_app
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models.ai_job import AIJob, JobStatus
+from app.services.ai_result_cache import get_ai_result_cache, INFLIGHT_SUBMITTING
+from app.services.replicate_service import get_replicate_service, JOB_MODELS, TERMINAL_STATUSES
+from app.utils.ai_job_utils import (
+    acquire_model_slot,
+    release_model_slot,
+    hold_prediction_slot,
+    complete_ai_job,
+    commit_job_transition,
+    finalize_prediction,
+    fail_ai_job
+)
+
+# Stragglers not found in the listed pages are fetched one by one (bounded)
+MAX_DIRECT_LOOKUPS = 20
+
+
+@celery_app.task(bind=True, name="app.tasks.ai_tasks.run_ai_job", max_retries=None)
+def run_ai_job(self, job_id: str) -> str:
+    """
+    Submit a pending AI job to Replicate as a prediction
+    Enqueued by the /ai endpoints, which return immediately
+
+    The worker only submits; the job is finalized by the webhook receiver
+    or poll_ai_predictions. The model slot is held until then.
+    Requeues itself while the job's model is at its concurrency limit
+    (settings.AI_MODEL_CONCURRENCY).
+
+    Identical requests (see AIResultCache) complete from the cached result
+    or attach to the prediction already in flight instead of resubmitting.
+    """
+    db = SessionLocal()
+    try:
+        job = db.query(AIJob).filter(AIJob.id == job_id).first()
+        if not job or job.status != JobStatus.PENDING:
+            return "skipped"  # Unknown or already handled (duplicate delivery)
+
+        model = JOB_MODELS[job.job_type.value]
+        cache = get_ai_result_cache()
+        cache_key = cache.key(job.job_type.value, job.input_data)
+
+        if cache_key:
+            # Cached result: complete without calling Replicate
+            output_url = cache.get_result(cache_key)
+            if output_url:
+                try:
+                    complete_ai_job(db, job, {"output_url": output_url, "model": model})
+                except Exception as e:
+                    db.rollback()
+                    fail_ai_job(db, job, str(e))
+                return job.status.value
+
+            # Identical request in flight: share its prediction
+            inflight = cache.get_inflight(cache_key)
+            if inflight == INFLIGHT_SUBMITTING:
+                raise self.retry(countdown=1)
+            if inflight:
+                job.replicate_id = inflight
+                job.status = JobStatus.PROCESSING
+                commit_job_transition(db, job)
+                return job.status.value
+
+        slot = acquire_model_slot(model)
+        if not slot:
+            raise self.retry(countdown=settings.AI_MODEL_SLOT_RETRY_SECONDS)
+
+        if cache_key and not cache.claim_inflight(cache_key):
+            # Lost the race to an identical request - attach on retry
+            release_model_slot(model, slot)
+            raise self.retry(countdown=1)
+
+        try:
+            replicate_id = get_replicate_service().create_prediction(job.job_type.value, job.input_data)
+        except Exception as e:
+            release_model_slot(model, slot)
+            if cache_key:
+                cache.clear_inflight(cache_key)
+            fail_ai_job(db, job, str(e))
+            return job.status.value
+
+        hold_prediction_slot(model, slot, replicate_id)
+        if cache_key:
+            cache.set_inflight(cache_key, replicate_id)
+
+        job.replicate_id = replicate_id
+        job.status = JobStatus.PROCESSING
+        commit_job_transition(db, job)
+
+        return job.status.value
+    finally:
+        db.close()
+
+
+@celery_app.task(name="app.tasks.ai_tasks.poll_ai_predictions")
+def poll_ai_predictions() -> int:
+    """
+    Finalize in-flight jobs whose predictions finished (missed or no webhooks)
+    Checks all in-flight predictions with a few list pages instead of one
+    GET per job. Returns the number of jobs finalized.
+    """
+    db = SessionLocal()
+    try:
+        in_flight = db.query(AIJob.replicate_id, AIJob.created_at).filter(
+            AIJob.status == JobStatus.PROCESSING,
+            AIJob.replicate_id.isnot(None)
+        ).all()
+        if not in_flight:
+            return 0
+
+        pending_ids = {replicate_id for replicate_id, _ in in_flight}
+        # Predictions are listed newest first; stop paging past the oldest job
+        oldest = min(created_at for _, created_at in in_flight) - timedelta(minutes=5)
+
+        service = get_replicate_service()
+        finished = []
+        cursor = ...
+        for _ in range(settings.AI_PREDICTION_POLL_MAX_PAGES):
+            page = service.list_predictions(cursor)
+            for prediction in page.results:
+                if prediction.id in pending_ids:
+                    pending_ids.discard(prediction.id)
+                    if prediction.status in TERMINAL_STATUSES:
+                        finished.append(prediction)
+
+            if not pending_ids or not page.next or not page.results:
+                break
+            last_created = page.results[-1].created_at
+            if last_created and datetime.fromisoformat(last_created.replace("Z", "+00:00")) < oldest:
+                break
+            cursor = page.next
+
+        for replicate_id in list(pending_ids)[:MAX_DIRECT_LOOKUPS]:
+            try:
+                prediction = service.get_prediction(replicate_id)
+            except Exception:
+                continue  # Retried on the next poll
+            if prediction.status in TERMINAL_STATUSES:
+                finished.append(prediction)
+
+        finalized = 0
+        for prediction in finished:
+            if finalize_prediction(db, prediction.id, prediction.status, prediction.output, prediction.error):
+                finalized += 1
+
+        return finalized
+    finally:
+        db.close()
@@ -0,0 +1,30 @@
+from app.core.celery_app import celery_app
+from app.db.session import SessionLocal
+from app.services.view_counter_service import get_view_counter_service
+from app.utils import counter_utils
+
+
+@celery_app.task(name="app.tasks.counter_tasks.reconcile_glitch_counts")
+def reconcile_glitch_counts() -> int:
+    """
+    Repair Video.glitch_count drift against video_glitches
+    Scheduled by celery beat every GLITCH_COUNT_RECONCILE_SECONDS
+    """
+    db = SessionLocal()
+    try:
+        return counter_utils.reconcile_glitch_counts(db)
+    finally:
+        db.close()
+
+
+@celery_app.task(name="app.tasks.counter_tasks.flush_view_counts")
+def flush_view_counts() -> int:
+    """
+    Flush buffered video views to videos.view_count
+    Scheduled by celery beat every VIEW_COUNT_FLUSH_SECONDS
+    """
+    db = SessionLocal()
+    try:
+        return get_view_counter_service().flush(db)
+    finally:
+        db.close()
@@ -0,0 +1,16 @@
+from app.core.celery_app import celery_app
+from app.db.session import SessionLocal
+from app.services.feed_pool_service import get_feed_pool_service
+
+
+@celery_app.task(name="app.tasks.feed_tasks.refresh_for_you_pool")
+def refresh_for_you_pool() -> int:
+    """
+    Rebuild the For You candidate pool
+    Scheduled by celery beat every FEED_POOL_REFRESH_SECONDS
+    """
+    db = SessionLocal()
+    try:
+        return get_feed_pool_service().refresh(db)
+    finally:
+        db.close()
@@ -0,0 +1,47 @@
+from app.core.celery_app import celery_app
+from app.db.session import SessionLocal
+from app.models.video import Video
+from app.services.mock_s3_service import get_mock_s3_service
+from app.utils.video_utils import probe_video, render_sprite_sheet, build_sprite_vtt
+
+
+@celery_app.task(name="app.tasks.media_tasks.generate_timeline_sprites")
+def generate_timeline_sprites(video_id: str) -> bool:
+    """
+    Probe an uploaded video and render its timeline sprite sheet
+    Enqueued once when an upload completes
+
+    Stores the real frame rate and duration, a tiled sprite sheet, and a
+    WebVTT thumbnail track (sprites/{video_id}/...), so studio scrubbing
+    fetches one image instead of seeking the MP4.
+    """
+    db = SessionLocal()
+    try:
+        video = db.query(Video).filter(Video.id == video_id).first()
+        if not video or not video.s3_key:
+            return False
+
+        s3_service = get_mock_s3_service()
+        video_url = s3_service.generate_presigned_download_url(video.s3_key, expiration=900)
+
+        probe = probe_video(video_url)
+        if not probe:
+            return False
+
+        video.frame_rate = probe["frame_rate"]
+        video.probed_duration = probe["duration"]
+
+        sprite = render_sprite_sheet(video_url, probe["duration"], probe["width"], probe["height"])
+        if sprite:
+            sheet, sprite_index = sprite
+            sheet_url = s3_service.upload_bytes(sheet, f"sprites/{video.id}/sheet.jpg", "image/jpeg")
+            vtt = build_sprite_vtt(sheet_url, sprite_index, probe["duration"])
+
+            video.sprite_sheet_url = sheet_url
+            video.sprite_vtt_url = s3_service.upload_bytes(vtt.encode(), f"sprites/{video.id}/thumbnails.vtt", "text/vtt")
+            video.sprite_index = sprite_index
+
+        db.commit()
+        return sprite is not None
+    finally:
+        db.close()
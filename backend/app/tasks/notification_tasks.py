@@ -0,0 +1,16 @@
+from app.core.celery_app import celery_app
+from app.db.session import SessionLocal
+from app.services.notification_buffer_service import get_notification_buffer_service
+
+
+@celery_app.task(name="app.tasks.notification_tasks.flush_notifications")
+def flush_notifications() -> int:
+    """
+    Write coalesced notifications whose window has closed
+    Scheduled by celery beat (a few times per NOTIFICATION_COALESCE_SECONDS)
+    """
+    db = SessionLocal()
+    try:
+        return get_notification_buffer_service().flush(db)
+    finally:
+        db.close()
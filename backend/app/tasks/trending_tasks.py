@@ -0,0 +1,16 @@
+from app.core.celery_app import celery_app
+from app.db.session import SessionLocal
+from app.services.trending_service import get_trending_service
+
+
+@celery_app.task(name="app.tasks.trending_tasks.build_trending_snapshot")
+def build_trending_snapshot() -> int:
+    """
+    Precompute trending hashtags and their batch stats
+    Scheduled by celery beat every TRENDING_SNAPSHOT_SECONDS
+    """
+    db = SessionLocal()
+    try:
+        return get_trending_service().build_snapshot(db)
+    finally:
+        db.close()
@@ -0,0 +1,294 @@
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.redis import get_redis
+from app.db.session import run_after_commit
+from app.models.ai_job import AIJob, JobType, JobStatus
+from app.models.user import User
+from app.models.video import Video
+from app.models.social import VideoGlitch
+from app.services.ai_result_cache import get_ai_result_cache
+from app.services.event_stream_service import get_event_stream_service
+from app.services.principal_cache_service import get_principal_cache_service
+from app.services.replicate_service import ReplicateService, JOB_MODELS, TERMINAL_STATUSES
+from app.utils.counter_utils import increment_glitch_count
+from app.utils.notification_utils import create_notification
+
+# Model slots are members of ai:slots:{model} (ZSET member -> deadline).
+# A slot whose owner died (worker crash, lost webhook) lapses at its
+# deadline and is pruned by the next acquire
+MODEL_SLOT_CLAIM_SECONDS = 120  # Reserved slot, until its prediction is created
+MODEL_SLOT_TTL_SECONDS = 3600  # Slot held by a running prediction
+
+# Prune lapsed slots, then reserve one if the model is below its limit
+ACQUIRE_SLOT = """
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', ARGV[1])
+if redis.call('ZCARD', KEYS[1]) >= tonumber(ARGV[2]) then
+    return 0
+end
+redis.call('ZADD', KEYS[1], ARGV[3], ARGV[4])
+redis.call('EXPIRE', KEYS[1], ARGV[5])
+return 1
+"""
+
+
+def acquire_model_slot(model: str) -> Optional[str]:
+    """
+    Reserve one of the model's concurrent generation slots
+    Limits come from settings.AI_MODEL_CONCURRENCY (shared by all workers)
+
+    Returns:
+        Slot token (for hold_prediction_slot / release_model_slot),
+        or None if the model is at capacity
+    """
+    slot = f"claim:{uuid.uuid4()}"
+    limit = settings.AI_MODEL_CONCURRENCY.get(model)
+    if not limit:
+        return slot  # No limit configured
+
+    redis = get_redis()
+    now = time.time()
+    acquired = redis.register_script(ACQUIRE_SLOT)(
+        keys=[f"ai:slots:{model}"],
+        args=[now, limit, now + MODEL_SLOT_CLAIM_SECONDS, slot, MODEL_SLOT_TTL_SECONDS]
+    )
+    return slot if acquired else None
+
+
+def release_model_slot(model: str, slot: str) -> None:
+    """Release a slot reserved with acquire_model_slot"""
+    get_redis().zrem(f"ai:slots:{model}", slot)
+
+
+def hold_prediction_slot(model: str, slot: str, replicate_id: str) -> None:
+    """Hand a reserved slot to its prediction until the prediction is finalized"""
+    key = f"ai:slots:{model}"
+    pipe = get_redis().pipeline()
+    pipe.zadd(key, {replicate_id: time.time() + MODEL_SLOT_TTL_SECONDS})
+    pipe.zrem(key, slot)
+    pipe.expire(key, MODEL_SLOT_TTL_SECONDS)
+    pipe.execute()
+
+
+def release_prediction_slot(model: str, replicate_id: str) -> None:
+    """Release the slot held by a prediction (once, however many jobs share it)"""
+    get_redis().zrem(f"ai:slots:{model}", replicate_id)
+
+
+def deduct_credits(db: Session, user_id, amount: int) -> bool:
+    """
+    Atomically deduct credits if the balance allows it
+    Joins the caller's transaction - the caller commits
+
+    Returns:
+        False if the user no longer has enough credits
+    """
+    updated = db.query(User).filter(
+        User.id == user_id,
+        User.credits >= amount
+    ).update(
+        {User.credits: User.credits - amount},
+        synchronize_session=False
+    )
+    if updated:
+        run_after_commit(db, lambda: get_principal_cache_service().invalidate(user_id))
+    return updated == 1
+
+
+def _create_result_video(db: Session, job: AIJob, output_url: str, thumbnail_url: str) -> Video:
+    """Create the result video (and glitch relationship) for a video job"""
+    input_data = job.input_data
+    source_video = None
+
+    if job.job_type == JobType.I2V_TEMPLATE:
+        title = f"Template: {input_data['template']}"
+        s3_key = f"templates/{job.id}.mp4"
+        duration = input_data["duration"]
+        glitch_type = None
+    elif job.job_type in (JobType.GLITCH_ANIMATE, JobType.GLITCH_REPLACE):
+        source_video = db.query(Video).filter(Video.id == input_data["template_video_id"]).first()
+        if not source_video:
+            raise ValueError("Template video not found")
+        title = f"Glitch from {source_video.title or 'video'}"
+        s3_key = f"glitch/{job.id}.mp4"
+        duration = 5
+        glitch_type = "animate" if job.job_type == JobType.GLITCH_ANIMATE else "replace"
+    else:  # Sticker to Reality
+        source_video = db.query(Video).filter(Video.id == input_data["video_id"]).first()
+        if not source_video:
+            raise ValueError("Video not found")
+        if input_data["is_glitch"]:
+            title = f"Sticker to Reality from {source_video.title or 'video'}"
+            glitch_type = "sticker_to_reality"
+        else:
+            title = f"Sticker to Reality - {source_video.title or 'My Video'}"
+            glitch_type = None
+        s3_key = f"sticker/{job.id}.mp4"
+        duration = int(input_data["end_time"] - input_data["start_time"])
+
+    # Create new video record for result (processing state)
+    new_video = Video(
+        user_id=job.user_id,
+        title=title,
+        video_url=output_url,
+        thumbnail_url=thumbnail_url,
+        s3_key=s3_key,
+        duration_seconds=duration,
+        status="processing"
+    )
+    db.add(new_video)
+    db.flush()
+
+    if glitch_type:
+        # Record glitch relationship
+        db.add(VideoGlitch(
+            original_video_id=source_video.id,
+            glitch_video_id=new_video.id,
+            glitch_type=glitch_type
+        ))
+
+        # Increment glitch_count on source video
+        increment_glitch_count(db, source_video.id)
+
+        # Create notification for source video owner
+        create_notification(
+            db=db,
+            user_id=source_video.user_id,
+            notification_type="glitch",
+            actor_id=job.user_id,
+            target_id=source_video.id
+        )
+
+    return new_video
+
+
+def commit_job_transition(db: Session, job: AIJob) -> None:
+    """Commit a job status change and push it to the owner's event streams"""
+    user_id = job.user_id
+    event = {
+        "job_id": job.id,
+        "status": job.status.value,
+        "result_url": job.output_url,
+        "error": job.error_message
+    }  # Read before commit expires the row
+
+    db.commit()
+
+    get_event_stream_service().publish(user_id, "ai_job", event)
+
+
+def complete_ai_job(db: Session, job: AIJob, result: Dict[str, Any]) -> None:
+    """
+    Apply a successful generation: deduct credits, create the result
+    video (or audio output) and mark the job completed
+    Credits are deducted only here, on success
+
+    Raises:
+        ValueError if the user can no longer pay or the source video is gone
+    """
+    if not deduct_credits(db, job.user_id, job.credits_used):
+        raise ValueError(f"Insufficient credits. Required: {job.credits_used}")
+
+    output_data = {"model": result["model"]}
+
+    if job.job_type == JobType.MUSIC:
+        output_data["audio_url"] = result["output_url"]
+    else:
+        new_video = _create_result_video(
+            db,
+            job,
+            output_url=result["output_url"],
+            thumbnail_url=result.get("thumbnail_url", result["output_url"])
+        )
+        output_data["video_url"] = result["output_url"]
+        output_data["video_id"] = str(new_video.id)
+
+    # Update job with result
+    job.status = JobStatus.COMPLETED
+    job.output_url = result["output_url"]
+    job.output_data = output_data
+    job.completed_at = datetime.now(timezone.utc)
+
+    commit_job_transition(db, job)
+
+
+def finalize_prediction(
+    db: Session,
+    replicate_id: str,
+    status: str,
+    output: Any = None,
+    error: Optional[str] = None
+) -> bool:
+    """
+    Finalize every job attached to a finished Replicate prediction
+    (identical requests share one prediction) and release its model slot
+    Called from the webhook receiver and the poller - whichever comes first wins
+
+    Returns:
+        True if any job was finalized by this call
+    """
+    if status not in TERMINAL_STATUSES:
+        return False
+
+    jobs = db.query(AIJob.id, AIJob.job_type, AIJob.input_data).filter(
+        AIJob.replicate_id == replicate_id,
+        AIJob.status == JobStatus.PROCESSING
+    ).all()
+    if not jobs:
+        return False
+
+    _, job_type, input_data = jobs[0]
+    model = JOB_MODELS[job_type.value]
+
+    # Publish the result before finalizing so new identical requests reuse it
+    cache = get_ai_result_cache()
+    cache_key = cache.key(job_type.value, input_data)
+    if cache_key:
+        if status == "succeeded":
+            cache.store_result(cache_key, ReplicateService.output_url(output))
+        cache.clear_inflight(cache_key)
+
+    finalized = False
+    for job_id, _, _ in jobs:
+        # Lock the job so a concurrent webhook/poll for the same prediction skips it
+        job = db.query(AIJob).filter(
+            AIJob.id == job_id,
+            AIJob.status == JobStatus.PROCESSING
+        ).with_for_update(skip_locked=True).first()
+        if not job:
+            continue
+
+        try:
+            if status == "succeeded":
+                complete_ai_job(db, job, {
+                    "output_url": ReplicateService.output_url(output),
+                    "model": model
+                })
+            else:
+                fail_ai_job(db, job, error or f"Prediction {status}")
+        except Exception as e:
+            db.rollback()
+            job = db.query(AIJob).filter(
+                AIJob.id == job_id,
+                AIJob.status == JobStatus.PROCESSING
+            ).with_for_update().first()
+            if job:
+                fail_ai_job(db, job, str(e))
+        finalized = True
+
+    release_prediction_slot(model, replicate_id)
+
+    return finalized
+
+
+def fail_ai_job(db: Session, job: AIJob, error_message: str) -> None:
+    """Mark job as failed (no credit deduction)"""
+    job.status = JobStatus.FAILED
+    job.error_message = error_message
+    job.completed_at = datetime.now(timezone.utc)
+    commit_job_transition(db, job)
@@ -0,0 +1,88 @@
+import json
+from typing import Optional, Tuple
+
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Query, Session
+from sqlalchemy.sql.expression import ClauseElement, Executable
+
+from app.core.config import settings
+from app.core.redis import get_redis
+
+
+class Explain(Executable, ClauseElement):
+    """EXPLAIN (FORMAT JSON) of a statement, bound like any other statement"""
+    inherit_cache = False
+
+    def __init__(self, statement):
+        self.statement = statement
+
+
+@compiles(Explain, "postgresql")
+def _compile_explain(element, compiler, **kw):
+    # Compiled by the session's dialect, so parameters use its paramstyle
+    # (pyformat for psycopg2, positional $n for asyncpg under AsyncSession)
+    return f"EXPLAIN (FORMAT JSON) {compiler.process(element.statement, **kw)}"
+
+
+def estimate_count(db: Session, query: Query) -> int:
+    """
+    Planner row estimate for a query (EXPLAIN, without executing it)
+    Constant time regardless of how many rows match
+
+    Args:
+        db: Database session
+        query: Query without LIMIT/OFFSET
+
+    Returns:
+        Estimated number of rows
+    """
+    result = db.execute(Explain(query.statement)).scalar()
+
+    plan = result if isinstance(result, list) else json.loads(result)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def count_total(
+    db: Session,
+    query: Query,
+    returned: Optional[int] = None,
+    limit: Optional[int] = None,
+    offset: int = 0,
+    cache_key: Optional[str] = None
+) -> Tuple[int, bool]:
+    """
+    Total row count for a list endpoint, exact only when that is cheap
+
+    1. A page that is not full ends the result set: offset + rows returned
+    2. Small results (planner estimate <= COUNT_EXACT_THRESHOLD): exact COUNT(*)
+    3. Large results: exact count cached for COUNT_CACHE_TTL_SECONDS under
+       cache_key if given, otherwise the planner estimate
+
+    Args:
+        db: Database session
+        query: Query without ORDER BY/LIMIT/OFFSET
+        returned: Rows returned on the current page
+        limit: Requested page size
+        offset: Offset of the current page
+        cache_key: Redis key suffix for caching large counts
+
+    Returns:
+        (total, is_estimate)
+    """
+    if returned is not None and limit is not None and returned < limit and (returned or not offset):
+        return offset + returned, False
+
+    estimate = estimate_count(db, query)
+    if estimate <= settings.COUNT_EXACT_THRESHOLD:
+        return query.order_by(None).count(), False
+
+    floor = offset + (returned or 0)  # Rows known to exist
+    if cache_key:
+        redis = get_redis()
+        cached = redis.get(f"count:{cache_key}")
+        if cached is None:
+            cached = query.order_by(None).count()
+            redis.set(f"count:{cache_key}", cached, ex=settings.COUNT_CACHE_TTL_SECONDS)
+        return max(int(cached), floor), True
+
+    return max(estimate, floor), True
@@ -0,0 +1,56 @@
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.models.video import Video
+from app.models.social import VideoGlitch
+
+
+def increment_glitch_count(db: Session, video_id) -> None:
+    """
+    Increment the denormalized glitch_count of a video
+
+    Video.glitch_count is the single source read by every endpoint.
+    Uses an atomic UPDATE (no read-modify-write race) and joins the
+    caller's transaction - the caller commits.
+    """
+    db.query(Video).filter(Video.id == video_id).update(
+        {Video.glitch_count: Video.glitch_count + 1},
+        synchronize_session="evaluate"
+    )
+
+
+def adjust_comment_count(db: Session, video_id, delta: int) -> None:
+    """
+    Add delta (+1 / -1) to the denormalized comment_count of a video
+
+    Atomic UPDATE like increment_glitch_count, never below zero; joins the
+    caller's transaction - the caller commits.
+    """
+    db.query(Video).filter(Video.id == video_id).update(
+        {Video.comment_count: func.greatest(Video.comment_count + delta, 0)},
+        synchronize_session=False
+    )
+
+
+def reconcile_glitch_counts(db: Session) -> int:
+    """
+    Repair glitch_count drift against the video_glitches table
+
+    Returns:
+        Number of videos whose glitch_count was corrected
+    """
+    actual_count = select(
+        func.count(VideoGlitch.id)
+    ).where(
+        VideoGlitch.original_video_id == Video.id
+    ).correlate(Video).scalar_subquery()
+
+    corrected = db.query(Video).filter(
+        Video.glitch_count != actual_count
+    ).update(
+        {Video.glitch_count: actual_count},
+        synchronize_session=False
+    )
+    db.commit()
+
+    return corrected
@@ -1,6 +1,11 @@
 import re
+from uuid import UUID
+from sqlalchemy import case, delete, func, update
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import Session
-from app.models.hashtag import Hashtag
+from app.db.session import run_after_commit
+from app.models.hashtag import Hashtag, video_hashtags
+from app.services.trending_service import get_trending_service
 
 
 def extract_hashtags(text: str) -> list[str]:
@@ -20,56 +25,123 @@ def extract_hashtags(text: str) -> list[str]:
     return unique_hashtags
 
 
-def get_or_create_hashtags(db: Session, hashtag_names: list[str]) -> list[Hashtag]:
+def is_video_listed(video) -> bool:
+    """Whether a video appears on hashtag pages (completed, public, not deleted)"""
+    return video.status == "completed" and bool(video.is_public) and video.deleted_at is None
+
+
+def _index_values(video) -> dict:
+    """Video sort keys and visibility copied onto its video_hashtags rows"""
+    return {
+        "video_created_at": video.created_at,
+        "is_listed": is_video_listed(video),
+        "popularity": video.view_count or 0
+    }
+
+
+def sync_video_hashtag_index(db: Session, video):
+    """
+    Refresh the per-hashtag video index rows of a video
+    Call after changing its status, visibility or deletion (caller commits)
     """
-    Get existing hashtags or create new ones
+    db.execute(
+        update(video_hashtags)
+        .where(video_hashtags.c.video_id == video.id)
+        .values(**_index_values(video))
+    )
+
+
+def get_or_create_hashtag_ids(db: Session, hashtag_names: list[str]) -> dict[str, UUID]:
+    """
+    Get existing hashtags or create new ones in bulk
+    One INSERT ... ON CONFLICT DO NOTHING RETURNING for all names, plus one
+    SELECT for the names that already existed
+    Returns {name: hashtag_id}
     """
-    hashtags = []
+    if not hashtag_names:
+        return {}
 
-    for name in hashtag_names:
-        # Try to find existing hashtag
-        hashtag = db.query(Hashtag).filter(Hashtag.name == name).first()
+    # Sorted so concurrent uploads take the unique-index locks in the same order
+    names = sorted(set(hashtag_names))
 
-        if not hashtag:
-            # Create new hashtag
-            hashtag = Hashtag(name=name)
-            db.add(hashtag)
-            db.flush()
+    created = db.execute(
+        insert(Hashtag)
+        .values([{"name": name} for name in names])
+        .on_conflict_do_nothing(index_elements=[Hashtag.name])
+        .returning(Hashtag.name, Hashtag.id)
+    ).all()
+    hashtag_ids = {name: hashtag_id for name, hashtag_id in created}
 
-        hashtags.append(hashtag)
+    existing = [name for name in names if name not in hashtag_ids]
+    if existing:
+        hashtag_ids.update(
+            db.query(Hashtag.name, Hashtag.id).filter(Hashtag.name.in_(existing)).all()
+        )
 
-    return hashtags
+    return hashtag_ids
 
 
 def update_video_hashtags(db: Session, video, caption: str):
     """
     Update hashtags for a video based on caption
+    Set-based: a constant number of round trips regardless of the tag count
     """
     # Extract hashtags from caption
     hashtag_names = extract_hashtags(caption)
 
     # Get or create hashtags
-    new_hashtags = get_or_create_hashtags(db, hashtag_names)
+    new_ids = get_or_create_hashtag_ids(db, hashtag_names)
+    names_by_id = {hashtag_id: name for name, hashtag_id in new_ids.items()}
 
-    # Get current hashtags
-    current_hashtags = video.hashtags
+    # Get current hashtags (association rows only, no ORM load)
+    current_ids = {
+        hashtag_id for (hashtag_id,) in db.query(video_hashtags.c.hashtag_id).filter(
+            video_hashtags.c.video_id == video.id
+        ).all()
+    }
 
     # Find hashtags to remove (old hashtags not in new caption)
-    hashtags_to_remove = [h for h in current_hashtags if h not in new_hashtags]
+    ids_to_remove = current_ids - names_by_id.keys()
 
     # Find hashtags to add (new hashtags not in current)
-    hashtags_to_add = [h for h in new_hashtags if h not in current_hashtags]
-
-    # Update use_count for removed hashtags
-    for hashtag in hashtags_to_remove:
-        if hashtag.use_count > 0:
-            hashtag.use_count -= 1
-
-    # Update use_count for added hashtags
-    for hashtag in hashtags_to_add:
-        hashtag.use_count += 1
+    ids_to_add = names_by_id.keys() - current_ids
+
+    if ids_to_remove or ids_to_add:
+        # Update use_count for added/removed hashtags in one UPDATE
+        # (relative to the stored value, so concurrent edits don't race)
+        delta = case(
+            {**{hashtag_id: -1 for hashtag_id in ids_to_remove}, **{hashtag_id: 1 for hashtag_id in ids_to_add}},
+            value=Hashtag.id
+        )
+        db.query(Hashtag).filter(Hashtag.id.in_(ids_to_remove | ids_to_add)).update(
+            {Hashtag.use_count: func.greatest(func.coalesce(Hashtag.use_count, 0) + delta, 0)},
+            synchronize_session=False
+        )
 
     # Update video hashtags
-    video.hashtags = new_hashtags
+    if ids_to_remove:
+        db.execute(
+            delete(video_hashtags).where(
+                video_hashtags.c.video_id == video.id,
+                video_hashtags.c.hashtag_id.in_(ids_to_remove)
+            )
+        )
+    if ids_to_add:
+        db.execute(
+            insert(video_hashtags)
+            .values([
+                {"video_id": video.id, "hashtag_id": hashtag_id, **_index_values(video)}
+                for hashtag_id in ids_to_add
+            ])
+            .on_conflict_do_nothing()
+        )
+
+    # Feed new uses into the time-decayed trending scores (once the edit is committed)
+    added_names = [names_by_id[hashtag_id] for hashtag_id in ids_to_add]
+    if added_names:
+        run_after_commit(db, lambda: get_trending_service().record_uses(added_names))
+
+    # Association rows were written directly; reload video.hashtags on next access
+    db.expire(video, ["hashtags"])
 
     db.commit()
@@ -1,7 +1,14 @@
+import uuid
+
 from sqlalchemy.orm import Session
 from uuid import UUID
 
+from app.core.config import settings
+from app.db.session import run_after_commit
 from app.models.notification import Notification
+from app.services.event_stream_service import get_event_stream_service
+from app.services.notification_buffer_service import get_notification_buffer_service
+from app.services.notification_counter_service import get_notification_counter_service
 
 
 def create_notification(
@@ -13,6 +20,10 @@ def create_notification(
 ):
     """
     Create a notification
+    Joins the caller's transaction - the caller commits; nothing is sent
+    if the action rolls back
+    Coalescable types are buffered (after commit) and written in aggregate
+    by app.tasks.notification_tasks (returns None); others are added now
 
     Args:
         db: Database session
@@ -25,15 +36,34 @@ def create_notification(
     if user_id == actor_id:
         return None
 
+    # Buffer for coalescing per (user, type, target) once the action is committed
+    if notification_type in settings.NOTIFICATION_COALESCE_TYPES:
+        run_after_commit(db, lambda: get_notification_buffer_service().add(
+            user_id, notification_type, actor_id, target_id
+        ))
+        return None
+
     notification = Notification(
+        id=uuid.uuid4(),
         user_id=user_id,
         type=notification_type,
         actor_id=actor_id,
-        target_id=target_id
+        target_id=target_id,
+        sample_actor_ids=[actor_id]
     )
-
     db.add(notification)
-    db.commit()
-    db.refresh(notification)
+
+    # Bump the recipient's cached unread count and push to open streams
+    event = {
+        "id": notification.id,
+        "type": notification_type,
+        "actor_id": actor_id,
+        "target_id": target_id,
+        "actor_count": 1
+    }
+    run_after_commit(db, lambda: (
+        get_notification_counter_service().incr([user_id]),
+        get_event_stream_service().publish(user_id, "notification", event)
+    ))
 
     return notification
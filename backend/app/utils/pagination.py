@@ -0,0 +1,58 @@
+import base64
+import json
+from datetime import datetime
+from uuid import UUID
+
+from fastapi import HTTPException, status
+from sqlalchemy import tuple_
+
+
+def encode_cursor(*values) -> str:
+    """
+    Encode sort key values into an opaque cursor string
+    Supports datetime, UUID, float, int, bool and str values
+    """
+    payload = [
+        value.isoformat() if isinstance(value, datetime) else
+        str(value) if isinstance(value, UUID) else
+        value
+        for value in values
+    ]
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, *types) -> tuple:
+    """
+    Decode an opaque cursor into typed sort key values
+
+    Args:
+        cursor: Cursor from a previous page's next_cursor
+        types: Expected type of each value (datetime, UUID, float, int, bool, str)
+
+    Raises:
+        HTTPException 400 if the cursor is malformed
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        if not isinstance(payload, list) or len(payload) != len(types):
+            raise ValueError("cursor length mismatch")
+
+        return tuple(
+            datetime.fromisoformat(value) if value_type is datetime else value_type(value)
+            for value_type, value in zip(types, payload)
+        )
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+
+def keyset_before(columns: list, values: tuple):
+    """
+    Row-value comparison for descending keyset pagination
+    (col1, col2, ...) < (val1, val2, ...) - served by a matching composite index
+    """
+    return tuple_(*columns) < tuple_(*values)
@@ -0,0 +1,74 @@
+import re
+from typing import Optional
+
+from sqlalchemy import func, or_, literal
+from sqlalchemy.orm import Session, Query
+
+from app.models.user import User
+from app.models.video import Video
+
+# Words (letters/digits in any script, incl. Hangul) usable in a tsquery
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+
+def build_prefix_tsquery(q: str) -> Optional[str]:
+    """
+    Turn free text into a prefix tsquery: "dance cha" -> "dance:* & cha:*"
+    Returns None if the text has no searchable words
+    """
+    words = _WORD.findall(q.lower())
+    if not words:
+        return None
+    return " & ".join(f"{word}:*" for word in words)
+
+
+def search_videos_query(db: Session, q: str) -> Optional[Query]:
+    """
+    Videos matching q (title + caption), ranked by relevance
+    Served by the GIN index on videos.search_vector
+
+    Returns:
+        Query ordered by rank (callers add visibility filters and LIMIT),
+        or None if q has no searchable words
+    """
+    tsquery_text = build_prefix_tsquery(q)
+    if not tsquery_text:
+        return None
+
+    tsquery = func.to_tsquery('simple', tsquery_text)
+    rank = func.ts_rank_cd(Video.search_vector, tsquery)
+
+    return db.query(Video).filter(
+        Video.search_vector.op('@@')(tsquery),
+        Video.status == "completed"
+    ).order_by(rank.desc(), Video.created_at.desc(), Video.id.desc())
+
+
+def search_users_query(db: Session, q: str) -> Query:
+    """
+    Users whose username/display_name contains or closely resembles q
+    Served by the pg_trgm GIN indexes; ranked by trigram similarity,
+    with exact and prefix username matches first
+    """
+    q = q.strip()
+    pattern = f"%{_escape_like(q)}%"
+
+    similarity = func.greatest(
+        func.similarity(User.username, q),
+        func.similarity(func.coalesce(User.display_name, ''), q)
+    )
+    exact = func.lower(User.username) == q.lower()
+    prefix = User.username.ilike(f"{_escape_like(q)}%")
+
+    return db.query(User).filter(
+        or_(
+            User.username.ilike(pattern),
+            User.display_name.ilike(pattern),
+            User.username.op('%')(literal(q))  # Fuzzy (typo-tolerant) match
+        )
+    ).order_by(exact.desc(), prefix.desc(), similarity.desc(), User.username)
+
+
+def _escape_like(value: str) -> str:
+    """Escape LIKE wildcards in user input"""
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
@@ -1,85 +1,262 @@
+import asyncio
+import json
+import math
 import subprocess
-import os
-from typing import Optional
+from typing import Any, Dict, Optional, Tuple
 
+from app.core.config import settings
 
-def extract_frame_from_video(
-    video_path: str,
+
+async def extract_frame_bytes(
+    video_url: str,
     timestamp: float,
-    output_path: str
-) -> bool:
+    timeout: Optional[float] = None
+) -> Optional[bytes]:
     """
-    Extract a single frame from video at specified timestamp
+    Extract a single JPEG frame without temp files
+
+    ffmpeg reads the (presigned) URL directly and seeks before decoding
+    (-ss before -i), so only the index and the bytes around the timestamp
+    are fetched with HTTP range requests. The frame is written to stdout.
 
     Args:
-        video_path: Path to the input video file
+        video_url: Presigned URL (or local path) of the input video
         timestamp: Time in seconds to extract frame from
-        output_path: Path to save the extracted frame image
+        timeout: Seconds before ffmpeg is killed (MEDIA_FRAME_TIMEOUT_SECONDS by default)
 
     Returns:
-        True if successful, False otherwise
+        JPEG bytes, or None if extraction failed
     """
+    timeout = timeout or settings.MEDIA_FRAME_TIMEOUT_SECONDS
+    command = [
+        'ffmpeg',
+        '-loglevel', 'error',
+        '-ss', str(timestamp),  # Input seek: jump to nearest keyframe via range requests
+        '-i', video_url,
+        '-frames:v', '1',  # Extract 1 frame
+        '-q:v', '2',  # High quality
+        '-f', 'image2pipe',
+        '-vcodec', 'mjpeg',
+        'pipe:1'
+    ]
+
     try:
-        # Ensure output directory exists
-        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        process = await asyncio.create_subprocess_exec(
+            *command,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE
+        )
+    except FileNotFoundError:
+        print("Error extracting frame: ffmpeg not found")
+        return None
 
-        # Use ffmpeg to extract frame
+    try:
+        stdout, stderr = await asyncio.wait_for(process.communicate(), timeout=timeout)
+    except asyncio.TimeoutError:
+        process.kill()
+        await process.wait()
+        print(f"Error extracting frame: timed out after {timeout}s")
+        return None
+
+    if process.returncode != 0 or not stdout:
+        print(f"Error extracting frame: {stderr.decode(errors='replace')}")
+        return None
+
+    return stdout
+
+
+def probe_video(video_url: str) -> Optional[Dict[str, Any]]:
+    """
+    Probe a video's frame rate, duration and dimensions with ffprobe
+    Reads only the container header (works on presigned URLs)
+
+    Args:
+        video_url: Presigned URL (or local path) of the video
+
+    Returns:
+        Dict with 'frame_rate', 'duration', 'width', 'height', or None if error
+    """
+    try:
         command = [
-            'ffmpeg',
-            '-ss', str(timestamp),  # Seek to timestamp
-            '-i', video_path,  # Input video
-            '-frames:v', '1',  # Extract 1 frame
-            '-q:v', '2',  # High quality
-            '-y',  # Overwrite output file
-            output_path
+            'ffprobe',
+            '-v', 'error',
+            '-select_streams', 'v:0',
+            '-show_entries', 'stream=width,height,avg_frame_rate,r_frame_rate:format=duration',
+            '-of', 'json',
+            video_url
         ]
 
-        subprocess.run(
+        result = subprocess.run(
             command,
             stdout=subprocess.PIPE,
             stderr=subprocess.PIPE,
-            check=True
+            check=True,
+            timeout=settings.MEDIA_PROBE_TIMEOUT_SECONDS
         )
 
-        return os.path.exists(output_path)
+        info = json.loads(result.stdout.decode())
+        stream = info["streams"][0]
 
-    except subprocess.CalledProcessError as e:
-        print(f"Error extracting frame: {e.stderr.decode()}")
-        return False
+        frame_rate = _parse_rate(stream.get("avg_frame_rate")) or _parse_rate(stream.get("r_frame_rate"))
+        return {
+            "frame_rate": frame_rate,
+            "duration": float(info["format"]["duration"]),
+            "width": stream.get("width"),
+            "height": stream.get("height")
+        }
+
+    except subprocess.TimeoutExpired as e:
+        print(f"Error probing video: timed out after {e.timeout}s")
+        return None
     except Exception as e:
-        print(f"Unexpected error: {str(e)}")
-        return False
+        print(f"Error probing video: {str(e)}")
+        return None
+
+
+def _parse_rate(rate: Optional[str]) -> Optional[float]:
+    """Parse an ffprobe rational like '30000/1001'"""
+    if not rate:
+        return None
+    numerator, _, denominator = rate.partition('/')
+    try:
+        value = float(numerator) / float(denominator or 1)
+    except (ValueError, ZeroDivisionError):
+        return None
+    return round(value, 3) if value > 0 else None
 
 
-def get_video_duration(video_path: str) -> Optional[float]:
+def render_sprite_sheet(
+    video_url: str,
+    duration: float,
+    width: Optional[int],
+    height: Optional[int],
+    tile_width: int = 160,
+    max_columns: int = 10,
+    max_tiles: int = 100
+) -> Optional[Tuple[bytes, Dict[str, Any]]]:
     """
-    Get the duration of a video file in seconds
+    Render a tiled thumbnail sprite sheet in a single ffmpeg pass
+    One tile every `interval` seconds (at least 1s, at most max_tiles tiles)
 
     Args:
-        video_path: Path to the video file
+        video_url: Presigned URL (or local path) of the video
+        duration: Video duration in seconds
+        width: Video width (for tile aspect ratio)
+        height: Video height (for tile aspect ratio)
+        tile_width: Width of each tile in pixels
+        max_columns: Tiles per sprite row
+        max_tiles: Maximum number of tiles
 
     Returns:
-        Duration in seconds, or None if error
+        (JPEG bytes, sprite index), or None if error
     """
-    try:
-        command = [
-            'ffprobe',
-            '-v', 'error',
-            '-show_entries', 'format=duration',
-            '-of', 'default=noprint_wrappers=1:nokey=1',
-            video_path
-        ]
+    interval = max(1.0, duration / max_tiles)
+    count = max(1, math.ceil(duration / interval))
+    columns = min(max_columns, count)
+    rows = math.ceil(count / columns)
+
+    # Keep the video's aspect ratio (even dimensions for the encoder)
+    if width and height:
+        tile_height = max(2, int(round(tile_width * height / width / 2)) * 2)
+    else:
+        tile_height = int(tile_width * 16 / 9)
+
+    command = [
+        'ffmpeg',
+        '-loglevel', 'error',
+        '-i', video_url,
+        '-vf', f"fps=1/{interval:.6f},scale={tile_width}:{tile_height},tile={columns}x{rows}",
+        '-frames:v', '1',
+        '-q:v', '4',
+        '-f', 'image2pipe',
+        '-vcodec', 'mjpeg',
+        'pipe:1'
+    ]
 
+    try:
         result = subprocess.run(
             command,
             stdout=subprocess.PIPE,
             stderr=subprocess.PIPE,
-            check=True
+            check=True,
+            timeout=settings.MEDIA_RENDER_TIMEOUT_SECONDS
         )
-
-        duration = float(result.stdout.decode().strip())
-        return duration
-
+    except subprocess.CalledProcessError as e:
+        print(f"Error rendering sprite sheet: {e.stderr.decode()}")
+        return None
+    except subprocess.TimeoutExpired as e:
+        print(f"Error rendering sprite sheet: timed out after {e.timeout}s")
+        return None
     except Exception as e:
-        print(f"Error getting video duration: {str(e)}")
+        print(f"Unexpected error: {str(e)}")
+        return None
+
+    if not result.stdout:
         return None
+
+    return result.stdout, {
+        "interval": round(interval, 3),
+        "count": count,
+        "columns": columns,
+        "rows": rows,
+        "tile_width": tile_width,
+        "tile_height": tile_height
+    }
+
+
+def sprite_tile(sprite_index: Dict[str, Any], timestamp: float) -> Dict[str, int]:
+    """
+    Position of the sprite sheet tile shown at a timestamp
+
+    Args:
+        sprite_index: Index returned by render_sprite_sheet
+        timestamp: Time in seconds
+
+    Returns:
+        Dict with 'x', 'y', 'width', 'height' (pixels within the sheet)
+    """
+    tile = min(sprite_index["count"] - 1, max(0, int(timestamp // sprite_index["interval"])))
+    return {
+        "x": (tile % sprite_index["columns"]) * sprite_index["tile_width"],
+        "y": (tile // sprite_index["columns"]) * sprite_index["tile_height"],
+        "width": sprite_index["tile_width"],
+        "height": sprite_index["tile_height"]
+    }
+
+
+def build_sprite_vtt(sprite_url: str, sprite_index: Dict[str, Any], duration: float) -> str:
+    """
+    Build a WebVTT thumbnail track for a sprite sheet
+    Each cue points at its tile with a #xywh media fragment
+
+    Args:
+        sprite_url: URL of the sprite sheet image
+        sprite_index: Index returned by render_sprite_sheet
+        duration: Video duration in seconds
+
+    Returns:
+        WebVTT document
+    """
+    def timestamp(seconds: float) -> str:
+        millis = int(round(seconds * 1000))
+        hours, millis = divmod(millis, 3600000)
+        minutes, millis = divmod(millis, 60000)
+        secs, millis = divmod(millis, 1000)
+        return f"{hours:02d}:{minutes:02d}:{secs:02d}.{millis:03d}"
+
+    interval = sprite_index["interval"]
+    tile_width = sprite_index["tile_width"]
+    tile_height = sprite_index["tile_height"]
+    columns = sprite_index["columns"]
+
+    cues = ["WEBVTT", ""]
+    for i in range(sprite_index["count"]):
+        start = i * interval
+        end = min(duration, (i + 1) * interval)
+        x = (i % columns) * tile_width
+        y = (i // columns) * tile_height
+        cues.append(f"{timestamp(start)} --> {timestamp(end)}")
+        cues.append(f"{sprite_url}#xywh={x},{y},{tile_width},{tile_height}")
+        cues.append("")
+
+    return "\n".join(cues)
@@ -0,0 +1,5 @@
+#!/bin/sh
+# Primary: accept streaming replication from the postgres-replica service
+# (runs once, when the data volume is initialized)
+set -e
+echo "host replication all all scram-sha-256" >> "$PGDATA/pg_hba.conf"
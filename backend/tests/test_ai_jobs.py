@@ -0,0 +1,155 @@
+import time
+
+import pytest
+
+from app.core.config import settings
+from app.models.ai_job import AIJob, JobType, JobStatus
+from app.models.user import User
+from app.tasks.ai_tasks import run_ai_job
+from app.utils.ai_job_utils import (
+    acquire_model_slot,
+    hold_prediction_slot,
+    release_model_slot,
+    release_prediction_slot
+)
+
+pytestmark = pytest.mark.anyio
+
+MUSIC_MODEL = "suno-ai/bark"
+
+
+class Requeued(Exception):
+    pass
+
+
+@pytest.fixture
+def requeues(monkeypatch):
+    """Countdowns of run_ai_job.retry calls (raised as Requeued, not rerun)"""
+    countdowns = []
+
+    def retry(countdown=None, **kwargs):
+        countdowns.append(countdown)
+        raise Requeued()
+
+    monkeypatch.setattr(run_ai_job, "retry", retry)
+    return countdowns
+
+
+def test_slots_are_capped_and_released(redis, monkeypatch):
+    monkeypatch.setitem(settings.AI_MODEL_CONCURRENCY, MUSIC_MODEL, 2)
+    first, second = acquire_model_slot(MUSIC_MODEL), acquire_model_slot(MUSIC_MODEL)
+    assert first and second
+    assert acquire_model_slot(MUSIC_MODEL) is None
+
+    hold_prediction_slot(MUSIC_MODEL, first, "prediction-1")
+    release_model_slot(MUSIC_MODEL, second)
+    assert redis.zrange(f"ai:slots:{MUSIC_MODEL}", 0, -1) == ["prediction-1"]
+
+    # Shared predictions release their slot once
+    release_prediction_slot(MUSIC_MODEL, "prediction-1")
+    release_prediction_slot(MUSIC_MODEL, "prediction-1")
+    assert redis.zcard(f"ai:slots:{MUSIC_MODEL}") == 0
+
+
+def test_lapsed_slots_are_pruned_on_acquire(redis, monkeypatch):
+    monkeypatch.setitem(settings.AI_MODEL_CONCURRENCY, MUSIC_MODEL, 2)
+    # A worker died after reserving; a prediction was never finalized
+    redis.zadd(f"ai:slots:{MUSIC_MODEL}", {"claim:dead": time.time() - 1, "lost": time.time() - 1})
+
+    assert acquire_model_slot(MUSIC_MODEL)
+    assert acquire_model_slot(MUSIC_MODEL)
+    assert acquire_model_slot(MUSIC_MODEL) is None
+
+
+@pytest.fixture
+def pending_job(db, make_user):
+    def _pending_job(**input_data) -> AIJob:
+        job = AIJob(
+            user_id=make_user(credits=50).id,
+            job_type=JobType.MUSIC,
+            status=JobStatus.PENDING,
+            input_data={"prompt": "lofi", "duration": 30, **input_data},
+            credits_used=5
+        )
+        db.add(job)
+        db.commit()
+        return job
+    return _pending_job
+
+
+async def test_submit_enqueues_without_charging(client, db, make_user, auth_headers, fake_replicate):
+    user = make_user(credits=50)
+
+    response = await client.post("/ai/music", json={"prompt": "lofi", "duration": 30}, headers=auth_headers(user))
+
+    assert response.status_code == 200
+    # CELERY_TASK_ALWAYS_EAGER: the worker already submitted the prediction
+    assert response.json()["status"] == JobStatus.PROCESSING.value
+    assert fake_replicate.calls == [(MUSIC_MODEL, {"prompt": "lofi", "duration": 30})]
+    db.expire_all()
+    assert db.get(User, user.id).credits == 50  # Charged on success only
+
+
+async def test_submit_rejects_insufficient_credits(client, make_user, auth_headers, fake_replicate):
+    response = await client.post("/ai/music", json={"prompt": "lofi"}, headers=auth_headers(make_user(credits=1)))
+
+    assert response.status_code == 402
+    assert fake_replicate.calls == []
+
+
+async def test_submit_fails_job_when_queue_is_down(client, db, make_user, auth_headers, monkeypatch):
+    def delay(job_id):
+        raise ConnectionError("broker unavailable")
+
+    monkeypatch.setattr(run_ai_job, "delay", delay)
+
+    response = await client.post("/ai/music", json={"prompt": "lofi"}, headers=auth_headers(make_user()))
+
+    assert response.status_code == 503
+    assert db.query(AIJob.status).scalar() == JobStatus.FAILED
+
+
+def test_task_submits_prediction_and_holds_slot(db, redis, pending_job, fake_replicate):
+    job = pending_job()
+
+    assert run_ai_job(str(job.id)) == JobStatus.PROCESSING.value
+
+    db.expire_all()
+    job = db.get(AIJob, job.id)
+    assert job.replicate_id == fake_replicate.store.list()[0][0]["id"]
+    assert redis.zrange(f"ai:slots:{MUSIC_MODEL}", 0, -1) == [job.replicate_id]
+
+
+def test_task_skips_jobs_already_handled(db, pending_job, fake_replicate):
+    job = pending_job()
+    job.status = JobStatus.PROCESSING
+    db.commit()
+
+    assert run_ai_job(str(job.id)) == "skipped"
+    assert fake_replicate.calls == []
+
+
+def test_task_requeues_at_model_capacity(db, redis, pending_job, fake_replicate, requeues):
+    job = pending_job()
+    redis.zadd(f"ai:slots:{MUSIC_MODEL}", {f"running-{i}": time.time() + 600 for i in range(8)})
+
+    with pytest.raises(Requeued):
+        run_ai_job(str(job.id))
+
+    assert requeues == [settings.AI_MODEL_SLOT_RETRY_SECONDS]
+    assert fake_replicate.calls == []
+    assert redis.zcard(f"ai:slots:{MUSIC_MODEL}") == 8
+
+
+def test_task_fails_job_and_releases_slot_on_submit_error(db, redis, pending_job, fake_replicate):
+    def create(**kwargs):
+        raise RuntimeError("replicate is down")
+
+    fake_replicate.models.predictions.create = create
+    job = pending_job()
+
+    assert run_ai_job(str(job.id)) == JobStatus.FAILED.value
+
+    db.expire_all()
+    assert db.get(AIJob, job.id).error_message == "replicate is down"
+    assert redis.zcard(f"ai:slots:{MUSIC_MODEL}") == 0
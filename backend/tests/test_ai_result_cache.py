@@ -0,0 +1,114 @@
+import pytest
+
+from app.core.config import settings
+from app.models.ai_job import AIJob, JobType, JobStatus
+from app.services.ai_result_cache import get_ai_result_cache, INFLIGHT_SUBMITTING
+from app.tasks.ai_tasks import poll_ai_predictions, run_ai_job
+
+ANIMATE_MODEL = "wan-video/wan-2.2-animate-animation"
+# Replicate deletes prediction outputs (and their URLs) after an hour
+REPLICATE_OUTPUT_URL_TTL_SECONDS = 3600
+
+
+class Requeued(Exception):
+    pass
+
+
+@pytest.fixture
+def glitch_job(db, make_user, make_video):
+    template = make_video()
+
+    def _glitch_job(prompt: str = "make it pop") -> AIJob:
+        job = AIJob(
+            user_id=make_user(credits=100).id,
+            job_type=JobType.GLITCH_ANIMATE,
+            status=JobStatus.PENDING,
+            input_data={
+                "template_video_id": str(template.id),
+                "template_video_url": template.video_url,
+                "user_image_url": "https://cdn.example/me.jpg",
+                "prompt": prompt
+            },
+            credits_used=30
+        )
+        db.add(job)
+        db.commit()
+        return job
+    return _glitch_job
+
+
+def cache_key(job: AIJob) -> str:
+    return get_ai_result_cache().key(job.job_type.value, job.input_data)
+
+
+def test_key_ignores_trivial_input_differences():
+    cache = get_ai_result_cache()
+    base = {"template_video_url": "https://cdn.example/t.mp4", "user_image_url": "https://cdn.example/me.jpg"}
+
+    assert cache.key("glitch_animate", {**base, "prompt": "  make it\n pop "}) == \
+        cache.key("glitch_animate", {**base, "prompt": "make it pop"})
+    assert cache.key("glitch_animate", {**base, "prompt": None}) == cache.key("glitch_animate", base)
+    assert cache.key("glitch_animate", {**base, "prompt": "other"}) != cache.key("glitch_animate", base)
+    assert cache.key("music", {"prompt": "lofi", "duration": 30}) is None  # Not a cached job type
+
+
+def test_results_expire_before_replicate_urls(redis):
+    get_ai_result_cache().store_result("k", "https://replicate.delivery/out.mp4")
+
+    assert 0 < redis.ttl("ai:result:k") <= settings.AI_RESULT_CACHE_TTL_SECONDS
+    # A cache hit near expiry still hands out a URL with time left to play it
+    assert settings.AI_RESULT_CACHE_TTL_SECONDS <= REPLICATE_OUTPUT_URL_TTL_SECONDS / 2
+
+
+def test_cached_result_completes_without_replicate(db, glitch_job, fake_replicate):
+    job = glitch_job()
+    get_ai_result_cache().store_result(cache_key(job), "https://replicate.delivery/cached.mp4")
+
+    assert run_ai_job(str(job.id)) == JobStatus.COMPLETED.value
+
+    db.expire_all()
+    assert db.get(AIJob, job.id).output_url == "https://replicate.delivery/cached.mp4"
+    assert fake_replicate.calls == []
+
+
+def test_identical_requests_share_one_prediction(db, redis, glitch_job, fake_replicate, settle):
+    first, second = glitch_job(), glitch_job(prompt=" make it  pop")
+
+    run_ai_job(str(first.id))
+    run_ai_job(str(second.id))
+
+    db.expire_all()
+    first, second = db.get(AIJob, first.id), db.get(AIJob, second.id)
+    assert len(fake_replicate.calls) == 1
+    assert second.status == JobStatus.PROCESSING
+    assert second.replicate_id == first.replicate_id
+    assert redis.zcard(f"ai:slots:{ANIMATE_MODEL}") == 1
+
+    # Both finish with the one result, which is then cached for later requests
+    prediction = settle(first.replicate_id)
+    assert poll_ai_predictions() == 1
+
+    db.expire_all()
+    assert {db.get(AIJob, job.id).output_url for job in (first, second)} == {prediction["output"]}
+    assert redis.zcard(f"ai:slots:{ANIMATE_MODEL}") == 0
+    assert get_ai_result_cache().get_inflight(cache_key(first)) is None
+    assert get_ai_result_cache().get_result(cache_key(first)) == prediction["output"]
+
+
+def test_request_waits_while_identical_one_is_submitting(db, glitch_job, fake_replicate, monkeypatch):
+    countdowns = []
+
+    def retry(countdown=None, **kwargs):
+        countdowns.append(countdown)
+        raise Requeued()
+
+    monkeypatch.setattr(run_ai_job, "retry", retry)
+    job = glitch_job()
+    get_ai_result_cache().claim_inflight(cache_key(job))
+    assert get_ai_result_cache().get_inflight(cache_key(job)) == INFLIGHT_SUBMITTING
+
+    with pytest.raises(Requeued):
+        run_ai_job(str(job.id))
+
+    assert countdowns == [1]
+    assert fake_replicate.calls == []
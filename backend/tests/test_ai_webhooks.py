@@ -0,0 +1,128 @@
+import base64
+import json
+import time
+
+import pytest
+
+from app.core.config import settings
+from app.models.ai_job import AIJob, JobType, JobStatus
+from app.models.user import User
+from app.services.fake_replicate_server import sign_webhook
+from app.services.replicate_service import get_replicate_service
+from app.tasks.ai_tasks import poll_ai_predictions
+
+pytestmark = pytest.mark.anyio
+
+WEBHOOK_URL = "/ai/webhooks/replicate"
+SECRET = "whsec_" + base64.b64encode(b"test-webhook-secret").decode()
+
+
+@pytest.fixture
+def webhook_secret(monkeypatch):
+    monkeypatch.setattr(settings, "REPLICATE_WEBHOOK_SECRET", SECRET)
+    return SECRET
+
+
+@pytest.fixture
+def processing_job(db, make_user, fake_replicate):
+    """A music job whose (fake) prediction is still running"""
+    user = make_user(credits=50)
+    prediction = fake_replicate.store.create("suno-ai/bark", {"prompt": "lofi", "duration": 30})
+    job = AIJob(
+        user_id=user.id,
+        job_type=JobType.MUSIC,
+        status=JobStatus.PROCESSING,
+        input_data={"prompt": "lofi", "duration": 30},
+        credits_used=5,
+        replicate_id=prediction["id"]
+    )
+    db.add(job)
+    db.commit()
+    return job
+
+
+def signed(body: bytes, secret: str = SECRET, timestamp: int = None) -> dict:
+    webhook_id = "msg_test"
+    timestamp = str(timestamp or int(time.time()))
+    return {
+        "Content-Type": "application/json",
+        "webhook-id": webhook_id,
+        "webhook-timestamp": timestamp,
+        "webhook-signature": sign_webhook(secret, webhook_id, timestamp, body),
+    }
+
+
+def forged_payload(prediction_id: str = "abc") -> bytes:
+    return json.dumps({"id": prediction_id, "status": "succeeded", "output": "https://evil.example/x.mp4"}).encode()
+
+
+def test_verify_webhook_fails_closed_without_secret():
+    body = forged_payload()
+    assert not get_replicate_service().verify_webhook(signed(body), body)
+
+
+async def test_missing_signature_is_rejected(client, webhook_secret):
+    response = await client.post(WEBHOOK_URL, content=forged_payload())
+    assert response.status_code == 401
+
+
+async def test_bad_signature_is_rejected(client, webhook_secret):
+    body = forged_payload()
+    other_secret = "whsec_" + base64.b64encode(b"someone-else").decode()
+    response = await client.post(WEBHOOK_URL, content=body, headers=signed(body, secret=other_secret))
+    assert response.status_code == 401
+
+
+async def test_replayed_signature_is_rejected(client, webhook_secret):
+    body = forged_payload()
+    response = await client.post(WEBHOOK_URL, content=body, headers=signed(body, timestamp=int(time.time()) - 3600))
+    assert response.status_code == 401
+
+
+async def test_signed_webhook_finalizes_job(client, db, webhook_secret, processing_job, settle):
+    prediction = settle(processing_job.replicate_id)
+    body = json.dumps(prediction).encode()
+
+    response = await client.post(WEBHOOK_URL, content=body, headers=signed(body))
+
+    assert response.json() == {"finalized": True}
+    db.expire_all()
+    job = db.get(AIJob, processing_job.id)
+    assert job.status == JobStatus.COMPLETED
+    assert job.output_url == prediction["output"]
+    assert db.get(User, job.user_id).credits == 45  # Charged on success only
+
+
+async def test_unsigned_webhook_uses_replicate_result(client, db, processing_job, settle):
+    # Still running at Replicate: a forged "succeeded" payload changes nothing
+    response = await client.post(WEBHOOK_URL, content=forged_payload(processing_job.replicate_id))
+    assert response.json() == {"finalized": False}
+    db.expire_all()
+    assert db.get(AIJob, processing_job.id).status == JobStatus.PROCESSING
+
+    # Once it finishes, the output comes from Replicate, not the payload
+    prediction = settle(processing_job.replicate_id)
+    response = await client.post(WEBHOOK_URL, content=forged_payload(processing_job.replicate_id))
+    assert response.json() == {"finalized": True}
+    db.expire_all()
+    assert db.get(AIJob, processing_job.id).output_url == prediction["output"]
+
+
+async def test_unsigned_webhook_for_unknown_prediction_is_ignored(client, db, fake_replicate):
+    fake_replicate.predictions.get = lambda id: pytest.fail("Fetched a prediction no job is waiting for")
+
+    response = await client.post(WEBHOOK_URL, content=forged_payload("not-ours"))
+    assert response.json() == {"finalized": False}
+
+
+def test_poller_finalizes_finished_predictions(db, processing_job, settle):
+    assert poll_ai_predictions() == 0  # Still running
+
+    prediction = settle(processing_job.replicate_id)
+    assert poll_ai_predictions() == 1
+
+    db.expire_all()
+    job = db.get(AIJob, processing_job.id)
+    assert job.status == JobStatus.COMPLETED
+    assert job.output_url == prediction["output"]
+    assert poll_ai_predictions() == 0  # Nothing left in flight
@@ -0,0 +1,37 @@
+import pytest
+
+from app.models.video import Video
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_comment_total_and_counter(client, db, make_user, make_video, auth_headers):
+    video = make_video()
+    headers = auth_headers(make_user())
+
+    created = [
+        (await client.post(f"/comments/videos/{video.id}", json={"content": f"#{i}"}, headers=headers)).json()
+        for i in range(3)
+    ]
+    await client.delete(f"/comments/{created[0]['id']}", headers=headers)
+
+    response = await client.get(f"/comments/videos/{video.id}", params={"page_size": 2})
+    body = response.json()
+    assert (body["total"], body["total_is_estimate"]) == (2, False)
+    assert len(body["comments"]) == 2
+
+    db.expire_all()
+    assert db.get(Video, video.id).comment_count == 2
+
+
+async def test_counter_never_goes_negative(client, db, make_user, make_video, auth_headers):
+    video = make_video()
+    headers = auth_headers(make_user())
+    comment = (await client.post(f"/comments/videos/{video.id}", json={"content": "hi"}, headers=headers)).json()
+    db.query(Video).filter(Video.id == video.id).update({Video.comment_count: 0})
+    db.commit()
+
+    await client.delete(f"/comments/{comment['id']}", headers=headers)
+
+    db.expire_all()
+    assert db.get(Video, video.id).comment_count == 0
@@ -0,0 +1,41 @@
+import uuid
+import pytest
+from sqlalchemy.dialects.postgresql import asyncpg
+
+from app.db.session import AsyncSessionLocal
+from app.models.notification import Notification
+from app.utils.count_utils import Explain, count_total, estimate_count
+
+pytestmark = pytest.mark.anyio
+
+
+def test_explain_binds_positionally_for_asyncpg():
+    statement = Explain(
+        Notification.__table__.select().where(Notification.user_id == uuid.uuid4())
+    )
+    compiled = statement.compile(dialect=asyncpg.dialect())
+
+    assert str(compiled).startswith("EXPLAIN (FORMAT JSON) SELECT")
+    assert "$1" in str(compiled)
+    assert compiled.positiontup == ["user_id_1"]
+
+
+async def test_estimate_under_async_session(db, make_user):
+    user = make_user()
+    db.add_all([
+        Notification(user_id=user.id, type="like", actor_id=user.id)
+        for _ in range(3)
+    ])
+    db.commit()
+
+    async with AsyncSessionLocal() as session:
+        estimate = await session.run_sync(lambda s: estimate_count(
+            s, s.query(Notification).filter(Notification.user_id == user.id)
+        ))
+        # A cursor page (returned=None) always goes through the estimate
+        total, is_estimate = await session.run_sync(lambda s: count_total(
+            s, s.query(Notification).filter(Notification.user_id == user.id), returned=None, limit=2
+        ))
+
+    assert estimate >= 0
+    assert (total, is_estimate) == (3, False)
@@ -0,0 +1,20 @@
+import uuid
+
+from app.services.feed_pool_service import get_feed_pool_service
+
+
+def test_ranking_pages_are_stable_until_expiry(redis):
+    service = get_feed_pool_service()
+    user_id = uuid.uuid4()
+    ranked = [uuid.uuid4() for _ in range(5)]
+
+    token = service.save_ranking(user_id, ranked)
+
+    assert service.get_ranking_page(user_id, token, 0, 2) == ranked[:2]
+    assert service.get_ranking_page(user_id, token, 2, 3) == ranked[2:]
+    assert service.get_ranking_page(user_id, token, 5, 3) == []
+
+    # Another viewer cannot read it; an expired ranking is reported as gone
+    assert service.get_ranking_page(uuid.uuid4(), token, 0, 2) is None
+    redis.flushall()
+    assert service.get_ranking_page(user_id, token, 0, 2) is None
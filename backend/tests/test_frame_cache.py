@@ -0,0 +1,43 @@
+import threading
+import uuid
+
+import pytest
+
+from app.services import frame_cache_service
+from app.services.frame_cache_service import FrameCacheService
+
+pytestmark = pytest.mark.anyio
+
+
+class RecordingS3:
+    """Object store stand-in that records which thread made each call"""
+
+    def __init__(self):
+        self.threads = {}
+
+    def object_exists(self, key):
+        self.threads["object_exists"] = threading.current_thread()
+        return False
+
+    def generate_presigned_download_url(self, key):
+        return f"https://s3.example/{key}"
+
+    def upload_bytes(self, data, key, content_type):
+        self.threads["upload_bytes"] = threading.current_thread()
+        return f"https://s3.example/{key}"
+
+
+async def test_object_store_calls_run_off_the_event_loop(monkeypatch):
+    s3 = RecordingS3()
+    monkeypatch.setattr(frame_cache_service, "get_mock_s3_service", lambda: s3)
+
+    async def extract(video_url, timestamp):
+        return b"jpeg"
+
+    monkeypatch.setattr(frame_cache_service, "extract_frame_bytes", extract)
+
+    url = await FrameCacheService().get_frame_url(uuid.uuid4(), "videos/v.mp4", 1.0)
+
+    assert url.startswith("https://s3.example/")
+    assert set(s3.threads) == {"object_exists", "upload_bytes"}
+    assert threading.main_thread() not in s3.threads.values()
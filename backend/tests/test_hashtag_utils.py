@@ -0,0 +1,27 @@
+import pytest
+from sqlalchemy.exc import OperationalError
+
+from app.services.trending_service import get_trending_service
+from app.utils.hashtag_utils import update_video_hashtags
+
+
+def test_trending_uses_recorded_after_commit(db, make_video):
+    video = make_video()
+
+    update_video_hashtags(db, video, "new #dance clip")
+
+    assert get_trending_service().current_scores(["dance"])["dance"] > 0
+
+
+def test_failed_edit_leaves_trending_untouched(db, make_video, monkeypatch):
+    video = make_video()
+
+    def commit():
+        raise OperationalError("COMMIT", {}, Exception("connection lost"))
+
+    monkeypatch.setattr(db, "commit", commit)
+    with pytest.raises(OperationalError):
+        update_video_hashtags(db, video, "new #dance clip")
+    db.rollback()
+
+    assert get_trending_service().current_scores(["dance"])["dance"] == 0
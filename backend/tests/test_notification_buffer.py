@@ -0,0 +1,22 @@
+from app.core.config import settings
+from app.models.notification import Notification
+from app.services.notification_buffer_service import get_notification_buffer_service
+
+
+def test_returning_actors_are_counted_once(db, make_user, make_video, monkeypatch):
+    monkeypatch.setattr(settings, "NOTIFICATION_COALESCE_SECONDS", 0)
+    buffer = get_notification_buffer_service()
+    video = make_video()
+    first, second = make_user(), make_user()
+
+    buffer.add(video.user_id, "like", first.id, video.id)
+    assert buffer.flush(db) == 1
+
+    # Same unread notification: first liked again (unlike/like), second is new
+    buffer.add(video.user_id, "like", first.id, video.id)
+    buffer.add(video.user_id, "like", second.id, video.id)
+    assert buffer.flush(db) == 1
+
+    notification = db.query(Notification).one()
+    assert notification.actor_count == 2
+    assert set(notification.sample_actor_ids) == {first.id, second.id}
@@ -0,0 +1,37 @@
+import uuid
+
+from app.models.notification import Notification
+from app.services.notification_counter_service import get_notification_counter_service
+
+
+def test_increment_decrement_and_reset(redis):
+    counters = get_notification_counter_service()
+    user_id, other_id = uuid.uuid4(), uuid.uuid4()
+    counters.reset(user_id)
+
+    counters.incr([user_id, other_id], 3)
+    counters.decr(user_id)
+    assert redis.get(f"notif:unread:{user_id}") == "2"
+    assert redis.get(f"notif:unread:{other_id}") is None  # Not cached: rebuilt on read instead
+
+    counters.decr(user_id, 5)
+    assert redis.get(f"notif:unread:{user_id}") == "0"  # Clamped
+
+    counters.incr([user_id])
+    counters.reset(user_id)
+    assert redis.get(f"notif:unread:{user_id}") == "0"
+    assert redis.ttl(f"notif:unread:{user_id}") > 0
+
+
+def test_missing_counter_is_rebuilt_from_the_database(db, make_user, redis):
+    counters = get_notification_counter_service()
+    user, actor = make_user(), make_user()
+    db.add_all([
+        Notification(user_id=user.id, type="like", actor_id=actor.id),
+        Notification(user_id=user.id, type="like", actor_id=actor.id, is_read=True)
+    ])
+    db.commit()
+
+    assert counters.get_unread(db, user.id) == 1
+    counters.incr([user.id])
+    assert counters.get_unread(db, user.id) == 2
@@ -0,0 +1,60 @@
+import uuid
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.notification import Notification
+from app.services.notification_counter_service import get_notification_counter_service
+from app.utils.notification_utils import create_notification
+
+
+def buffered_actors(redis, user_id, target_id):
+    return redis.zrange(f"notif:buffer:{user_id}:like:{target_id}", 0, -1)
+
+
+def test_coalesced_notification_is_buffered_on_commit(redis):
+    user_id, actor_id, video_id = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+    db = Session()
+    db.begin()
+
+    assert create_notification(db, user_id, "like", actor_id, video_id) is None
+    assert buffered_actors(redis, user_id, video_id) == []  # Not before the action commits
+
+    db.commit()
+    assert buffered_actors(redis, user_id, video_id) == [str(actor_id)]
+
+
+def test_rolled_back_action_notifies_nobody(redis):
+    user_id, video_id = uuid.uuid4(), uuid.uuid4()
+    db = Session()
+    db.begin()
+
+    create_notification(db, user_id, "like", uuid.uuid4(), video_id)
+    db.rollback()
+    db.commit()
+
+    assert buffered_actors(redis, user_id, video_id) == []
+
+
+def test_own_actions_are_not_notified(redis):
+    user_id, video_id = uuid.uuid4(), uuid.uuid4()
+    db = Session()
+    db.begin()
+
+    assert create_notification(db, user_id, "like", user_id, video_id) is None
+    db.commit()
+
+    assert buffered_actors(redis, user_id, video_id) == []
+
+
+def test_uncoalesced_notification_is_written_with_the_action(db, make_user, monkeypatch):
+    monkeypatch.setattr(settings, "NOTIFICATION_COALESCE_TYPES", [])
+    user, actor = make_user(), make_user()
+    counters = get_notification_counter_service()
+    assert counters.get_unread(db, user.id) == 0
+
+    notification = create_notification(db, user.id, "follow", actor.id)
+    db.commit()
+
+    assert db.query(Notification).one().id == notification.id
+    assert counters.get_unread(db, user.id) == 1
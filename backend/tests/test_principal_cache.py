@@ -0,0 +1,60 @@
+import json
+import uuid
+
+import pytest
+
+from app.services.principal_cache_service import PrincipalCacheService, get_principal_cache_service
+from app.utils.ai_job_utils import deduct_credits
+
+pytestmark = pytest.mark.anyio
+
+
+def test_hits_do_not_touch_the_database(redis):
+    cache = PrincipalCacheService()
+    user_id = uuid.uuid4()
+    redis.set(f"auth:principal:{user_id}", json.dumps({
+        "id": str(user_id), "username": "ana", "is_active": True, "credits": 7
+    }))
+
+    principal = cache.get(None, user_id)  # No session: a DB read would fail
+    redis.delete(f"auth:principal:{user_id}")
+
+    assert (principal.id, principal.credits) == (user_id, 7)
+    assert cache.get(None, user_id) == principal  # In-process tier
+
+
+def test_invalidate_drops_both_tiers(redis):
+    cache = PrincipalCacheService()
+    user_id = uuid.uuid4()
+    redis.set(f"auth:principal:{user_id}", json.dumps({
+        "id": str(user_id), "username": "ana", "is_active": True, "credits": 7
+    }))
+    cache.get(None, user_id)
+
+    cache.invalidate(user_id)
+
+    assert not redis.exists(f"auth:principal:{user_id}")
+    assert cache._get_local(user_id) is None
+
+
+def test_balance_change_invalidates_the_principal(db, make_user):
+    cache = get_principal_cache_service()
+    user = make_user(credits=50)
+    assert cache.get(db, user.id).credits == 50
+
+    assert deduct_credits(db, user.id, 20)
+    db.commit()
+
+    assert cache.get(db, user.id).credits == 30
+
+
+async def test_credit_check_sees_the_new_balance(client, db, make_user, auth_headers, fake_replicate):
+    user = make_user(credits=10)
+    headers = auth_headers(user)
+    assert (await client.post("/ai/music", json={"prompt": "lofi"}, headers=headers)).status_code == 200
+
+    deduct_credits(db, user.id, 8)
+    db.commit()
+
+    response = await client.post("/ai/music", json={"prompt": "lofi"}, headers=headers)
+    assert response.status_code == 402
@@ -0,0 +1,147 @@
+from typing import Optional
+
+import httpx
+import pytest
+from fastapi import Depends, FastAPI, Header
+
+from app.models.social import VideoGlitch
+from app.services.response_cache_service import cache_response, get_response_cache_service
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def cached_app():
+    """A bare app with cached routes, counting how often each one renders"""
+    app = FastAPI()
+    app.state.renders = []
+
+    def viewer(x_viewer: Optional[str] = Header(None)):
+        return type("Viewer", (), {"id": x_viewer})() if x_viewer else None
+
+    @app.get("/items/{item_id}")
+    @cache_response(tags=lambda item: [f"item:{item['id']}"])
+    def get_item(item_id: int):
+        app.state.renders.append(item_id)
+        return {"id": item_id}
+
+    @app.get("/me")
+    @cache_response(vary_on_user=True)
+    def get_me(current_user=Depends(viewer)):
+        app.state.renders.append(current_user.id)
+        return {"viewer": current_user.id}
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as c:
+        yield c, app.state.renders
+
+
+async def test_second_request_is_served_from_cache(cached_app):
+    client, renders = cached_app
+
+    first = await client.get("/items/1")
+    second = await client.get("/items/1")
+    other = await client.get("/items/1", params={"page": 2})
+
+    assert first.json() == second.json() == {"id": 1}
+    assert second.headers["etag"] == first.headers["etag"]
+    assert second.headers["cache-control"] == "no-cache"
+    assert renders == [1, 1]  # The query string is part of the key
+    assert other.status_code == 200
+
+
+async def test_matching_etag_returns_304(cached_app):
+    client, _ = cached_app
+    etag = (await client.get("/items/1")).headers["etag"]
+
+    unchanged = await client.get("/items/1", headers={"If-None-Match": f'W/{etag}, "other"'})
+    stale = await client.get("/items/1", headers={"If-None-Match": '"other"'})
+
+    assert unchanged.status_code == 304
+    assert unchanged.content == b""
+    assert unchanged.headers["etag"] == etag
+    assert stale.status_code == 200
+
+
+async def test_invalidation_drops_tagged_responses(cached_app):
+    client, renders = cached_app
+    await client.get("/items/1")
+    await client.get("/items/2")
+
+    get_response_cache_service().invalidate("item:1")
+    await client.get("/items/1")
+    await client.get("/items/2")
+
+    assert renders == [1, 2, 1]
+
+
+async def test_vary_on_user_caches_per_viewer(cached_app):
+    client, renders = cached_app
+
+    alice = await client.get("/me", headers={"X-Viewer": "alice"})
+    bob = await client.get("/me", headers={"X-Viewer": "bob"})
+    again = await client.get("/me", headers={"X-Viewer": "alice"})
+
+    assert (alice.json(), bob.json(), again.json()) == ({"viewer": "alice"}, {"viewer": "bob"}, {"viewer": "alice"})
+    assert renders == ["alice", "bob"]
+    assert alice.headers["cache-control"] == "private, no-cache"
+
+
+async def test_update_video_invalidates(client, make_user, make_video, auth_headers):
+    owner = make_user()
+    video = make_video(owner, caption="old")
+    assert (await client.get(f"/videos/{video.id}")).json()["caption"] == "old"
+
+    await client.patch(f"/videos/{video.id}", json={"caption": "new"}, headers=auth_headers(owner))
+
+    assert (await client.get(f"/videos/{video.id}")).json()["caption"] == "new"
+
+
+async def test_delete_video_invalidates(client, redis, make_user, make_video, auth_headers):
+    owner = make_user()
+    video = make_video(owner)
+    await client.get(f"/videos/{video.id}")
+    await client.get(f"/users/{owner.id}")
+    assert redis.keys("resp:*")
+
+    await client.delete(f"/videos/{video.id}", headers=auth_headers(owner))
+
+    assert redis.keys("resp:*") == []
+
+
+async def test_update_me_invalidates_profile_and_videos(client, make_user, make_video, auth_headers):
+    user = make_user(display_name="Old")
+    video = make_video(user)
+    await client.get(f"/users/{user.id}")
+    await client.get(f"/videos/{video.id}")
+
+    await client.patch("/auth/me", json={"display_name": "New"}, headers=auth_headers(user))
+
+    assert (await client.get(f"/users/{user.id}")).json()["display_name"] == "New"
+    assert (await client.get(f"/videos/{video.id}")).json()["user"]["display_name"] == "New"
+
+
+async def test_follow_invalidates_both_profiles(client, make_user, auth_headers):
+    follower, followed = make_user(), make_user()
+    await client.get(f"/users/{follower.id}")
+    await client.get(f"/users/{followed.id}")
+
+    await client.post(f"/follows/users/{followed.id}", headers=auth_headers(follower))
+
+    assert (await client.get(f"/users/{followed.id}")).json()["follower_count"] == 1
+    assert (await client.get(f"/users/{follower.id}")).json()["following_count"] == 1
+
+
+async def test_glitch_source_is_cached_per_viewer(client, db, make_user, make_video, auth_headers):
+    owner = make_user()
+    original = make_video(owner)
+    glitch = make_video(owner, status="private")
+    db.add(VideoGlitch(original_video_id=original.id, glitch_video_id=glitch.id, glitch_type="animate"))
+    db.commit()
+    url = f"/glitch/videos/{glitch.id}/source"
+
+    mine = await client.get(url, headers=auth_headers(owner))
+    theirs = await client.get(url, headers=auth_headers(make_user()))
+
+    assert mine.status_code == 200
+    assert mine.json()["original_video_id"] == str(original.id)
+    assert theirs.status_code == 403  # Not the owner's cached response
@@ -0,0 +1,21 @@
+import inspect
+
+from fastapi.routing import APIRoute
+
+from app.db.session import get_db, get_read_db
+from app.main import app
+
+
+def test_async_routes_do_not_use_the_sync_session():
+    """
+    Sync sessions block the event loop; async routes use get_async_db
+    (sync dependencies such as get_current_principal run in the threadpool)
+    """
+    offenders = [
+        route.path
+        for route in app.routes
+        if isinstance(route, APIRoute)
+        and inspect.iscoroutinefunction(route.endpoint)
+        and {get_db, get_read_db} & {dependency.call for dependency in route.dependant.dependencies}
+    ]
+    assert offenders == []
@@ -0,0 +1,44 @@
+import asyncio
+import threading
+
+import pytest
+from passlib.context import CryptContext
+
+from app.core.config import settings
+from app.core.security import PasswordHasher, PasswordHasherBusy
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_hash_and_verify():
+    hasher = PasswordHasher(workers=1, max_pending=2)
+    hashed = await hasher.hash("correct horse")
+
+    assert await hasher.verify_and_update("correct horse", hashed) == (True, None)
+    assert await hasher.verify_and_update("wrong", hashed) == (False, None)
+
+
+async def test_hash_with_another_cost_is_upgraded():
+    hasher = PasswordHasher(workers=1, max_pending=2)
+    legacy = CryptContext(schemes=["bcrypt"], bcrypt__rounds=4).hash("correct horse")
+
+    valid, new_hash = await hasher.verify_and_update("correct horse", legacy)
+
+    assert valid
+    assert new_hash.startswith(f"$2b${settings.BCRYPT_ROUNDS:02d}$")
+    assert await hasher.verify_and_update("correct horse", new_hash) == (True, None)
+
+
+async def test_requests_beyond_the_queue_limit_are_rejected():
+    hasher = PasswordHasher(workers=1, max_pending=2)
+    release = threading.Event()
+    blocked = [asyncio.ensure_future(hasher._submit(release.wait)) for _ in range(2)]
+    await asyncio.sleep(0.05)
+
+    with pytest.raises(PasswordHasherBusy):
+        await hasher.hash("one too many")
+    assert hasher.stats() == {"workers": 1, "running": 1, "queued": 1, "max_pending": 2, "rejected": 1}
+
+    release.set()
+    await asyncio.gather(*blocked)
+    assert hasher.stats()["queued"] == hasher.stats()["running"] == 0
@@ -0,0 +1,65 @@
+import pytest
+from sqlalchemy import Column, Integer, String, create_engine, select, update
+from sqlalchemy.orm import declarative_base, sessionmaker
+
+from app.db.session import RoutingSession, get_read_db
+
+Base = declarative_base()
+
+
+class Item(Base):
+    __tablename__ = "items"
+    id = Column(Integer, primary_key=True)
+    name = Column(String)
+
+
+@pytest.fixture
+def engines():
+    """Two separate SQLite databases standing in for the primary and the replica"""
+    primary, replica = create_engine("sqlite://"), create_engine("sqlite://")
+    for engine in (primary, replica):
+        Base.metadata.create_all(engine)
+    return primary, replica
+
+
+def names(engine):
+    with engine.connect() as connection:
+        return connection.scalars(select(Item.name)).all()
+
+
+def test_read_only_session_reads_from_the_replica(engines):
+    primary, replica = engines
+    with replica.begin() as connection:
+        connection.execute(Item.__table__.insert().values(name="replicated"))
+    session = sessionmaker(class_=RoutingSession, primary=primary, replica=replica)(info={"read_only": True})
+
+    assert session.scalars(select(Item.name)).all() == ["replicated"]
+
+
+def test_read_only_session_writes_to_the_primary(engines):
+    primary, replica = engines
+    session = sessionmaker(class_=RoutingSession, primary=primary, replica=replica)(info={"read_only": True})
+
+    session.add(Item(id=1, name="flushed"))
+    session.flush()
+    session.execute(update(Item).where(Item.id == 1).values(name="updated"))
+    session.commit()
+
+    assert names(primary) == ["updated"]
+    assert names(replica) == []
+
+
+def test_default_session_uses_the_primary(engines):
+    primary, replica = engines
+    session = sessionmaker(class_=RoutingSession, primary=primary, replica=replica)()
+
+    assert session.get_bind(clause=select(Item)) is primary
+
+
+def test_get_read_db_opens_a_read_only_session():
+    dependency = get_read_db()
+    session = next(dependency)
+
+    assert isinstance(session, RoutingSession)
+    assert session.info["read_only"]
+    dependency.close()
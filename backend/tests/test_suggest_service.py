@@ -0,0 +1,37 @@
+from app.services.suggest_service import MAX_SUGGESTIONS, PrefixIndex, SuggestService
+
+
+def hashtag_index(*entries):
+    return PrefixIndex([(name, score, {"name": name}) for name, score in entries])
+
+
+def names(results):
+    return [result["name"] for result in results]
+
+
+def test_search_ranks_matches_by_score():
+    index = hashtag_index(("dance", 5), ("dancer", 50), ("dab", 20), ("cat", 100), ("danceoff", 5))
+
+    # Precomputed short prefix and bisected long prefix rank the same way
+    assert names(index.search("da", 10)) == ["dancer", "dab", "dance", "danceoff"]
+    assert names(index.search("dan", 10)) == ["dancer", "dance", "danceoff"]  # Ties: alphabetical
+    assert names(index.search("dog", 10)) == []
+
+
+def test_search_applies_the_limit():
+    index = hashtag_index(*[(f"tag{i:02d}", i) for i in range(30)])
+
+    assert names(index.search("t", 3)) == ["tag29", "tag28", "tag27"]
+    assert names(index.search("tag", 3)) == ["tag29", "tag28", "tag27"]
+    assert len(index.search("t", 100)) == MAX_SUGGESTIONS  # Precomputed lists stop here
+
+
+def test_suggest_routes_sigils_to_one_index():
+    service = SuggestService()
+    service.hashtags = hashtag_index(("dance", 5))
+    service.users = PrefixIndex([("dana", 3, {"username": "Dana"})])
+
+    assert service.suggest("Da") == {"users": [{"username": "Dana"}], "hashtags": [{"name": "dance"}]}
+    assert service.suggest("#da") == {"users": [], "hashtags": [{"name": "dance"}]}
+    assert service.suggest("@da") == {"users": [{"username": "Dana"}], "hashtags": []}
+    assert service.suggest("#") == {"users": [], "hashtags": []}
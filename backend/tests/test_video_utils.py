@@ -0,0 +1,48 @@
+import subprocess
+import pytest
+
+from app.core.config import settings
+from app.utils import video_utils
+from app.utils.video_utils import sprite_tile
+
+SPRITE_INDEX = {
+    "interval": 2.0,
+    "count": 7,
+    "columns": 3,
+    "rows": 3,
+    "tile_width": 160,
+    "tile_height": 90
+}
+
+
+def test_sprite_tile_positions():
+    assert sprite_tile(SPRITE_INDEX, 0) == {"x": 0, "y": 0, "width": 160, "height": 90}
+    assert sprite_tile(SPRITE_INDEX, 5.9) == {"x": 320, "y": 0, "width": 160, "height": 90}
+    assert sprite_tile(SPRITE_INDEX, 6) == {"x": 0, "y": 90, "width": 160, "height": 90}
+
+
+def test_sprite_tile_clamps_past_the_last_tile():
+    assert sprite_tile(SPRITE_INDEX, 1000) == {"x": 0, "y": 180, "width": 160, "height": 90}
+
+
+@pytest.fixture
+def hung_subprocess(monkeypatch):
+    """subprocess.run that times out, recording the timeout it was given"""
+    timeouts = []
+
+    def run(command, timeout=None, **kwargs):
+        timeouts.append(timeout)
+        raise subprocess.TimeoutExpired(command, timeout)
+
+    monkeypatch.setattr(video_utils.subprocess, "run", run)
+    return timeouts
+
+
+def test_probe_timeout_fails_like_other_errors(hung_subprocess):
+    assert video_utils.probe_video("http://example.com/video.mp4") is None
+    assert hung_subprocess == [settings.MEDIA_PROBE_TIMEOUT_SECONDS]
+
+
+def test_render_timeout_fails_like_other_errors(hung_subprocess):
+    assert video_utils.render_sprite_sheet("http://example.com/video.mp4", 60, 1080, 1920) is None
+    assert hung_subprocess == [settings.MEDIA_RENDER_TIMEOUT_SECONDS]
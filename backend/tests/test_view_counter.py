@@ -0,0 +1,68 @@
+import time
+import uuid
+
+from app.models.video import Video, ViewCountFlush
+from app.services.view_counter_service import (
+    BATCH_FIELD,
+    BATCH_REPLAY_WINDOW,
+    BATCH_STARTED_FIELD,
+    get_view_counter_service
+)
+
+
+def test_flush_applies_buffered_views(db, make_video, redis):
+    service = get_view_counter_service()
+    video = make_video()
+    for _ in range(3):
+        service.record_view(video.id)
+
+    assert service.get_pending([video.id]) == {video.id: 3}
+    assert service.flush(db) == 1
+
+    db.expire_all()
+    assert db.get(Video, video.id).view_count == 3
+    assert service.get_pending([video.id]) == {}
+    assert not redis.exists(service.flushing_key)
+
+
+def test_committed_batch_left_in_redis_is_not_applied_twice(db, make_video, redis):
+    service = get_view_counter_service()
+    video = make_video()
+    service.record_view(video.id)
+    service.flush(db)
+    batch_id = db.query(ViewCountFlush.batch_id).scalar()
+
+    # A flush that committed but died before deleting its hash
+    redis.hset(service.flushing_key, mapping={BATCH_FIELD: str(batch_id), str(video.id): 1})
+
+    assert service.flush(db) == 0
+    db.expire_all()
+    assert db.get(Video, video.id).view_count == 1
+    assert not redis.exists(service.flushing_key)
+
+
+def test_uncommitted_batch_is_retried(db, make_video, redis):
+    service = get_view_counter_service()
+    video = make_video()
+    service.record_view(video.id)
+    # A flush that died after the rename, before its transaction committed
+    redis.rename(service.pending_key, service.flushing_key)
+    service.record_view(video.id)
+
+    assert service.flush(db) == 1  # Leftover batch first
+    assert service.flush(db) == 1  # Then the views recorded meanwhile
+    db.expire_all()
+    assert db.get(Video, video.id).view_count == 2
+
+
+def test_batch_older_than_the_replay_window_is_dropped(redis):
+    service = get_view_counter_service()
+    # Left behind long enough ago that its ledger row may have been pruned
+    redis.hset(service.flushing_key, mapping={
+        BATCH_FIELD: str(uuid.uuid4()),
+        BATCH_STARTED_FIELD: time.time() - BATCH_REPLAY_WINDOW.total_seconds() - 60,
+        str(uuid.uuid4()): 5
+    })
+
+    assert service.flush(db=None) == 0  # Dropped before touching the database
+    assert not redis.exists(service.flushing_key)